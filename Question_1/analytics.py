@@ -0,0 +1,521 @@
+"""
+Analytics Module - Whole-graph metrics computed with a multi-source BFS
+
+Many breadth-first searches run at once, level by level: every node holds a
+bitset with one bit per source (64 sources per machine word by default),
+the frontier is the set of nodes whose bits changed at the last level, and
+one pass over the frontier's edges advances all the searches together. The
+edges of a node are scanned once per level instead of once per source.
+
+Per-scientist metrics:
+    degree           number of collaborators
+    hop_1..hop_k     scientists within 1..k degrees of separation (the
+                     ego-network size, not counting the scientist)
+    component_size   scientists in the connected component
+    ecc_lower/upper  bounds on the eccentricity (the largest degree of
+                     separation to anyone in the same component)
+
+Eccentricities are estimated from a sample of sources s: for every node v
+with nearest sample s*, max_s d(s, v) <= ecc(v) <= d(s*, v) + ecc(s*).
+Running from every scientist makes them exact. Components without a sample
+fall back to 0 or 1 <= ecc(v) <= size - 1.
+
+The metrics are written to a columnar file laid out like the snapshot: a
+JSON header followed by one 8-byte aligned array per column.
+"""
+
+import os
+import json
+import mmap
+import random
+import struct
+import multiprocessing
+from array import array
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+# Sources searched together; the NumPy backend packs them into one uint64
+WORD_BITS = 64
+
+DEFAULT_HOPS = 3
+DEFAULT_ECCENTRICITY_SAMPLES = 256
+
+BACKENDS = ("auto", "numpy", "python")
+
+METRICS_VERSION = 1
+MAGIC = b"SCIMETR\0"
+
+_PREFIX = struct.Struct("<8sII")
+
+# Graph shared with forked workers
+_worker_graph = None
+_worker_options = None
+
+
+def resolve_backend(backend="auto"):
+    """Return "numpy" or "python" for a requested backend"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Expected one of {BACKENDS}")
+    if backend == "auto":
+        return "numpy" if np is not None else "python"
+    if backend == "numpy" and np is None:
+        raise ValueError("The numpy backend requires NumPy to be installed")
+    return backend
+
+
+def degree_histogram(graph):
+    """
+    Count the scientists with each number of collaborators
+    
+    Args:
+        graph (CSRGraph): Collaboration graph
+    
+    Returns:
+        list: (degree, number of scientists) pairs by increasing degree
+    """
+    offsets = graph.offsets
+    counts = Counter(offsets[i + 1] - offsets[i] for i in range(len(graph)))
+    return sorted(counts.items())
+
+
+def component_sizes(graph):
+    """
+    Get the size of every scientist's connected component
+    
+    Args:
+        graph (CSRGraph): Collaboration graph
+    
+    Returns:
+        array: Component size per dense index
+    """
+    offsets, targets = graph.offsets, graph.targets
+    sizes = array("i", [0]) * len(graph)
+    for start in range(len(graph)):
+        if sizes[start]:
+            continue
+        sizes[start] = -1
+        component = [start]
+        for current in component:
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if not sizes[neighbor]:
+                    sizes[neighbor] = -1
+                    component.append(neighbor)
+        for node in component:
+            sizes[node] = len(component)
+    return sizes
+
+
+def iter_bitset_levels(graph, sources, max_depth=None, backend="auto"):
+    """
+    Multi-source, level-synchronous breadth-first search
+    
+    Bit b of a node's bitset is set once the search from sources[b] has
+    reached it. Each level ORs the frontier bitsets into the neighbors and
+    keeps the bits a neighbor did not have yet.
+    
+    Args:
+        graph (CSRGraph): Collaboration graph
+        sources (list): Dense indices to search from; at most WORD_BITS with
+                        the NumPy backend, any number with the Python one
+        max_depth (int, optional): Last level to explore (default: all)
+        backend (str): One of BACKENDS
+    
+    Yields:
+        tuple: (depth, nodes, bits) for every non-empty level, starting with
+               the sources at depth 0: the nodes first reached at that depth
+               by at least one search, and for each of them the bitset of
+               those searches (NumPy arrays with the NumPy backend)
+    """
+    if resolve_backend(backend) == "numpy":
+        if len(sources) > WORD_BITS:
+            raise ValueError(f"The numpy backend searches at most {WORD_BITS} sources at once")
+        return _numpy_levels(graph, sources, max_depth)
+    return _python_levels(graph, sources, max_depth)
+
+
+def _python_levels(graph, sources, max_depth):
+    """iter_bitset_levels over Python integers (arbitrarily wide bitsets)"""
+    offsets, targets = graph.offsets, graph.targets
+    seen = [0] * len(graph)
+    frontier = {}
+    for bit, source in enumerate(sources):
+        frontier[source] = frontier.get(source, 0) | (1 << bit)
+    for node, bits in frontier.items():
+        seen[node] = bits
+    
+    depth = 0
+    while frontier:
+        yield depth, list(frontier), list(frontier.values())
+        if max_depth is not None and depth >= max_depth:
+            return
+        depth += 1
+        
+        reached = {}
+        get = reached.get
+        for node, bits in frontier.items():
+            for neighbor in targets[offsets[node]:offsets[node + 1]]:
+                new = bits & ~seen[neighbor]
+                if new:
+                    reached[neighbor] = get(neighbor, 0) | new
+        # Marked after the whole level so every search advances exactly one hop
+        for node, bits in reached.items():
+            seen[node] |= bits
+        frontier = reached
+
+
+def _numpy_levels(graph, sources, max_depth):
+    """iter_bitset_levels with one uint64 bitset per node"""
+    offsets = np.frombuffer(graph.offsets, dtype=np.int64)
+    targets = np.frombuffer(graph.targets, dtype=np.int32)
+    degrees = np.diff(offsets)
+    edge_count = len(targets)
+    
+    seen = np.zeros(len(graph), dtype=np.uint64)
+    frontier_nodes = np.unique(np.asarray(sources, dtype=np.int64))
+    for bit, source in enumerate(sources):
+        seen[source] |= np.uint64(1 << bit)
+    frontier_bits = seen[frontier_nodes]
+    
+    depth = 0
+    while len(frontier_nodes):
+        yield depth, frontier_nodes, frontier_bits
+        if max_depth is not None and depth >= max_depth:
+            return
+        depth += 1
+        
+        frontier_degrees = degrees[frontier_nodes]
+        active_edges = int(frontier_degrees.sum())
+        if active_edges == 0:
+            return
+        if active_edges * 4 < edge_count:
+            # Sparse frontier: push its bits along its own edges only
+            starts = np.repeat(offsets[frontier_nodes] - np.cumsum(frontier_degrees) + frontier_degrees,
+                               frontier_degrees)
+            neighbors = targets[starts + np.arange(active_edges)]
+            reached = np.zeros(len(graph), dtype=np.uint64)
+            np.bitwise_or.at(reached, neighbors, np.repeat(frontier_bits, frontier_degrees))
+        else:
+            # Dense frontier: every node pulls the bits of all its neighbors
+            bitsets = np.zeros(len(graph), dtype=np.uint64)
+            bitsets[frontier_nodes] = frontier_bits
+            nonempty = degrees > 0
+            reached = np.zeros(len(graph), dtype=np.uint64)
+            reached[nonempty] = np.bitwise_or.reduceat(bitsets[targets], offsets[:-1][nonempty])
+        reached &= ~seen
+        frontier_nodes = np.flatnonzero(reached)
+        frontier_bits = reached[frontier_nodes]
+        seen[frontier_nodes] |= frontier_bits
+
+
+def count_bits(bits, width):
+    """
+    Count, for every bit position, the bitsets that have it set
+    
+    Args:
+        bits (iterable): Bitsets (Python ints or a uint64 NumPy array)
+        width (int): Number of bit positions
+    
+    Returns:
+        list: Count per bit position
+    """
+    if np is not None and isinstance(bits, np.ndarray):
+        if not len(bits):
+            return [0] * width
+        unpacked = np.unpackbits(bits.astype("<u8").view(np.uint8), bitorder="little")
+        return unpacked.reshape(len(bits), 64).sum(axis=0)[:width].tolist()
+    
+    counts = [0] * width
+    # Nodes reached by the same searches share a bitset; expand each pattern once
+    for pattern, repeats in Counter(bits).items():
+        while pattern:
+            low = pattern & -pattern
+            counts[low.bit_length() - 1] += repeats
+            pattern ^= low
+    return counts
+
+
+def level_counts(graph, sources, max_depth=None, backend="auto"):
+    """
+    Count the nodes at every depth of the searches from several sources
+    
+    Returns:
+        list: One list per source of node counts at depth 0, 1, ...; the last
+              entry is the deepest non-empty level (unless max_depth stops it)
+    """
+    per_source = [[] for _ in sources]
+    for depth, _, bits in iter_bitset_levels(graph, sources, max_depth, backend):
+        for counts, count in zip(per_source, count_bits(bits, len(sources))):
+            if count:
+                counts.append(count)
+    return per_source
+
+
+def neighborhood_sizes(graph, hops=DEFAULT_HOPS, workers=1, backend="auto", batch_size=WORD_BITS, progress=None):
+    """
+    Count the scientists within 1..hops degrees of separation of everyone
+    
+    Args:
+        graph (CSRGraph): Collaboration graph
+        hops (int): Largest number of hops counted
+        workers (int): Worker processes; more than one requires the "fork"
+                       start method and otherwise runs serially
+        backend (str): One of BACKENDS
+        batch_size (int): Sources per multi-source search (at most WORD_BITS
+                          with the NumPy backend)
+        progress (callable, optional): Called as progress("hops", scientists)
+                                       after every batch
+    
+    Returns:
+        list: hops arrays; entry k - 1 holds each scientist's k-hop count
+    """
+    sizes = [array("i", [0]) * len(graph) for _ in range(hops)]
+    batches = [(start, min(start + batch_size, len(graph))) for start in range(0, len(graph), batch_size)]
+    for (start, end), per_source in zip(batches, _map_batches(graph, _hop_counts, batches, (hops, backend),
+                                                              workers)):
+        for node, counts in zip(range(start, end), per_source):
+            within = 0
+            for k in range(hops):
+                if k + 1 < len(counts):
+                    within += counts[k + 1]
+                sizes[k][node] = within
+        if progress is not None:
+            progress("hops", end)
+    return sizes
+
+
+def _hop_counts(graph, batch, hops, backend):
+    """Level counts up to hops for one batch of consecutive sources"""
+    return level_counts(graph, list(range(*batch)), hops, backend)
+
+
+def eccentricity_bounds(graph, samples=DEFAULT_ECCENTRICITY_SAMPLES, seed=0, workers=1, backend="auto",
+                        batch_size=WORD_BITS, sizes=None, progress=None):
+    """
+    Bound every scientist's eccentricity from full searches of a sample
+    
+    Args:
+        graph (CSRGraph): Collaboration graph
+        samples (int or None): Sources searched; None (or at least len(graph))
+                               searches from everyone, making the bounds exact
+        seed (int): Seed of the random sample
+        workers (int): Worker processes, as in neighborhood_sizes
+        backend (str): One of BACKENDS
+        batch_size (int): Sources per multi-source search
+        sizes (array, optional): Component sizes from component_sizes
+        progress (callable, optional): Called as progress("eccentricity", sources)
+                                       after every batch
+    
+    Returns:
+        tuple: (lower, upper) arrays of bounds per dense index
+    """
+    n = len(graph)
+    if samples is None or samples >= n:
+        sources = list(range(n))
+    else:
+        sources = sorted(random.Random(seed).sample(range(n), samples))
+    if sizes is None:
+        sizes = component_sizes(graph)
+    
+    # Per node: farthest sample distance, and nearest sample with its distance
+    farthest = array("i", [-1]) * n
+    nearest = array("i", [-1]) * n
+    nearest_distance = array("i", [-1]) * n
+    eccentricity = {}
+    
+    batches = [sources[i:i + batch_size] for i in range(0, len(sources), batch_size)]
+    for batch, levels in zip(batches, _map_batches(graph, _batch_levels, batches, (backend,), workers)):
+        batch_eccentricity = [0] * len(batch)
+        for depth, nodes, lowest_bits, counts in levels:
+            for bit, count in enumerate(counts):
+                if count:
+                    batch_eccentricity[bit] = depth
+            # Levels deepen within a batch but restart at 0 with the next one
+            for node, bit in zip(nodes, lowest_bits):
+                if depth > farthest[node]:
+                    farthest[node] = depth
+                if nearest[node] < 0 or depth < nearest_distance[node]:
+                    nearest_distance[node] = depth
+                    nearest[node] = batch[bit]
+        eccentricity.update(zip(batch, batch_eccentricity))
+        if progress is not None:
+            progress("eccentricity", len(eccentricity))
+    
+    lower = array("i", [0]) * n
+    upper = array("i", [0]) * n
+    for node in range(n):
+        if node in eccentricity:
+            lower[node] = upper[node] = eccentricity[node]
+        elif nearest[node] >= 0:
+            lower[node] = farthest[node]
+            upper[node] = min(nearest_distance[node] + eccentricity[nearest[node]], sizes[node] - 1)
+        else:
+            lower[node] = 1 if sizes[node] > 1 else 0
+            upper[node] = sizes[node] - 1
+    return lower, upper
+
+
+def _batch_levels(graph, sources, backend):
+    """
+    Summarize every level of a full search from one batch of sources
+    
+    Returns:
+        list: (depth, nodes, lowest bit of each node's bitset, node count per
+              source) per level, as plain lists so they can leave a worker
+    """
+    levels = []
+    for depth, nodes, bits in iter_bitset_levels(graph, sources, None, backend):
+        counts = count_bits(bits, len(sources))
+        if np is not None and isinstance(bits, np.ndarray):
+            # Isolate the lowest set bit; its float exponent is its position
+            lowest = np.frexp((bits & (~bits + np.uint64(1))).astype(np.float64))[1] - 1
+            levels.append((depth, nodes.tolist(), lowest.tolist(), counts))
+        else:
+            levels.append((depth, nodes, [(pattern & -pattern).bit_length() - 1 for pattern in bits], counts))
+    return levels
+
+
+def _map_batches(graph, func, batches, options, workers):
+    """Run func(graph, batch, *options) for every batch, in forked workers if requested"""
+    global _worker_graph, _worker_options
+    
+    if workers > 1 and len(batches) > 1 and "fork" in multiprocessing.get_all_start_methods():
+        _worker_graph = graph
+        _worker_options = (func, options)
+        try:
+            with multiprocessing.get_context("fork").Pool(min(workers, len(batches))) as pool:
+                yield from pool.imap(_worker_batch, batches)
+        finally:
+            _worker_graph = None
+            _worker_options = None
+    else:
+        for batch in batches:
+            yield func(graph, batch, *options)
+
+
+def _worker_batch(batch):
+    """Worker: run the inherited function on the inherited graph"""
+    func, options = _worker_options
+    return func(_worker_graph, batch, *options)
+
+
+def compute_metrics(graph, hops=DEFAULT_HOPS, samples=DEFAULT_ECCENTRICITY_SAMPLES, seed=0, workers=1,
+                    backend="auto", batch_size=WORD_BITS, progress=None):
+    """
+    Compute every per-scientist metric
+    
+    Args:
+        graph (CSRGraph): Collaboration graph
+        hops (int): Largest ego-network radius counted (0 to skip)
+        samples (int or None): Eccentricity sources, None for exact values
+                               (see eccentricity_bounds)
+        seed (int): Seed of the eccentricity sample
+        workers (int): Worker processes
+        backend (str): One of BACKENDS
+        batch_size (int): Sources per multi-source search
+        progress (callable, optional): Called as progress(stage, count)
+    
+    Returns:
+        dict: Column name -> array, one entry per dense index
+    """
+    offsets = graph.offsets
+    columns = {"degree": array("i", (offsets[i + 1] - offsets[i] for i in range(len(graph))))}
+    for k, sizes in enumerate(neighborhood_sizes(graph, hops, workers, backend, batch_size, progress), 1):
+        columns[f"hop_{k}"] = sizes
+    columns["component_size"] = component_sizes(graph)
+    columns["ecc_lower"], columns["ecc_upper"] = eccentricity_bounds(
+        graph, samples, seed, workers, backend, batch_size, columns["component_size"], progress)
+    return columns
+
+
+def write_metrics(path, ids, columns, info=None):
+    """
+    Write per-scientist metrics as a columnar file
+    
+    Args:
+        path (str): Output file
+        ids (list): Scientist ID per row
+        columns (dict): Column name -> len(ids) values: arrays of typecode
+                        "d" are stored as floats, anything else as integers
+        info (dict, optional): JSON-serializable values stored in the header
+    
+    Returns:
+        tuple: (success, message)
+    """
+    if any("\0" in scientist_id for scientist_id in ids):
+        return False, "Scientist IDs contain NUL characters, metrics not written"
+    
+    blobs = [("scientist_id", "s", "\0".join(ids).encode("utf-8"))]
+    for name, values in columns.items():
+        if not isinstance(values, array) or values.typecode not in ("i", "d"):
+            values = array("i", values)
+        if len(values) != len(ids):
+            return False, f"Column '{name}' has {len(values)} values for {len(ids)} scientists"
+        blobs.append((name, values.typecode, values.tobytes()))
+    
+    # Section offsets are relative to the end of the header
+    sections = {}
+    position = 0
+    for name, typecode, blob in blobs:
+        sections[name] = [typecode, position, len(blob)]
+        position += _aligned(len(blob))
+    
+    header = json.dumps({"rows": len(ids), "info": info or {}, "columns": sections}).encode("utf-8")
+    header += b" " * (_aligned(_PREFIX.size + len(header)) - _PREFIX.size - len(header))
+    
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(_PREFIX.pack(MAGIC, METRICS_VERSION, len(header)))
+            f.write(header)
+            for _, _, blob in blobs:
+                f.write(blob)
+                f.write(b"\0" * (_aligned(len(blob)) - len(blob)))
+        os.replace(temp_path, path)
+    except OSError as e:
+        return False, f"Could not write metrics: {str(e)}"
+    
+    return True, f"Metrics for {len(ids)} scientists written to '{path}'"
+
+
+def read_metrics(path):
+    """
+    Memory-map a metrics file
+    
+    Args:
+        path (str): File written by write_metrics
+    
+    Returns:
+        tuple: (columns, info) where columns maps "scientist_id" to a list of
+               IDs and every metric to a memoryview of ints or floats; (None, None) if
+               the file is missing or not a metrics file
+    """
+    try:
+        with open(path, "rb") as f:
+            magic, version, header_length = _PREFIX.unpack(f.read(_PREFIX.size))
+            if magic != MAGIC or version != METRICS_VERSION:
+                return None, None
+            header = json.loads(f.read(header_length).decode("utf-8"))
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError, struct.error):
+        return None, None
+    
+    base = _PREFIX.size + header_length
+    view = memoryview(mapping)
+    columns = {}
+    for name, (typecode, offset, length) in header["columns"].items():
+        data = view[base + offset:base + offset + length]
+        if typecode == "s":
+            text = bytes(data).decode("utf-8")
+            columns[name] = text.split("\0") if text else []
+        else:
+            columns[name] = data.cast(typecode)
+    return columns, header["info"]
+
+
+def _aligned(size):
+    """Round size up to a multiple of 8"""
+    return (size + 7) & ~7
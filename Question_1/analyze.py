@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Analyze Module - Computes whole-graph metrics and writes them per scientist
+
+Loads the data like main.py, prints the degree distribution, the largest
+ego-networks and the eccentricity bounds, and writes every per-scientist
+metric to a columnar file (see analytics.read_metrics). Sampled betweenness
+and harmonic closeness are added with --centrality-samples; interrupted
+centrality runs resume from their checkpoint.
+
+Usage:
+    python analyze.py DATA_DIR [--hops 3] [--eccentricity-samples 256 | --exact-eccentricity]
+    python analyze.py DATA_DIR --centrality-samples 5000 --workers 8
+"""
+
+import os
+import sys
+import time
+import argparse
+from data_access import load_data, get_graph, LAYOUTS, LOADERS
+from analytics import (compute_metrics, degree_histogram, write_metrics, resolve_backend, BACKENDS, WORD_BITS,
+                       DEFAULT_HOPS, DEFAULT_ECCENTRICITY_SAMPLES)
+from centrality import estimate_centrality, DEFAULT_CHUNK_SOURCES, DEFAULT_CHECKPOINT_INTERVAL
+
+METRICS_NAME = "scientist_metrics.cols"
+CHECKPOINT_NAME = "centrality.checkpoint"
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Compute degree, ego-network and eccentricity metrics.")
+    parser.add_argument("data_directory", help="Directory containing scientists.csv, papers.csv and authors.csv")
+    parser.add_argument("--output", metavar="FILE",
+                        help=f"Columnar metrics file (default: {METRICS_NAME} in the data directory)")
+    parser.add_argument("--hops", type=int, default=DEFAULT_HOPS,
+                        help=f"Count the scientists within 1..HOPS degrees of everyone (default: {DEFAULT_HOPS})")
+    parser.add_argument("--eccentricity-samples", type=int, default=DEFAULT_ECCENTRICITY_SAMPLES,
+                        help=f"Full searches used to bound eccentricities "
+                             f"(default: {DEFAULT_ECCENTRICITY_SAMPLES})")
+    parser.add_argument("--exact-eccentricity", action="store_true",
+                        help="Search from every scientist so the eccentricities are exact")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the eccentricity sample")
+    parser.add_argument("--backend", choices=BACKENDS, default="auto",
+                        help="Bitset BFS implementation (default: numpy when installed)")
+    parser.add_argument("--batch-size", type=int, default=WORD_BITS,
+                        help=f"Sources per multi-source search; the python backend accepts more than "
+                             f"{WORD_BITS} (default: {WORD_BITS})")
+    parser.add_argument("--workers", type=int, default=1, help="Processes running the searches (default: 1)")
+    parser.add_argument("--centrality-samples", type=int, default=0,
+                        help="Brandes passes used to estimate betweenness and harmonic closeness, "
+                             "0 to skip them, -1 for exact values (default: 0)")
+    parser.add_argument("--checkpoint", metavar="FILE",
+                        help=f"Centrality checkpoint to resume from and save to "
+                             f"(default: {CHECKPOINT_NAME} in the data directory)")
+    parser.add_argument("--checkpoint-interval", type=float, default=DEFAULT_CHECKPOINT_INTERVAL,
+                        help=f"Seconds between centrality checkpoints (default: {DEFAULT_CHECKPOINT_INTERVAL:g})")
+    parser.add_argument("--chunk-sources", type=int, default=DEFAULT_CHUNK_SOURCES,
+                        help=f"Centrality sources per worker task (default: {DEFAULT_CHUNK_SOURCES})")
+    parser.add_argument("--top", type=int, default=10, help="Largest ego-networks to list (default: 10)")
+    parser.add_argument("--layout", choices=LAYOUTS, default="csr", help="In-memory graph layout (default: csr)")
+    parser.add_argument("--loader", choices=LOADERS, default="csv", help="CSV ingestion strategy (default: csv)")
+    parser.add_argument("--no-snapshot", action="store_true",
+                        help="Always parse the CSV files and do not write a binary snapshot")
+    return parser.parse_args(argv)
+
+
+def print_degree_histogram(histogram):
+    """Print the degree distribution in power-of-two buckets"""
+    buckets = {}
+    for degree, count in histogram:
+        bucket = 0 if degree == 0 else 1 << (degree.bit_length() - 1)
+        buckets[bucket] = buckets.get(bucket, 0) + count
+    print("Scientists by number of collaborators:")
+    for bucket, count in sorted(buckets.items()):
+        label = "0" if bucket == 0 else f"{bucket}-{bucket * 2 - 1}"
+        print(f"  {label:>15} {count}")
+
+
+def main():
+    args = parse_args()
+    data_dir = args.data_directory
+    if args.batch_size < 1 or (args.batch_size > WORD_BITS and resolve_backend(args.backend) == "numpy"):
+        print(f"Error: the numpy backend searches 1 to {WORD_BITS} sources at once")
+        sys.exit(1)
+    
+    print(f"Loading data from '{data_dir}'...")
+    success, message = load_data(data_dir, layout=args.layout, use_snapshot=not args.no_snapshot,
+                                 loader=args.loader)
+    if not success:
+        print(f"Error: {message}")
+        sys.exit(1)
+    print(message)
+    
+    collaboration_graph = get_graph()
+    graph = collaboration_graph.dense_graph()
+    print(f"{len(graph)} scientists, {graph.edge_count()} collaborations")
+    histogram = degree_histogram(graph)
+    print_degree_histogram(histogram)
+    
+    def progress(stage, count):
+        print(f"\r  {stage}: {count}/{len(graph)} sources", end="", flush=True)
+    
+    start = time.perf_counter()
+    samples = None if args.exact_eccentricity else args.eccentricity_samples
+    columns = compute_metrics(graph, args.hops, samples, args.seed, args.workers, args.backend,
+                              args.batch_size, progress)
+    print(f"\rComputed metrics in {time.perf_counter() - start:.2f} s{' ' * 30}")
+    
+    if args.hops > 0 and args.top > 0:
+        widest = columns[f"hop_{args.hops}"]
+        print(f"Largest {args.hops}-hop ego-networks:")
+        for i in sorted(range(len(graph)), key=lambda i: -widest[i])[:args.top]:
+            print(f"  {widest[i]:>10}  {collaboration_graph.scientist_name(graph.ids[i])} ({graph.ids[i]})")
+    
+    lower, upper = columns["ecc_lower"], columns["ecc_upper"]
+    if len(graph):
+        if args.exact_eccentricity:
+            print(f"Diameter: {max(upper)}")
+        else:
+            print(f"Diameter between {max(lower)} and {max(upper)} "
+                  f"(eccentricities bounded from {min(samples, len(graph))} searches)")
+    
+    if args.centrality_samples:
+        centrality_samples = None if args.centrality_samples < 0 else args.centrality_samples
+        checkpoint = args.checkpoint or os.path.join(data_dir, CHECKPOINT_NAME)
+        start = time.perf_counter()
+        try:
+            betweenness, closeness, message = estimate_centrality(
+                graph, centrality_samples, args.seed, args.workers, checkpoint, args.chunk_sources,
+                args.checkpoint_interval, progress)
+        except KeyboardInterrupt:
+            print(f"\nInterrupted; run the same command again to resume from '{checkpoint}'")
+            sys.exit(130)
+        print(f"\r{message} in {time.perf_counter() - start:.2f} s{' ' * 30}")
+        columns["betweenness"] = betweenness
+        columns["closeness"] = closeness
+        if args.top > 0:
+            print("Top bridge scientists (estimated betweenness, harmonic closeness):")
+            for i in sorted(range(len(graph)), key=lambda i: -betweenness[i])[:args.top]:
+                print(f"  {betweenness[i]:>14.1f} {closeness[i]:>8.4f}  "
+                      f"{collaboration_graph.scientist_name(graph.ids[i])} ({graph.ids[i]})")
+    
+    output = args.output or os.path.join(data_dir, METRICS_NAME)
+    success, message = write_metrics(output, graph.ids, columns, {
+        "hops": args.hops,
+        "exact_eccentricity": args.exact_eccentricity,
+        "eccentricity_samples": samples,
+        "seed": args.seed,
+        "centrality_samples": args.centrality_samples,
+        "degree_histogram": histogram,
+    })
+    print(message)
+    if not success:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
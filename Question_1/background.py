@@ -0,0 +1,91 @@
+"""
+Background Module - Runs long loads and searches off the GUI thread
+
+A BackgroundTask calls its function on a worker thread and hands it a
+progress callback. The callback records the latest (stage, count) report
+and raises Cancelled once the task has been cancelled, so the work stops at
+its next report. The GUI polls the task from its own event loop and is the
+only thread that touches widgets.
+"""
+
+import threading
+
+
+class Cancelled(Exception):
+    """Raised from a progress callback when its task has been cancelled"""
+
+
+class BackgroundTask:
+    """A function running on a daemon thread with progress and cancellation"""
+    
+    __slots__ = ("func", "args", "kwargs", "thread", "cancel_event", "done_event",
+                 "progress", "result", "error", "stopped")
+    
+    def __init__(self, func, *args, **kwargs):
+        """
+        Args:
+            func (callable): Called as func(*args, progress=callback, **kwargs)
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+        """
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.cancel_event = threading.Event()
+        self.done_event = threading.Event()
+        self.progress = None  # latest (stage, count) report
+        self.result = None
+        self.error = None
+        self.stopped = False  # set once the function gave up on a cancel request
+    
+    def start(self):
+        """Start the worker thread and return the task"""
+        self.thread.start()
+        return self
+    
+    def cancel(self):
+        """Ask the task to stop at its next progress report"""
+        self.cancel_event.set()
+    
+    def report(self, stage, count):
+        """
+        Progress callback handed to the function
+        
+        Args:
+            stage (str): What is being processed, e.g. "authors" or "search"
+            count (int): Rows parsed or nodes visited so far in that stage
+        """
+        if self.cancel_event.is_set():
+            raise Cancelled()
+        self.progress = (stage, count)
+    
+    @property
+    def done(self):
+        """True once the function has returned, failed or been cancelled"""
+        return self.done_event.is_set()
+    
+    @property
+    def cancel_requested(self):
+        """True once cancel() was called, whether or not the task stopped for it"""
+        return self.cancel_event.is_set()
+    
+    @property
+    def cancelled(self):
+        """
+        True if the function stopped because of cancel(). A cancel request
+        arriving after its last progress report is too late: the function
+        then runs to completion and its result is valid (and may already
+        have taken effect, e.g. a loaded graph being swapped in).
+        """
+        return self.stopped
+    
+    def _run(self):
+        try:
+            self.result = self.func(*self.args, progress=self.report, **self.kwargs)
+        except Cancelled:
+            self.stopped = True
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done_event.set()
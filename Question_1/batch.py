@@ -0,0 +1,202 @@
+"""
+Batch Module - Answers many source/target queries in one run
+
+Queries are read as CSV rows of source and target, each given as a
+scientist ID or a (case-insensitive) name. They are grouped by source so a
+single breadth-first search answers every target sharing that source, and
+the results are written in input order as JSON lines or CSV.
+
+Large batches can be spread over worker processes. Workers are forked
+after the data is loaded, so they share the parent's graph copy-on-write
+and only receive source IDs with their target IDs.
+"""
+
+import gc
+import csv
+import json
+import multiprocessing
+from collections import defaultdict
+from data_access import get_graph
+from scientists_network import paths_from_source
+
+OUTPUT_FORMATS = ("jsonl", "csv")
+
+CSV_FIELDS = ("source", "target", "source_id", "target_id", "status", "degrees", "path")
+
+# Graph shared with forked workers
+_worker_graph = None
+
+
+def read_queries(stream):
+    """
+    Read (source, target) pairs from a CSV stream
+    
+    Blank lines, lines starting with '#' and a leading "source,target"
+    header are skipped, as are rows with fewer than two fields.
+    
+    Args:
+        stream (file): Text stream of CSV rows
+    
+    Yields:
+        tuple: (source, target) stripped strings
+    """
+    first = True
+    for row in csv.reader(stream):
+        if not row or row[0].lstrip().startswith('#'):
+            continue
+        if len(row) < 2:
+            continue
+        source, target = row[0].strip(), row[1].strip()
+        if first:
+            first = False
+            if (source.lower(), target.lower()) == ("source", "target"):
+                continue
+        yield source, target
+
+
+def resolve_scientist(value, graph=None):
+    """Return the ID for a scientist given by ID or by name, or None"""
+    if graph is None:
+        graph = get_graph()
+    if graph.scientist_name(value) is not None:
+        return value
+    return graph.scientist_id(value)
+
+
+def run_batch(queries, workers=1, graph=None):
+    """
+    Answer a batch of queries, running one search per distinct source
+    
+    Args:
+        queries (iterable): (source, target) pairs of IDs or names
+        workers (int): Number of processes running the searches; more than
+                       one requires the "fork" start method and falls back
+                       to a single process where it is unavailable
+        graph (CollaborationGraph, optional): Data to answer from (default:
+                                              the current data_access graph),
+                                              used for the whole batch
+    
+    Returns:
+        list: One result dict per query, in input order, with the keys of CSV_FIELDS
+    """
+    if graph is None:
+        graph = get_graph()
+    results, pending = _resolve_queries(queries, graph)
+    
+    if workers > 1 and len(pending) > 1 and "fork" in multiprocessing.get_all_start_methods():
+        answers = _answer_sources_forked(list(pending.items()), results, workers, graph)
+    else:
+        answers = ((indices, paths_from_source(source_id, [results[i]["target_id"] for i in indices], graph))
+                   for source_id, indices in pending.items())
+    
+    for indices, paths in answers:
+        for i in indices:
+            result = results[i]
+            path = paths[result["target_id"]]
+            if path is None:
+                result["status"] = "no_path"
+            else:
+                result["status"] = "ok"
+                result["degrees"] = len(path) - 1
+                result["path"] = path
+    
+    return results
+
+
+def _resolve_queries(queries, graph):
+    """
+    Resolve query endpoints and group the answerable queries by source
+    
+    Returns:
+        tuple: (results, pending) where pending maps source_id -> indices
+               of the results waiting for that source
+    """
+    results = []
+    # source_id -> indices of the results waiting for that source
+    pending = defaultdict(list)
+    
+    for source, target in queries:
+        source_id = resolve_scientist(source, graph)
+        target_id = resolve_scientist(target, graph)
+        result = {"source": source, "target": target, "source_id": source_id, "target_id": target_id,
+                  "status": None, "degrees": None, "path": None}
+        if source_id is None:
+            result["status"] = "unknown_source"
+        elif target_id is None:
+            result["status"] = "unknown_target"
+        else:
+            pending[source_id].append(len(results))
+        results.append(result)
+    
+    return results, pending
+
+
+def _answer_sources_forked(groups, results, workers, graph):
+    """
+    Run the per-source searches in forked worker processes
+    
+    Args:
+        groups (list): (source_id, indices) pairs
+        results (list): Resolved results, used for the target IDs
+        workers (int): Number of worker processes
+        graph (CollaborationGraph): Data the workers search
+    
+    Yields:
+        tuple: (indices, paths) for every group, in the order of groups
+    """
+    tasks = [(source_id, [results[i]["target_id"] for i in indices]) for source_id, indices in groups]
+    # A few tasks per worker keeps them busy when some sources are costlier
+    chunksize = max(1, len(tasks) // (workers * 4))
+    
+    global _worker_graph
+    
+    # Move the loaded data out of reach of the collector so it does not
+    # write to (and so copy) the shared pages in the workers
+    _worker_graph = graph
+    gc.freeze()
+    try:
+        with multiprocessing.get_context("fork").Pool(workers) as pool:
+            for (_, indices), paths in zip(groups, pool.imap(_answer_source, tasks, chunksize)):
+                yield indices, paths
+    finally:
+        gc.unfreeze()
+        _worker_graph = None
+
+
+def _answer_source(task):
+    """Worker: find the paths of one (source_id, target_ids) task"""
+    source_id, target_ids = task
+    return paths_from_source(source_id, target_ids, _worker_graph)
+
+
+def write_results(results, stream, output_format="jsonl"):
+    """
+    Write batch results as JSON lines or CSV
+    
+    Args:
+        results (iterable): Result dicts from run_batch
+        stream (file): Text stream to write to
+        output_format (str): One of OUTPUT_FORMATS; CSV joins path IDs with ';'
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{output_format}'. Expected one of {OUTPUT_FORMATS}")
+    
+    if output_format == "jsonl":
+        for result in results:
+            stream.write(json.dumps(result, ensure_ascii=False))
+            stream.write("\n")
+        return
+    
+    writer = csv.writer(stream)
+    writer.writerow(CSV_FIELDS)
+    for result in results:
+        row = dict(result, path=";".join(result["path"]) if result["path"] else "")
+        writer.writerow(["" if row[field] is None else row[field] for field in CSV_FIELDS])
+
+
+def summarize(results):
+    """Return a count of results per status"""
+    counts = defaultdict(int)
+    for result in results:
+        counts[result["status"]] += 1
+    return dict(counts)
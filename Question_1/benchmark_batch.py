@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Batch Benchmark - Measures batch query throughput for 1 to N worker processes
+
+Usage:
+    python benchmark_batch.py [--size 100000] [--queries 20000] [--sources 2000] [--workers 1 2 4]
+"""
+
+import os
+import random
+import argparse
+import time
+from synthetic import random_collaboration_graph, install_graph
+from batch import run_batch
+
+
+def batch_queries(graph, num_queries, num_sources, seed):
+    """
+    Draw queries whose sources come from a smaller pool, as in real batches
+    
+    Args:
+        graph (dict): scientist_id -> set of collaborator_ids
+        num_queries (int): Number of (source_id, target_id) pairs
+        num_sources (int): Number of distinct sources to draw from
+        seed (int): Seed for the random number generator
+    
+    Returns:
+        list: List of (source_id, target_id) tuples
+    """
+    rng = random.Random(seed)
+    ids = list(graph)
+    sources = rng.sample(ids, min(num_sources, len(ids)))
+    return [(rng.choice(sources), rng.choice(ids)) for _ in range(num_queries)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel batch query throughput.")
+    parser.add_argument("--size", type=int, default=100000, help="Number of scientists in the graph")
+    parser.add_argument("--degree", type=int, default=8, help="Average collaborators per scientist")
+    parser.add_argument("--queries", type=int, default=20000, help="Queries in the batch")
+    parser.add_argument("--sources", type=int, default=2000, help="Distinct sources in the batch")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, os.cpu_count() or 1}),
+                        help="Worker counts to test")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    
+    graph = random_collaboration_graph(args.size, args.degree, args.seed)
+    install_graph(graph)
+    queries = batch_queries(graph, args.queries, args.sources, args.seed + 1)
+    
+    print(f"{args.queries} queries from {args.sources} sources on {args.size} scientists "
+          f"({os.cpu_count()} CPUs)")
+    print(f"{'workers':>8} {'seconds':>10} {'queries/s':>12} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        results = run_batch(queries, workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        assert len(results) == len(queries)
+        print(f"{workers:>8} {elapsed:>10.2f} {len(queries) / elapsed:>12.0f} {baseline / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
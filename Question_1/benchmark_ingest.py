@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Ingestion Benchmark - Compares the row-by-row and bulk CSV loaders
+
+Generates a synthetic dataset (10M authors.csv rows by default) and reports
+the rows per second each loader parses. Only the parsing and joining of the
+three files is timed, not the collaboration build.
+
+Usage:
+    python benchmark_ingest.py [--rows 10000000] [--data-dir DIR] [--keep]
+"""
+
+import os
+import time
+import shutil
+import argparse
+import tempfile
+from collaboration_graph import CollaborationGraph
+from bulk_loader import parse_files, np
+
+
+def time_loader(label, parse):
+    """Run a parser into an empty graph and return (label, seconds, rows joined)"""
+    graph = CollaborationGraph()
+    
+    start = time.perf_counter()
+    success, message = parse(graph)
+    elapsed = time.perf_counter() - start
+    if not success:
+        raise RuntimeError(f"{label} loader failed: {message}")
+    
+    joined = sum(len(authors) for authors in graph.paper_authors.values())
+    return label, elapsed, joined
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CSV ingestion strategies.")
+    parser.add_argument("--rows", type=int, default=10000000, help="Rows in authors.csv")
+    parser.add_argument("--scientists", type=int, default=1000000, help="Rows in scientists.csv")
+    parser.add_argument("--papers", type=int, default=2000000, help="Rows in papers.csv")
+    parser.add_argument("--data-dir", help="Directory for the generated files (default: temporary)")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated files")
+    args = parser.parse_args()
+    
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="ingest_bench_")
+    if not os.path.isfile(os.path.join(data_dir, "authors.csv")):
+        from synthetic import write_csv_dataset
+        print(f"Generating {args.rows} authorship rows in '{data_dir}'...")
+        write_csv_dataset(data_dir, args.scientists, args.papers, args.rows)
+    
+    total_rows = 0
+    for filename in ("scientists.csv", "papers.csv", "authors.csv"):
+        with open(os.path.join(data_dir, filename), "rb") as f:
+            total_rows += sum(1 for _ in f) - 1
+    
+    loaders = [
+        ("csv", lambda graph: graph._parse_csv_files(data_dir)),
+        ("bulk/python", lambda graph: parse_files(data_dir, graph.scientists, graph.scientist_ids,
+                                                  graph.papers, graph.paper_authors, backend="python")),
+    ]
+    if np is not None:
+        loaders.append(("bulk/numpy", lambda graph: parse_files(data_dir, graph.scientists, graph.scientist_ids,
+                                                                graph.papers, graph.paper_authors, backend="numpy")))
+    
+    print(f"{'loader':>12} {'seconds':>10} {'rows/s':>12} {'authorships':>12}")
+    for label, parse in loaders:
+        label, elapsed, joined = time_loader(label, parse)
+        print(f"{label:>12} {elapsed:>10.2f} {total_rows / elapsed:>12.0f} {joined:>12}")
+    
+    if not args.data_dir and not args.keep:
+        shutil.rmtree(data_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Layout Benchmark - Compares the dict-of-sets and CSR collaboration layouts
+
+Reports the memory held by each layout (measured with tracemalloc while it
+is built) and the time of full breadth-first traversals over it.
+
+Usage:
+    python benchmark_layout.py [--sizes 100000 1000000] [--degree 8] [--sources 5]
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from synthetic import random_collaboration_graph
+from csr_graph import CSRGraph
+from search_core import bfs_parents, dense_bfs_parents
+
+
+def traced(build, *args):
+    """Return (result, bytes still allocated by build(*args))"""
+    tracemalloc.start()
+    result = build(*args)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def copy_sets(edges):
+    """Build the dict-of-sets layout as a fresh copy of an adjacency dict"""
+    return {k: set(v) for k, v in edges.items()}
+
+
+def benchmark(num_scientists, average_degree, num_sources, seed):
+    """
+    Build both layouts of one random graph and traverse them
+    
+    Returns:
+        dict: layout -> dict with "bytes" and "seconds" (total traversal time)
+    """
+    edges = random_collaboration_graph(num_scientists, average_degree, seed)
+    sets_graph, sets_bytes = traced(copy_sets, edges)
+    csr_graph, csr_bytes = traced(CSRGraph.from_adjacency, edges)
+    del edges
+    
+    rng = random.Random(seed + 1)
+    sources = [rng.choice(csr_graph.ids) for _ in range(num_sources)]
+    
+    start = time.perf_counter()
+    for source_id in sources:
+        bfs_parents(source_id, None, sets_graph.__getitem__)
+    sets_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for source_id in sources:
+        dense_bfs_parents(csr_graph.index[source_id], -1, csr_graph.offsets, csr_graph.targets)
+    csr_seconds = time.perf_counter() - start
+    
+    return {
+        "sets": {"bytes": sets_bytes, "seconds": sets_seconds},
+        "csr": {"bytes": csr_bytes, "seconds": csr_seconds, "array_bytes": csr_graph.nbytes()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark collaboration graph layouts.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000],
+                        help="Graph sizes (number of scientists) to test")
+    parser.add_argument("--degree", type=int, default=8, help="Average collaborators per scientist")
+    parser.add_argument("--sources", type=int, default=5, help="Full traversals per layout")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    
+    print(f"{'nodes':>10} {'sets MiB':>10} {'csr MiB':>10} {'saving':>8} "
+          f"{'sets s':>8} {'csr s':>8} {'speedup':>8}")
+    for size in args.sizes:
+        results = benchmark(size, args.degree, args.sources, args.seed)
+        sets, csr = results["sets"], results["csr"]
+        print(f"{size:>10} {sets['bytes'] / 2 ** 20:>10.1f} {csr['bytes'] / 2 ** 20:>10.1f} "
+              f"{sets['bytes'] / csr['bytes']:>7.1f}x {sets['seconds']:>8.2f} {csr['seconds']:>8.2f} "
+              f"{sets['seconds'] / csr['seconds']:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Path Memory Benchmark - Compares per-node path copies with parent pointers
+
+Runs a corner-to-corner search on a grid graph (1M nodes by default) so the
+search is deep, and reports the wall time and the peak traced allocation of
+each approach.
+
+Usage:
+    python benchmark_memory.py [--width 1000] [--height 1000] [--skip-copying]
+"""
+
+import argparse
+import time
+import tracemalloc
+from collections import deque
+from synthetic import grid_collaboration_graph
+from search_core import bfs_parents, path_from_parents
+
+
+def copying_bfs(graph, source, target):
+    """Reference BFS that stores a full path copy with every queued node"""
+    visited = {source}
+    queue = deque([(source, [source])])
+    while queue:
+        current, path = queue.popleft()
+        for neighbor in graph[current]:
+            if neighbor == target:
+                return path + [neighbor]
+            if neighbor not in visited:
+                visited.add(neighbor)
+                queue.append((neighbor, path + [neighbor]))
+    return None
+
+
+def parent_pointer_bfs(graph, source, target):
+    """BFS from the shared search core, rebuilding the path at the end"""
+    parents, found = bfs_parents(source, target, graph.__getitem__)
+    return path_from_parents(parents, target) if found else None
+
+
+def measure(search, graph, source, target):
+    """
+    Run a search once for timing and once under tracemalloc
+    
+    Returns:
+        tuple: (path_length, seconds, peak_bytes)
+    """
+    start = time.perf_counter()
+    path = search(graph, source, target)
+    elapsed = time.perf_counter() - start
+    
+    tracemalloc.start()
+    search(graph, source, target)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return len(path) if path else 0, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memory use of deep BFS searches.")
+    parser.add_argument("--width", type=int, default=1000, help="Grid width")
+    parser.add_argument("--height", type=int, default=1000, help="Grid height")
+    parser.add_argument("--skip-copying", action="store_true",
+                        help="Only run the parent pointer search (path copying is very slow on large grids)")
+    args = parser.parse_args()
+    
+    graph = grid_collaboration_graph(args.width, args.height)
+    source = "s0"
+    target = f"s{args.width * args.height - 1}"
+    print(f"Grid {args.width}x{args.height} ({len(graph)} nodes), searching {source} -> {target}")
+    
+    searches = [("parent pointers", parent_pointer_bfs)]
+    if not args.skip_copying:
+        searches.append(("path copies", copying_bfs))
+    
+    print(f"{'approach':>16} {'path length':>12} {'seconds':>10} {'peak MiB':>10}")
+    for label, search in searches:
+        length, elapsed, peak = measure(search, graph, source, target)
+        print(f"{label:>16} {length:>12} {elapsed:>10.2f} {peak / 2 ** 20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
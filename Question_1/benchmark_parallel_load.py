@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Parallel Load Benchmark - Speedup of the process pool loader by worker count
+
+Usage:
+    python benchmark_parallel_load.py --data-dir DIR [--workers 1 2 4 8 16] [--rows 10000000]
+"""
+
+import os
+import time
+import argparse
+from collections import defaultdict
+from parallel_loader import parse_files_parallel
+
+
+def time_workers(data_dir, workers):
+    """Parse the dataset once with the given worker count and return the seconds taken"""
+    start = time.perf_counter()
+    success, message = parse_files_parallel(data_dir, {}, {}, {}, defaultdict(list), workers=workers)
+    elapsed = time.perf_counter() - start
+    if not success:
+        raise RuntimeError(message)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel CSV loading.")
+    parser.add_argument("--data-dir", required=True, help="Dataset directory (generated if it has no authors.csv)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16],
+                        help="Worker counts to compare")
+    parser.add_argument("--rows", type=int, default=10000000, help="authors.csv rows when generating")
+    args = parser.parse_args()
+    
+    if not os.path.isfile(os.path.join(args.data_dir, "authors.csv")):
+        from synthetic import write_csv_dataset
+        print(f"Generating {args.rows} authorship rows in '{args.data_dir}'...")
+        write_csv_dataset(args.data_dir, args.rows // 10, args.rows // 5, args.rows)
+    
+    print(f"CPUs available: {os.cpu_count()}")
+    print(f"{'workers':>8} {'seconds':>10} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        elapsed = time_workers(args.data_dir, workers)
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {elapsed:>10.2f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Search Benchmark - Compares shortest path strategies on synthetic graphs
+
+Usage:
+    python benchmark_search.py [--sizes 100000 1000000] [--degree 8] [--queries 20]
+"""
+
+import argparse
+import time
+from synthetic import random_collaboration_graph, random_query_pairs, install_graph
+from data_access import load_landmarks
+from scientists_network import find_path, SEARCH_MODES
+
+
+def benchmark(num_scientists, average_degree, num_queries, seed):
+    """
+    Time every search mode on the same random queries
+    
+    Args:
+        num_scientists (int): Number of nodes in the synthetic graph
+        average_degree (int): Average number of collaborators per node
+        num_queries (int): Number of random source/target pairs
+        seed (int): Seed used for the graph and the queries
+    
+    Returns:
+        dict: mode -> dict with total visited nodes, total seconds and found paths
+    """
+    graph = random_collaboration_graph(num_scientists, average_degree, seed)
+    install_graph(graph)
+    load_landmarks(use_cache=False)
+    queries = random_query_pairs(graph, num_queries, seed + 1)
+    
+    results = {}
+    for mode in SEARCH_MODES:
+        visited_total = 0
+        found = 0
+        start = time.perf_counter()
+        for source_id, target_id in queries:
+            path, visited_count = find_path(source_id, target_id, mode)
+            visited_total += visited_count
+            if path is not None:
+                found += 1
+        elapsed = time.perf_counter() - start
+        results[mode] = {"visited": visited_total, "seconds": elapsed, "found": found}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark shortest path search modes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000],
+                        help="Graph sizes (number of scientists) to test")
+    parser.add_argument("--degree", type=int, default=8, help="Average collaborators per scientist")
+    parser.add_argument("--queries", type=int, default=20, help="Random queries per graph")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    
+    print(f"{'nodes':>10} {'mode':>14} {'avg visited':>12} {'avg ms':>10} {'found':>6}")
+    for size in args.sizes:
+        results = benchmark(size, args.degree, args.queries, args.seed)
+        for mode, stats in results.items():
+            avg_visited = stats["visited"] / args.queries
+            avg_ms = stats["seconds"] * 1000 / args.queries
+            print(f"{size:>10} {mode:>14} {avg_visited:>12.0f} {avg_ms:>10.2f} {stats['found']:>6}")
+
+
+if __name__ == "__main__":
+    main()
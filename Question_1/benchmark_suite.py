@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite - Times loading and searching on generated datasets
+
+Generates scientists.csv, papers.csv and authors.csv at every requested
+scale (authors.csv rows, 10^4 to 10^7) with power-law author counts per
+paper, then times:
+
+    data_access.load_data      from the CSV files, while writing the
+                               snapshot, and from the snapshot
+    degree.load_data           the original loader
+    search_scientists          random partial names
+    shortest_path              scientists_network (one row per search mode)
+                               and degree, on the same random pairs
+
+Results are written as JSON together with the commit they were measured on;
+--compare reports the change against an earlier results file and exits with
+status 1 when anything got slower than --threshold.
+
+Usage:
+    python benchmark_suite.py [--rows 10000 100000 1000000] [--output results.json]
+    python benchmark_suite.py --rows 10000000 --data-dir /data/bench --compare baseline.json
+"""
+
+import os
+import gc
+import sys
+import json
+import time
+import shutil
+import random
+import argparse
+import platform
+import tempfile
+import subprocess
+import degree
+import data_access
+from collaboration_graph import CollaborationGraph
+from snapshot import snapshot_path
+from scientists_network import shortest_path, configure_cache, SEARCH_MODES
+from synthetic import (write_csv_dataset, power_law_dataset_sizes, DEFAULT_AUTHOR_EXPONENT, DEFAULT_MAX_AUTHORS,
+                       DEFAULT_PAPERS_PER_SCIENTIST)
+
+RESULTS_VERSION = 1
+DEFAULT_ROWS = [10000, 100000, 1000000]
+DEFAULT_THRESHOLD = 0.10
+
+
+def commit_info():
+    """Get the current git commit and whether the working tree has local changes"""
+    repository = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=repository, capture_output=True, text=True,
+                                check=True).stdout
+        changes = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=repository,
+                                 capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit.strip(), bool(changes.strip())
+
+
+def prepare_dataset(data_dir, rows, args):
+    """Generate the dataset of one scale unless it is already there"""
+    num_scientists, num_papers = power_law_dataset_sizes(rows, args.exponent, args.max_authors,
+                                                         args.papers_per_scientist)
+    if not os.path.isfile(os.path.join(data_dir, "authors.csv")):
+        print(f"Generating {rows} authorship rows in '{data_dir}'...")
+        write_csv_dataset(data_dir, num_scientists, num_papers, rows, args.seed, args.exponent, args.max_authors)
+    return {"authorships": rows, "scientists": num_scientists, "papers": num_papers}
+
+
+def time_call(repeat, func, *args):
+    """
+    Call func(*args) repeat times
+    
+    Returns:
+        dict: "seconds" (fastest run) and "runs" (every run)
+    """
+    runs = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func(*args)
+        runs.append(time.perf_counter() - start)
+    return {"seconds": min(runs), "runs": runs}
+
+
+def latency_stats(latencies):
+    """
+    Summarize per-call latencies
+    
+    Returns:
+        dict: "seconds" (total), call count and mean, median, p95 and max
+              milliseconds
+    """
+    ordered = sorted(latencies)
+    count = len(ordered)
+    
+    def percentile(quantile):
+        return ordered[min(count - 1, int(quantile * count))] * 1000 if count else 0.0
+    
+    return {
+        "seconds": sum(ordered),
+        "calls": count,
+        "mean_ms": sum(ordered) * 1000 / count if count else 0.0,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "max_ms": ordered[-1] * 1000 if count else 0.0,
+    }
+
+
+def load_data_access(data_dir, layout, use_snapshot):
+    success, message = data_access.load_data(data_dir, layout=layout, use_snapshot=use_snapshot)
+    if not success:
+        raise RuntimeError(f"data_access.load_data failed: {message}")
+
+
+def clear_degree():
+    """Empty the module dictionaries degree.load_data adds to"""
+    degree.name_to_ids.clear()
+    degree.scientist_data.clear()
+    degree.paper_data.clear()
+
+
+def load_degree(data_dir):
+    clear_degree()
+    degree.load_data(data_dir)
+
+
+def benchmark_loads(data_dir, args):
+    """Time every loader; leaves both data_access and degree loaded"""
+    results = {}
+    results["data_access.load_data[csv]"] = time_call(args.repeat, load_data_access, data_dir, args.layout, False)
+    
+    if os.path.exists(snapshot_path(data_dir)):
+        os.remove(snapshot_path(data_dir))
+    results["data_access.load_data[write_snapshot]"] = time_call(1, load_data_access, data_dir, args.layout, True)
+    results["data_access.load_data[snapshot]"] = time_call(args.repeat, load_data_access, data_dir, args.layout,
+                                                           True)
+    
+    results["degree.load_data"] = time_call(args.repeat, load_degree, data_dir)
+    return results
+
+
+def benchmark_queries(args):
+    """Time name searches and both shortest_path implementations on the loaded data"""
+    rng = random.Random(args.seed + 1)
+    graph = data_access.get_graph()
+    ids = list(graph.scientists)
+    results = {}
+    
+    # Substrings of real names, from one character to the whole name
+    queries = []
+    for scientist_id in rng.choices(ids, k=args.searches):
+        name = graph.scientist_name(scientist_id)
+        start = rng.randrange(len(name))
+        queries.append(name[start:rng.randint(start + 1, len(name))])
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        data_access.search_scientists(query, args.search_limit)
+        latencies.append(time.perf_counter() - start)
+    results["search_scientists"] = latency_stats(latencies)
+    
+    pairs = [tuple(rng.sample(ids, 2)) for _ in range(args.queries)]
+    configure_cache(0)
+    hops = {}
+    for mode in args.modes:
+        if mode == "landmark":
+            data_access.load_landmarks(use_cache=False)
+        latencies = []
+        lengths = []
+        for source_id, target_id in pairs:
+            start = time.perf_counter()
+            path = shortest_path(source_id, target_id, mode)
+            latencies.append(time.perf_counter() - start)
+            lengths.append(None if path is None else len(path) - 1)
+        results[f"scientists_network.shortest_path[{mode}]"] = latency_stats(latencies)
+        hops[mode] = lengths
+    configure_cache()
+    
+    latencies = []
+    lengths = []
+    for source_id, target_id in pairs:
+        start = time.perf_counter()
+        path = degree.shortest_path(source_id, target_id)
+        latencies.append(time.perf_counter() - start)
+        lengths.append(None if path is None else len(path))
+    results["degree.shortest_path"] = latency_stats(latencies)
+    
+    # Every implementation must agree on the degrees of separation
+    for mode, mode_lengths in hops.items():
+        mismatches = sum(a != b for a, b in zip(mode_lengths, lengths))
+        if mismatches:
+            raise RuntimeError(f"shortest_path[{mode}] disagrees with degree.shortest_path on {mismatches} pairs")
+    results["degree.shortest_path"]["found"] = sum(length is not None for length in lengths)
+    return results
+
+
+def comparable_ms(timing):
+    """Milliseconds per call of a query timing, or the milliseconds of a load"""
+    return timing["mean_ms"] if "mean_ms" in timing else timing["seconds"] * 1000
+
+
+def compare(results, baseline, threshold):
+    """
+    Print the change of every timing against a baseline results file
+    
+    Loads compare their fastest run and queries their mean latency, so runs
+    with different query counts stay comparable.
+    
+    Returns:
+        list: (rows, benchmark, ratio) of the timings slower than 1 + threshold
+    """
+    regressions = []
+    print(f"\nAgainst {(baseline.get('commit') or '')[:12] or 'an unknown commit'}:")
+    print(f"{'rows':>10} {'benchmark':<48} {'before ms':>10} {'after ms':>10} {'change':>8}")
+    for rows, scale in results["scales"].items():
+        before_benchmarks = baseline.get("scales", {}).get(rows, {}).get("benchmarks", {})
+        for name, timing in scale["benchmarks"].items():
+            if name not in before_benchmarks:
+                continue
+            before, after = comparable_ms(before_benchmarks[name]), comparable_ms(timing)
+            if not before:
+                continue
+            ratio = after / before
+            flag = ""
+            if ratio > 1 + threshold:
+                regressions.append((rows, name, ratio))
+                flag = "  slower"
+            print(f"{rows:>10} {name:<48} {before:>10.3f} {after:>10.3f} "
+                  f"{(ratio - 1) * 100:>+7.1f}%{flag}")
+    return regressions
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Benchmark loading and searching on synthetic datasets.")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS,
+                        help="Scales to run, as authors.csv rows (default: 10^4 10^5 10^6)")
+    parser.add_argument("--exponent", type=float, default=DEFAULT_AUTHOR_EXPONENT,
+                        help=f"Power-law exponent of the authors per paper (default: {DEFAULT_AUTHOR_EXPONENT})")
+    parser.add_argument("--max-authors", type=int, default=DEFAULT_MAX_AUTHORS,
+                        help=f"Largest number of authors of a paper (default: {DEFAULT_MAX_AUTHORS})")
+    parser.add_argument("--papers-per-scientist", type=float, default=DEFAULT_PAPERS_PER_SCIENTIST,
+                        help=f"Average authorships per scientist (default: {DEFAULT_PAPERS_PER_SCIENTIST})")
+    parser.add_argument("--layout", choices=data_access.LAYOUTS, default="sets",
+                        help="data_access graph layout (default: sets)")
+    parser.add_argument("--modes", choices=SEARCH_MODES, nargs="+", default=["bfs", "bidirectional"],
+                        help="scientists_network search modes to time (default: bfs bidirectional)")
+    parser.add_argument("--queries", type=int, default=200, help="Random shortest path pairs (default: 200)")
+    parser.add_argument("--searches", type=int, default=1000, help="Random name searches (default: 1000)")
+    parser.add_argument("--search-limit", type=int, default=50, help="Matches per name search (default: 50)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per load, the fastest counts (default: 3)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the datasets and the queries")
+    parser.add_argument("--data-dir", help="Directory keeping the generated datasets (default: temporary)")
+    parser.add_argument("--output", metavar="FILE", default="benchmark_results.json",
+                        help="JSON results file (default: benchmark_results.json)")
+    parser.add_argument("--compare", metavar="FILE", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Slowdown reported as a regression by --compare (default: {DEFAULT_THRESHOLD})")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    
+    commit, dirty = commit_info()
+    results = {
+        "version": RESULTS_VERSION,
+        "commit": commit,
+        "dirty": dirty,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "scales": {},
+    }
+    
+    root = args.data_dir or tempfile.mkdtemp(prefix="benchmark_suite_")
+    try:
+        for rows in args.rows:
+            data_dir = os.path.join(root, f"rows_{rows}_seed_{args.seed}_exp_{args.exponent:g}")
+            dataset = prepare_dataset(data_dir, rows, args)
+            print(f"\n{rows} authorships, {dataset['scientists']} scientists, {dataset['papers']} papers")
+            benchmarks = benchmark_loads(data_dir, args)
+            benchmarks.update(benchmark_queries(args))
+            results["scales"][str(rows)] = {"dataset": dataset, "benchmarks": benchmarks}
+            
+            print(f"{'benchmark':<48} {'seconds':>10} {'mean ms':>10} {'p95 ms':>10}")
+            for name, timing in benchmarks.items():
+                mean = f"{timing['mean_ms']:>10.3f} {timing['p95_ms']:>10.3f}" if "mean_ms" in timing else ""
+                print(f"{name:<48} {timing['seconds']:>10.4f} {mean}")
+            
+            # Release both copies of the data before the next scale
+            data_access.set_graph(CollaborationGraph())
+            clear_degree()
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(root)
+    
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to '{args.output}'")
+    
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} timings slower by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Update Benchmark - Compares a full reload with an incremental update
+
+Generates a synthetic dataset, loads it, appends a nightly batch of rows
+and times data_access.update_data against loading everything again.
+
+Usage:
+    python benchmark_update.py [--rows 1000000] [--append 10000] [--layout sets]
+"""
+
+import time
+import shutil
+import argparse
+import tempfile
+from synthetic import write_csv_dataset, append_csv_rows
+from data_access import load_data, update_data, LAYOUTS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental updates against full reloads.")
+    parser.add_argument("--rows", type=int, default=1000000, help="Rows in authors.csv before the update")
+    parser.add_argument("--scientists", type=int, default=200000, help="Rows in scientists.csv")
+    parser.add_argument("--papers", type=int, default=400000, help="Rows in papers.csv")
+    parser.add_argument("--append", type=int, default=10000, help="authors.csv rows appended by the update")
+    parser.add_argument("--layout", choices=LAYOUTS, default="sets", help="In-memory graph layout")
+    args = parser.parse_args()
+    
+    data_dir = tempfile.mkdtemp(prefix="update_bench_")
+    try:
+        print(f"Generating {args.rows} authorship rows in '{data_dir}'...")
+        write_csv_dataset(data_dir, args.scientists, args.papers, args.rows)
+        success, message = load_data(data_dir, layout=args.layout, use_snapshot=False)
+        if not success:
+            raise RuntimeError(message)
+        
+        # New rows in proportion to the existing ones
+        new_scientists = max(1, args.scientists * args.append // args.rows)
+        new_papers = max(1, args.papers * args.append // args.rows)
+        append_csv_rows(data_dir, args.scientists, new_scientists, args.papers, new_papers, args.append, seed=1)
+        
+        start = time.perf_counter()
+        success, message = update_data(use_snapshot=False)
+        update_seconds = time.perf_counter() - start
+        print(message)
+        
+        start = time.perf_counter()
+        success, message = load_data(data_dir, layout=args.layout, use_snapshot=False)
+        reload_seconds = time.perf_counter() - start
+        
+        print(f"{'full reload':>12} {reload_seconds:>10.2f} s")
+        print(f"{'update':>12} {update_seconds:>10.2f} s ({reload_seconds / update_seconds:.1f}x faster)")
+    finally:
+        shutil.rmtree(data_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+"""
+Bulk Loader Module - Chunked, columnar ingestion of the scientists, papers
+and authors CSV files
+
+Each file (or byte range of a file) is streamed in large blocks of whole
+lines that are split into rows and transposed into columns. Stripping, validation and the authors ->
+scientists/papers join are then applied to whole columns at once. When
+NumPy is installed the join produces integer index arrays and authors are
+grouped by paper with a single stable argsort; otherwise the same column
+operations use the built-in map/compress machinery.
+"""
+
+import io
+import os
+import gc
+import csv
+import threading
+from contextlib import contextmanager
+from itertools import compress, repeat
+from operator import itemgetter, and_
+from background import Cancelled
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+DEFAULT_CHUNK_BYTES = 1 << 24
+
+BACKENDS = ("auto", "numpy", "python")
+
+# Loads currently running with cyclic GC paused, and whether it was enabled before them
+_gc_lock = threading.Lock()
+_gc_pauses = 0
+_gc_was_enabled = False
+
+
+def iter_text_blocks(f, end=None, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """
+    Read a binary file in blocks of whole lines decoded as UTF-8
+    
+    Reading starts at the current position and stops after the last line
+    that starts before byte end. A block never ends inside a quoted field:
+    while its number of quote characters is odd, the following lines are
+    appended to it.
+    
+    Args:
+        f (file): File opened in binary mode
+        end (int, optional): Byte offset to stop at (default: end of file)
+        chunk_bytes (int): Approximate size of each block
+    
+    Yields:
+        tuple: (text, quotes) where quotes is the number of '"' characters
+    """
+    position = f.tell()
+    while end is None or position < end:
+        block = f.read(chunk_bytes if end is None else min(chunk_bytes, end - position))
+        if not block:
+            break
+        if not block.endswith(b"\n"):
+            block += f.readline()
+        quotes = block.count(b'"')
+        while quotes % 2:
+            line = f.readline()
+            if not line:
+                break
+            block += line
+            quotes += line.count(b'"')
+        position += len(block)
+        yield block.decode("utf-8", "replace"), quotes
+
+
+def iter_column_chunks(path, columns, chunk_bytes=DEFAULT_CHUNK_BYTES, fill=None, start=0, end=None):
+    """
+    Stream a CSV file (or a byte range of it) as chunks of stripped columns
+    
+    Blocks without quote characters are split with str.split; only blocks
+    that contain quoted fields go through the csv module. Rows too short to
+    contain every requested column are skipped. When fill is given, only the
+    first column is required and missing values of the other columns are
+    replaced by fill.
+    
+    A byte range owns every line that starts inside it, so consecutive
+    ranges cover each row exactly once. Ranges must only be used on files
+    without line breaks inside quoted fields.
+    
+    Args:
+        path (str): CSV file to read (the header row is skipped)
+        columns (list): Column indices to extract
+        chunk_bytes (int): Approximate size of each chunk
+        fill (str, optional): Value for missing optional columns
+        start (int): First byte of the range
+        end (int, optional): End of the range (default: end of file)
+    
+    Yields:
+        tuple: One list of stripped values per requested column
+    """
+    getter = itemgetter(*columns)
+    width = max(columns) + 1
+    
+    with open(path, 'rb') as f:
+        if start > 0:
+            # Finish the line that belongs to the previous range
+            f.seek(start - 1)
+            f.readline()
+        else:
+            f.readline()  # Skip header row
+        
+        for text, quotes in iter_text_blocks(f, end, chunk_bytes):
+            if quotes:
+                rows = list(csv.reader(io.StringIO(text, newline='')))
+            else:
+                if text.endswith('\n'):
+                    text = text[:-1]
+                rows = list(map(str.split, text.split('\n'), repeat(',')))
+            
+            try:
+                picked = list(map(getter, rows))
+            except IndexError:
+                # Slow path only for chunks containing short or blank rows
+                if fill is None or len(columns) == 1:
+                    picked = [getter(row) for row in rows if len(row) >= width]
+                else:
+                    picked = [tuple(row[i] if i < len(row) else fill for i in columns)
+                              for row in rows if len(row) > columns[0]]
+            if not picked:
+                continue
+            
+            if len(columns) == 1:
+                yield (list(map(str.strip, picked)),)
+            else:
+                yield tuple(list(map(str.strip, column)) for column in zip(*picked))
+
+
+def report_chunks(chunks, stage, progress=None):
+    """
+    Pass column chunks through, reporting the rows consumed so far after each one
+    
+    Args:
+        chunks (iterable): Column chunks as yielded by iter_column_chunks
+        stage (str): Stage name handed to progress
+        progress (callable, optional): Called as progress(stage, rows)
+    
+    Yields:
+        tuple: The chunks unchanged
+    """
+    rows = 0
+    for chunk in chunks:
+        yield chunk
+        if progress is not None:
+            rows += len(chunk[0])
+            progress(stage, rows)
+
+
+def read_header(path):
+    """Return the header row of a CSV file, or None if it is empty"""
+    with open(path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        return next(csv.reader(f), None)
+
+
+def parse_files(data_dir, scientists, scientist_ids, papers, paper_authors,
+                chunk_bytes=DEFAULT_CHUNK_BYTES, backend="auto", progress=None, ends=None):
+    """
+    Parse the three CSV files into the given data structures
+    
+    Args:
+        data_dir (str): Path to directory containing CSV files
+        scientists (dict): Filled with id -> name
+        scientist_ids (dict): Filled with lowercased name -> id
+        papers (dict): Filled with paper_id -> title
+        paper_authors (defaultdict): Filled with paper_id -> list of scientist_ids
+        chunk_bytes (int): Approximate size of each chunk read
+        backend (str): "numpy", "python" or "auto" (NumPy when installed)
+        progress (callable, optional): Called as progress(stage, rows) after
+                                       every chunk, stage being the file name
+        ends (dict, optional): file name -> byte offset to stop reading at,
+                               e.g. checkpoint offsets (default: whole files)
+    
+    Returns:
+        tuple: (success, message)
+    """
+    backend, error = resolve_backend(backend)
+    if error:
+        return False, error
+    
+    # Chunks hold hundreds of thousands of short-lived containers; cyclic GC
+    # passes over them would dominate the parse time
+    with paused_gc():
+        return _parse_files(data_dir, scientists, scientist_ids, papers, paper_authors, chunk_bytes, backend,
+                            progress, ends or {})
+
+
+@contextmanager
+def paused_gc():
+    """
+    Disable cyclic garbage collection while the block runs
+    
+    The collector is process-wide, so loads overlapping on several threads
+    share one pause: the first to start disables it and the last to finish
+    enables it again, only if it was enabled before the first one started.
+    """
+    global _gc_pauses, _gc_was_enabled
+    with _gc_lock:
+        if not _gc_pauses:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pauses += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_pauses -= 1
+            if not _gc_pauses and _gc_was_enabled:
+                gc.enable()
+
+
+def _parse_files(data_dir, scientists, scientist_ids, papers, paper_authors, chunk_bytes, backend, progress, ends):
+    """Parse the three CSV files with an already resolved backend"""
+    # Load scientists data
+    scientists_file = os.path.join(data_dir, "scientists.csv")
+    if not os.path.isfile(scientists_file):
+        return False, f"Scientists file not found at '{scientists_file}'"
+    
+    try:
+        header = read_header(scientists_file)
+        if not header:
+            return False, "Empty header in scientists file"
+        
+        id_idx = find_column(header, 'id', 'scientist_id')
+        name_idx = find_column(header, 'name')
+        if id_idx == -1 or name_idx == -1:
+            return False, f"Invalid header in scientists file: {header}. Need 'id' or 'scientist_id' and 'name' columns."
+        
+        chunks = iter_column_chunks(scientists_file, [id_idx, name_idx], chunk_bytes,
+                                    end=ends.get("scientists.csv"))
+        for ids, names in report_chunks(chunks, "scientists", progress):
+            # Keep rows where both the ID and the name are non-empty
+            pairs = list(compress(zip(ids, names), map(all, zip(ids, names))))
+            scientists.update(pairs)
+            scientist_ids.update(zip(map(str.lower, map(itemgetter(1), pairs)), map(itemgetter(0), pairs)))
+    except Cancelled:
+        raise
+    except Exception as e:
+        return False, f"Error reading scientists file: {str(e)}"
+    
+    if not scientists:
+        return False, "No scientists loaded. Check file format."
+    
+    # Load papers data
+    papers_file = os.path.join(data_dir, "papers.csv")
+    if not os.path.isfile(papers_file):
+        return False, f"Papers file not found at '{papers_file}'"
+    
+    try:
+        header = read_header(papers_file) or []
+        paper_id_idx = find_column(header, 'paper_id', 'id')
+        title_idx = find_column(header, 'title')
+        if paper_id_idx == -1:
+            return False, f"Invalid header in papers file: {header}. Need 'paper_id' or 'id' column."
+        
+        if title_idx >= 0:
+            # Rows too short to hold a title still count as papers
+            chunks = iter_column_chunks(papers_file, [paper_id_idx, title_idx], chunk_bytes, fill="Unknown Title",
+                                        end=ends.get("papers.csv"))
+            for paper_ids, titles in report_chunks(chunks, "papers", progress):
+                papers.update(compress(zip(paper_ids, titles), paper_ids))
+        else:
+            chunks = iter_column_chunks(papers_file, [paper_id_idx], chunk_bytes, end=ends.get("papers.csv"))
+            for (paper_ids,) in report_chunks(chunks, "papers", progress):
+                papers.update(zip(compress(paper_ids, paper_ids), repeat("Unknown Title")))
+    except Cancelled:
+        raise
+    except Exception as e:
+        return False, f"Error reading papers file: {str(e)}"
+    
+    # Load author relationships
+    authors_file = os.path.join(data_dir, "authors.csv")
+    if not os.path.isfile(authors_file):
+        return False, f"Authors file not found at '{authors_file}'"
+    
+    try:
+        header = read_header(authors_file) or []
+        scientist_id_idx = find_column(header, 'scientist_id')
+        paper_id_idx = find_column(header, 'paper_id')
+        if scientist_id_idx == -1 or paper_id_idx == -1:
+            return False, f"Invalid header in authors file: {header}. Need 'scientist_id' and 'paper_id' columns."
+        
+        chunks = iter_column_chunks(authors_file, [scientist_id_idx, paper_id_idx], chunk_bytes,
+                                    end=ends.get("authors.csv"))
+        join_authors(report_chunks(chunks, "authors", progress), scientists, papers, paper_authors, backend)
+    except Cancelled:
+        raise
+    except Exception as e:
+        return False, f"Error reading authors file: {str(e)}"
+    
+    return True, "Parsed CSV files"
+
+
+def find_column(header, *names):
+    """Return the index of the first name present in header, or -1"""
+    for name in names:
+        if name in header:
+            return header.index(name)
+    return -1
+
+
+def resolve_backend(backend):
+    """
+    Resolve "auto" to a concrete backend
+    
+    Returns:
+        tuple: (backend, error) where error is None or a message
+    """
+    if backend not in BACKENDS:
+        return None, f"Unknown backend '{backend}'. Expected one of {BACKENDS}"
+    if backend == "auto":
+        return ("numpy" if np is not None else "python"), None
+    if backend == "numpy" and np is None:
+        return None, "The numpy backend requires NumPy to be installed"
+    return backend, None
+
+
+def join_authors(chunks, scientists, papers, paper_authors, backend):
+    """
+    Append the authors rows whose scientist and paper are known to paper_authors
+    
+    Args:
+        chunks (iterable): (scientist_col, paper_col) column chunks
+        scientists (dict): Known scientist IDs
+        papers (dict): Known paper IDs
+        paper_authors (defaultdict): Filled with paper_id -> list of scientist_ids
+        backend (str): "numpy" or "python"
+    """
+    if backend == "numpy":
+        _join_authors_numpy(chunks, scientists, papers, paper_authors)
+    else:
+        _join_authors_python(chunks, scientists, papers, paper_authors)
+
+
+def _join_authors_python(chunks, scientists, papers, paper_authors):
+    """Join author rows to known scientists and papers with column-wise lookups"""
+    for scientist_col, paper_col in chunks:
+        known = map(and_, map(scientists.__contains__, scientist_col), map(papers.__contains__, paper_col))
+        for scientist_id, paper_id in compress(zip(scientist_col, paper_col), known):
+            paper_authors[paper_id].append(scientist_id)
+
+
+def _join_authors_numpy(chunks, scientists, papers, paper_authors):
+    """
+    Join author rows to known scientists and papers as integer index
+    arrays, then group them by paper with a single stable sort
+    """
+    scientist_list = list(scientists)
+    paper_list = list(papers)
+    scientist_index = {scientist_id: i for i, scientist_id in enumerate(scientist_list)}
+    paper_index = {paper_id: i for i, paper_id in enumerate(paper_list)}
+    
+    scientist_parts = []
+    paper_parts = []
+    for scientist_col, paper_col in chunks:
+        count = len(scientist_col)
+        scientist_idx = np.fromiter(map(scientist_index.get, scientist_col, repeat(-1)), dtype=np.int64, count=count)
+        paper_idx = np.fromiter(map(paper_index.get, paper_col, repeat(-1)), dtype=np.int64, count=count)
+        valid = (scientist_idx >= 0) & (paper_idx >= 0)
+        scientist_parts.append(scientist_idx[valid])
+        paper_parts.append(paper_idx[valid])
+    
+    if not scientist_parts:
+        return
+    scientist_idx = np.concatenate(scientist_parts)
+    paper_idx = np.concatenate(paper_parts)
+    if not len(paper_idx):
+        return
+    
+    # Stable sort keeps the file order of authors within each paper
+    order = np.argsort(paper_idx, kind="stable")
+    scientist_idx = scientist_idx[order]
+    paper_idx = paper_idx[order]
+    
+    boundaries = np.flatnonzero(np.diff(paper_idx)) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [len(paper_idx)]))
+    group_papers = paper_idx[starts]
+    author_ids = np.array(scientist_list, dtype=object)[scientist_idx].tolist()
+    
+    # Papers go in the order of their first authors row, like the row by row
+    # parser, since that order picks the canonical paper of every edge
+    first_rows = np.argsort(order[starts], kind="stable")
+    for paper, start, end in zip(group_papers[first_rows].tolist(), starts[first_rows].tolist(),
+                                 ends[first_rows].tolist()):
+        paper_authors[paper_list[paper]] = author_ids[start:end]
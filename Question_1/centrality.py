@@ -0,0 +1,316 @@
+"""
+Centrality Module - Sampled betweenness and harmonic closeness centrality
+
+Exact betweenness needs one Brandes pass (a path-counting BFS followed by a
+dependency accumulation in reverse BFS order) from every scientist. Here the
+passes run from k sources drawn uniformly at random and the sums are scaled
+by n / k, which keeps the estimates unbiased:
+
+    betweenness(v) ~ n / k * sum over sampled s of delta_s(v) / 2
+    closeness(v)   ~ n / k * sum over sampled s != v of 1 / d(s, v) / (n - 1)
+
+Both come from the same searches. With k = n the values are exact. Harmonic
+closeness is used because it stays meaningful on a disconnected graph
+(unreachable scientists add 0 instead of an infinite distance).
+
+The sources are split into chunks answered by forked worker processes that
+share the graph. After chunks complete, the running sums are checkpointed to
+a file; a run started with the same graph, sample and chunking resumes from
+the chunks already done.
+"""
+
+import os
+import json
+import time
+import random
+import struct
+import hashlib
+import multiprocessing
+from array import array
+from search_core import dense_bfs_counts
+
+DEFAULT_SAMPLES = 1000
+DEFAULT_CHUNK_SOURCES = 64
+
+# Seconds between two checkpoint writes
+DEFAULT_CHECKPOINT_INTERVAL = 60.0
+
+CHECKPOINT_VERSION = 1
+MAGIC = b"SCICENT\0"
+
+_PREFIX = struct.Struct("<8sII")
+
+# Graph shared with forked workers
+_worker_graph = None
+
+
+def sample_sources(node_count, samples, seed=0):
+    """
+    Draw the search sources
+    
+    Args:
+        node_count (int): Number of nodes
+        samples (int or None): Sources to draw; None or at least node_count
+                               selects every node (exact centrality)
+        seed (int): Random seed
+    
+    Returns:
+        list: Sorted node indices
+    """
+    if samples is None or samples >= node_count:
+        return list(range(node_count))
+    return sorted(random.Random(seed).sample(range(node_count), samples))
+
+
+def accumulate_sources(graph, sources):
+    """
+    Run one Brandes pass per source and sum the results
+    
+    Args:
+        graph (CSRGraph): Collaboration graph
+        sources (list): Dense indices to search from
+    
+    Returns:
+        tuple: (dependencies, harmonic) arrays of unscaled sums per node:
+               the pair dependencies delta_s(v) and the inverse distances
+               1 / d(s, v) over the given sources
+    """
+    offsets, targets = graph.offsets, graph.targets
+    node_count = len(graph)
+    dependencies = array("d", [0.0]) * node_count
+    harmonic = array("d", [0.0]) * node_count
+    delta = array("d", [0.0]) * node_count
+    
+    for source in sources:
+        order, depths, counts = dense_bfs_counts(source, offsets, targets)
+        
+        # Dependencies flow from the deepest nodes back to their predecessors
+        for node in reversed(order):
+            parent_depth = depths[node] - 1
+            share = (1.0 + delta[node]) / counts[node]
+            for neighbor in targets[offsets[node]:offsets[node + 1]]:
+                if depths[neighbor] == parent_depth:
+                    delta[neighbor] += counts[neighbor] * share
+            if node != source:
+                dependencies[node] += delta[node]
+                harmonic[node] += 1.0 / depths[node]
+        
+        for node in order:
+            delta[node] = 0.0
+    
+    return dependencies, harmonic
+
+
+def _worker_chunk(task):
+    """Worker: sums for one chunk of sources of the inherited graph, as bytes"""
+    chunk_index, sources = task
+    dependencies, harmonic = accumulate_sources(_worker_graph, sources)
+    return chunk_index, dependencies.tobytes(), harmonic.tobytes()
+
+
+class CentralityRun:
+    """Running sums of a sampled centrality computation and its checkpoint"""
+    
+    __slots__ = ("graph", "sources", "chunk_sources", "seed", "digest", "done", "dependencies", "harmonic")
+    
+    def __init__(self, graph, samples=DEFAULT_SAMPLES, seed=0, chunk_sources=DEFAULT_CHUNK_SOURCES):
+        """
+        Args:
+            graph (CSRGraph): Collaboration graph
+            samples (int or None): Number of sources, None for exact centrality
+            seed (int): Seed of the source sample
+            chunk_sources (int): Sources per worker task and checkpoint unit
+        """
+        self.graph = graph
+        self.sources = sample_sources(len(graph), samples, seed)
+        self.chunk_sources = max(1, chunk_sources)
+        self.seed = seed
+        self.digest = _run_digest(graph, self.sources, self.chunk_sources)
+        self.done = set()
+        self.dependencies = array("d", [0.0]) * len(graph)
+        self.harmonic = array("d", [0.0]) * len(graph)
+    
+    def chunks(self):
+        """Return the (chunk index, sources) tasks not completed yet"""
+        size = self.chunk_sources
+        return [(i, self.sources[start:start + size])
+                for i, start in enumerate(range(0, len(self.sources), size)) if i not in self.done]
+    
+    def add(self, chunk_index, dependencies, harmonic):
+        """Fold the sums of a completed chunk into the totals"""
+        totals_dependencies, totals_harmonic = self.dependencies, self.harmonic
+        for node, value in enumerate(dependencies):
+            if value:
+                totals_dependencies[node] += value
+        for node, value in enumerate(harmonic):
+            if value:
+                totals_harmonic[node] += value
+        self.done.add(chunk_index)
+    
+    def run(self, workers=1, checkpoint=None, checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL, progress=None):
+        """
+        Answer every remaining chunk, checkpointing along the way
+        
+        Args:
+            workers (int): Worker processes; more than one requires the "fork"
+                           start method and otherwise runs serially
+            checkpoint (str, optional): File the running sums are saved to
+            checkpoint_interval (float): Minimum seconds between two saves
+            progress (callable, optional): Called as progress("centrality",
+                                           sources done) after every chunk
+        
+        Returns:
+            tuple: (success, message)
+        """
+        global _worker_graph
+        
+        tasks = self.chunks()
+        last_saved = time.monotonic()
+        
+        def completed(chunk_index, dependencies, harmonic):
+            nonlocal last_saved
+            self.add(chunk_index, dependencies, harmonic)
+            if progress is not None:
+                progress("centrality", self.sources_done())
+            if checkpoint is not None and time.monotonic() - last_saved >= checkpoint_interval:
+                self.save(checkpoint)
+                last_saved = time.monotonic()
+        
+        try:
+            if workers > 1 and len(tasks) > 1 and "fork" in multiprocessing.get_all_start_methods():
+                _worker_graph = self.graph
+                try:
+                    with multiprocessing.get_context("fork").Pool(min(workers, len(tasks))) as pool:
+                        for chunk_index, dependencies, harmonic in pool.imap_unordered(_worker_chunk, tasks):
+                            completed(chunk_index, array("d", dependencies), array("d", harmonic))
+                finally:
+                    _worker_graph = None
+            else:
+                for chunk_index, sources in tasks:
+                    completed(chunk_index, *accumulate_sources(self.graph, sources))
+        finally:
+            # Also on interruption, so a later run resumes from here
+            if checkpoint is not None and tasks:
+                self.save(checkpoint)
+        
+        return True, f"Searched from {self.sources_done()} of {len(self.graph)} scientists"
+    
+    def sources_done(self):
+        """Return the number of sources whose chunk has completed"""
+        size = self.chunk_sources
+        return sum(len(self.sources[i * size:(i + 1) * size]) for i in self.done)
+    
+    def scores(self):
+        """
+        Scale the running sums into centrality estimates
+        
+        Returns:
+            tuple: (betweenness, closeness) arrays per dense index: the
+                   estimated number of scientist pairs whose shortest paths
+                   run through each scientist (shared among tied paths), and
+                   harmonic closeness normalized to [0, 1]
+        """
+        node_count = len(self.graph)
+        searched = self.sources_done()
+        scale = node_count / searched if searched else 0.0
+        # Every unordered pair is reached from both of its ends
+        betweenness = array("d", (value * scale / 2 for value in self.dependencies))
+        closeness_scale = scale / (node_count - 1) if node_count > 1 else 0.0
+        closeness = array("d", (value * closeness_scale for value in self.harmonic))
+        return betweenness, closeness
+    
+    def save(self, path):
+        """
+        Write the running sums to a checkpoint file
+        
+        Returns:
+            tuple: (success, message)
+        """
+        header = json.dumps({
+            "digest": self.digest,
+            "nodes": len(self.graph),
+            "done": sorted(self.done),
+        }).encode("utf-8")
+        temp_path = path + ".tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(_PREFIX.pack(MAGIC, CHECKPOINT_VERSION, len(header)))
+                f.write(header)
+                f.write(self.dependencies.tobytes())
+                f.write(self.harmonic.tobytes())
+            os.replace(temp_path, path)
+        except OSError as e:
+            return False, f"Could not write checkpoint: {str(e)}"
+        return True, f"Checkpoint written to '{path}'"
+    
+    def resume(self, path):
+        """
+        Restore the running sums from a checkpoint of the same run
+        
+        Returns:
+            tuple: (success, message); nothing is restored when the file is
+                   missing or was written for another graph, sample or chunking
+        """
+        try:
+            with open(path, "rb") as f:
+                magic, version, header_length = _PREFIX.unpack(f.read(_PREFIX.size))
+                if magic != MAGIC or version != CHECKPOINT_VERSION:
+                    return False, f"'{path}' is not a centrality checkpoint"
+                header = json.loads(f.read(header_length).decode("utf-8"))
+                if header.get("digest") != self.digest:
+                    return False, f"'{path}' was written for another graph or sample"
+                dependencies = array("d")
+                harmonic = array("d")
+                dependencies.fromfile(f, header["nodes"])
+                harmonic.fromfile(f, header["nodes"])
+        except FileNotFoundError:
+            return False, f"No checkpoint at '{path}'"
+        except (OSError, ValueError, EOFError, struct.error) as e:
+            return False, f"Could not read checkpoint: {str(e)}"
+        
+        self.dependencies = dependencies
+        self.harmonic = harmonic
+        self.done = set(header["done"])
+        return True, f"Resumed after {self.sources_done()} of {len(self.sources)} sources"
+
+
+def _run_digest(graph, sources, chunk_sources):
+    """Fingerprint of the graph, sources and chunking a checkpoint belongs to"""
+    digest = hashlib.sha1()
+    for scientist_id in graph.ids:
+        digest.update(scientist_id.encode("utf-8"))
+        digest.update(b"\0")
+    digest.update(array("q", [len(graph.targets), chunk_sources]).tobytes())
+    digest.update(array("i", sources).tobytes())
+    return digest.hexdigest()
+
+
+def estimate_centrality(graph, samples=DEFAULT_SAMPLES, seed=0, workers=1, checkpoint=None,
+                        chunk_sources=DEFAULT_CHUNK_SOURCES, checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL,
+                        progress=None):
+    """
+    Estimate betweenness and harmonic closeness, resuming from a checkpoint
+    
+    Args:
+        graph (CSRGraph): Collaboration graph
+        samples (int or None): Number of sources, None for exact centrality
+        seed (int): Seed of the source sample
+        workers (int): Worker processes
+        checkpoint (str, optional): Checkpoint file to resume from and save to
+        chunk_sources (int): Sources per worker task and checkpoint unit
+        checkpoint_interval (float): Minimum seconds between two saves
+        progress (callable, optional): Called as progress("centrality", sources)
+    
+    Returns:
+        tuple: (betweenness, closeness, message) as described in
+               CentralityRun.scores
+    """
+    run = CentralityRun(graph, samples, seed, chunk_sources)
+    messages = []
+    if checkpoint is not None:
+        resumed, message = run.resume(checkpoint)
+        if resumed:
+            messages.append(message)
+    messages.append(run.run(workers, checkpoint, checkpoint_interval, progress)[1])
+    betweenness, closeness = run.scores()
+    return betweenness, closeness, "; ".join(messages)
@@ -0,0 +1,867 @@
+"""
+Collaboration Graph Module - One loaded dataset of scientists, papers and collaborations
+
+A CollaborationGraph owns everything derived from one set of CSV files: the
+scientist and paper tables, the author lists, the collaboration graph in the
+chosen layout and the indexes built over it. Graphs are built completely by
+their constructors and never modified afterwards (except for attaching a
+landmark index, which is a single attribute assignment), so any number of
+threads can read one while another graph is being loaded. data_access keeps
+the current graph and swaps in a new one atomically when a load succeeds.
+"""
+
+import os
+import csv
+import itertools
+from array import array
+from collections import defaultdict
+from background import Cancelled
+from csr_graph import CSRGraph
+from snapshot import read_snapshot, write_snapshot
+from bulk_loader import parse_files, DEFAULT_CHUNK_BYTES
+from parallel_loader import parse_files_parallel
+from search_index import NameIndex
+from components import ComponentIndex
+from landmarks import LandmarkIndex, read_landmarks, write_landmarks, DEFAULT_LANDMARKS
+from incremental import data_checkpoints, read_appended_rows
+import instrumentation
+
+# Supported in-memory layouts for the collaboration graph
+LAYOUTS = ("sets", "csr", "bipartite")
+
+# Supported CSV ingestion strategies
+LOADERS = ("csv", "bulk", "parallel")
+
+# Rows parsed (or papers linked) between two progress reports
+PROGRESS_ROWS = 10000
+
+# Every graph gets its own version so caches can tell stale results apart
+_versions = itertools.count(1)
+
+
+class CollaborationGraph:
+    """Scientists, papers and their collaborations loaded from one data directory"""
+    
+    __slots__ = ("data_dir", "layout", "version", "scientists", "scientist_ids", "papers", "paper_authors",
+                 "collaborations", "compact", "scientist_papers", "edge_papers", "paper_list",
+                 "name_index", "component_index", "landmark_index", "checkpoints", "base")
+    
+    def __init__(self, layout="sets", data_dir=None):
+        """
+        Create an empty graph; use load(), from_snapshot() or
+        from_collaborations() to get one with data
+        
+        Args:
+            layout (str): One of LAYOUTS
+            data_dir (str, optional): Directory the data comes from
+        """
+        self.data_dir = data_dir
+        self.layout = layout
+        self.version = next(_versions)
+        self.scientists = {}  # id -> name
+        self.scientist_ids = {}  # name -> id (lowercased for case-insensitive lookup)
+        self.papers = {}  # paper_id -> title
+        self.paper_authors = defaultdict(list)  # paper_id -> list of scientist_ids
+        self.collaborations = {}  # scientist_id -> set of collaborator_ids, for layout="sets"
+        self.compact = None  # CSRGraph for layout="csr"
+        self.scientist_papers = {}  # scientist_id -> list of paper_ids, for layout="bipartite"
+        self.edge_papers = {}  # (scientist_id, scientist_id) in sorted order -> shared paper_id, for layout="sets"
+        self.paper_list = []  # paper_id by paper index, for the edge labels of layout="csr"
+        self.name_index = None  # NameIndex over scientist_ids
+        self.component_index = None  # ComponentIndex of the collaboration graph
+        self.landmark_index = None  # LandmarkIndex, built on request by load_landmarks
+        self.checkpoints = None  # file name -> checkpoint of the parsed CSV bytes, see incremental
+        self.base = None  # (version, ComponentIndex, touched components) of the graph this one updated
+    
+    def __len__(self):
+        return len(self.scientists)
+    
+    @classmethod
+    def load(cls, data_dir, layout="sets", use_snapshot=True, loader="csv", chunk_bytes=DEFAULT_CHUNK_BYTES,
+             workers=None, progress=None):
+        """
+        Load scientists and derive collaborations data from CSV files
+        
+        Args:
+            data_dir (str): Path to directory containing CSV files
+            layout (str): "sets" keeps a dict of collaborator sets, "csr" interns
+                          scientist IDs to ints and stores compact CSR arrays,
+                          "bipartite" keeps only scientist <-> paper links so
+                          papers with many authors are never expanded into cliques
+            use_snapshot (bool): Load from the binary snapshot next to the CSVs
+                                 when it is up to date, and write one after
+                                 parsing the CSVs otherwise
+            loader (str): "csv" parses row by row, "bulk" parses large chunks
+                          into columns and joins them in bulk, "parallel" does
+                          the same with a process pool
+            chunk_bytes (int): Approximate chunk size for the bulk and parallel loaders
+            workers (int, optional): Worker processes for the parallel loader
+                                     (default: CPU count)
+            progress (callable, optional): Called as progress(stage, count) while
+                                           loading, where stage is "scientists",
+                                           "papers", "authors" (rows parsed so far)
+                                           or "collaborations" (papers linked); it
+                                           may raise to abort the load
+        
+        Returns:
+            tuple: (graph, message) where graph is the loaded CollaborationGraph,
+                   or None if loading failed, and message is a string with details
+        """
+        if layout not in LAYOUTS:
+            return None, f"Unknown layout '{layout}'. Expected one of {LAYOUTS}"
+        if loader not in LOADERS:
+            return None, f"Unknown loader '{loader}'. Expected one of {LOADERS}"
+        
+        # Check if directory exists
+        if not os.path.isdir(data_dir):
+            return None, f"Directory '{data_dir}' does not exist"
+        
+        # Reuse the snapshot when none of the CSV files changed since it was written
+        if use_snapshot:
+            with instrumentation.phase("load_snapshot_read"):
+                graph = cls.from_snapshot(data_dir, layout)
+            if graph is not None:
+                graph._record_load("snapshot")
+                return graph, f"Successfully loaded {len(graph)} scientists from snapshot"
+        
+        graph = cls(layout, data_dir)
+        
+        # Rows appended while parsing are left for the next update, so every
+        # parser stops at the offsets checkpointed beforehand
+        graph.checkpoints = data_checkpoints(data_dir)
+        ends = {filename: checkpoint[0] for filename, checkpoint in (graph.checkpoints or {}).items()}
+        
+        # Parse scientists, papers and author relationships
+        with instrumentation.phase("load_parse"):
+            if loader == "bulk":
+                success, message = parse_files(data_dir, graph.scientists, graph.scientist_ids, graph.papers,
+                                               graph.paper_authors, chunk_bytes=chunk_bytes, progress=progress,
+                                               ends=ends)
+            elif loader == "parallel":
+                success, message = parse_files_parallel(data_dir, graph.scientists, graph.scientist_ids,
+                                                        graph.papers, graph.paper_authors, workers=workers,
+                                                        chunk_bytes=chunk_bytes, progress=progress, ends=ends)
+            else:
+                success, message = graph._parse_csv_files(data_dir, progress, ends)
+        if not success:
+            return None, message
+        
+        with instrumentation.phase("load_indexes"):
+            graph._build_indexes()
+        
+        if progress is not None:
+            progress("collaborations", 0)
+        
+        with instrumentation.phase("load_link"):
+            # Link scientists to their papers, which is linear in the authors rows
+            if layout == "bipartite":
+                graph._link_scientist_papers()
+                message = (f"Successfully loaded {len(graph)} scientists and "
+                           f"{len(graph.paper_authors)} authored papers (bipartite layout)")
+            
+            # Build the compact collaboration network, labelling every edge with
+            # the index of the first paper linking the pair
+            elif layout == "csr":
+                graph.paper_list = list(graph.papers)
+                paper_index = {paper_id: i for i, paper_id in enumerate(graph.paper_list)}
+                graph.compact = CSRGraph.from_groups(list(graph.scientists), graph.paper_authors.values(),
+                                                     map(paper_index.__getitem__, graph.paper_authors))
+                message = (f"Successfully loaded {len(graph)} scientists and derived "
+                           f"{graph.compact.edge_count()} collaborations (CSR layout)")
+            
+            else:
+                graph._link_collaborations(progress)
+                message = f"Successfully loaded {len(graph)} scientists and derived collaborations"
+        
+        if use_snapshot:
+            with instrumentation.phase("load_snapshot_write"):
+                graph.save_snapshot()
+        
+        graph._record_load(loader)
+        return graph, message
+    
+    def _record_load(self, source):
+        """Report the size of a freshly loaded graph to the instrumentation"""
+        if not instrumentation.is_enabled():
+            return
+        instrumentation.count("loads", source=source, layout=self.layout)
+        instrumentation.set_gauge("scientists", len(self.scientists))
+        instrumentation.set_gauge("papers", len(self.papers))
+        instrumentation.set_gauge("authored_papers", len(self.paper_authors))
+        if self.compact is not None:
+            instrumentation.set_gauge("collaborations", self.compact.edge_count())
+        elif self.layout == "sets":
+            instrumentation.set_gauge("collaborations",
+                                      sum(map(len, self.collaborations.values())) // 2)
+    
+    @classmethod
+    def from_snapshot(cls, data_dir, layout="sets"):
+        """
+        Restore a graph from the snapshot next to the CSV files
+        
+        Args:
+            data_dir (str): Directory holding the source CSVs
+            layout (str): One of LAYOUTS
+        
+        Returns:
+            CollaborationGraph or None: None when there is no up to date snapshot
+        """
+        # Checkpointed first: a file appended to afterwards no longer matches the snapshot
+        checkpoints = data_checkpoints(data_dir)
+        sections = read_snapshot(data_dir)
+        if sections is None:
+            return None
+        
+        graph = cls(layout, data_dir)
+        graph.checkpoints = checkpoints
+        graph._restore_snapshot(sections)
+        graph._build_indexes()
+        return graph
+    
+    @classmethod
+    def from_collaborations(cls, scientists, collaborations):
+        """
+        Wrap an in-memory collaboration graph, e.g. a synthetic one
+        
+        No papers are attached and components are not labelled, so searches
+        run exactly as they would on the raw collaborator sets.
+        
+        Args:
+            scientists (dict): scientist_id -> name
+            collaborations (dict): scientist_id -> set of collaborator_ids
+        
+        Returns:
+            CollaborationGraph: Graph with the "sets" layout
+        """
+        graph = cls("sets")
+        graph.scientists = scientists
+        graph.scientist_ids = {name.lower(): scientist_id for scientist_id, name in scientists.items()}
+        graph.collaborations = collaborations
+        graph.name_index = NameIndex(graph.scientist_ids.items())
+        return graph
+    
+    def update(self, chunk_bytes=DEFAULT_CHUNK_BYTES, progress=None):
+        """
+        Apply the rows appended to the CSV files since this graph was loaded
+        
+        This graph is left unchanged: the result shares every table and
+        index the new rows do not touch and copies the rest, so queries keep
+        running on this graph meanwhile. Appended authors rows may add
+        authors to existing papers as well as to new ones. The landmark
+        oracle is not carried over since new collaborations can shorten
+        distances; call load_landmarks on the result to rebuild it.
+        
+        Args:
+            chunk_bytes (int): Approximate size of each chunk read
+            progress (callable, optional): Called as progress(stage, rows) while
+                                           reading, stage being "scientists",
+                                           "papers" or "authors"
+        
+        Returns:
+            tuple: (graph, message) where graph is the updated graph, this graph
+                   if no rows were appended, or None if the files changed in a
+                   way that needs a full reload
+        """
+        if self.checkpoints is None:
+            return None, "The data was not loaded from CSV files"
+        rows, checkpoints = read_appended_rows(self.data_dir, self.checkpoints, chunk_bytes, progress)
+        if rows is None:
+            return None, checkpoints
+        new_scientists, new_papers, new_authors = rows
+        if not (new_scientists or new_papers or new_authors):
+            return self, "No new rows"
+        
+        graph = CollaborationGraph(self.layout, self.data_dir)
+        graph.checkpoints = checkpoints
+        
+        # Scientists and papers: new IDs are appended, repeated ones renamed
+        graph.scientists = dict(self.scientists)
+        graph.scientist_ids = dict(self.scientist_ids)
+        added_ids = []
+        added_names = []
+        name_collision = False
+        for scientist_id, name in new_scientists:
+            if scientist_id not in graph.scientists:
+                added_ids.append(scientist_id)
+            graph.scientists[scientist_id] = name
+            if name.lower() in graph.scientist_ids:
+                name_collision = True
+            else:
+                added_names.append((name.lower(), scientist_id))
+            graph.scientist_ids[name.lower()] = scientist_id
+        
+        graph.papers = dict(self.papers)
+        graph.papers.update(new_papers)
+        graph.paper_list = self.paper_list
+        if self.compact is not None and len(graph.papers) > len(self.papers):
+            graph.paper_list = list(graph.papers)
+        
+        # Author lists grow copy-on-write; every new author pairs with the earlier ones
+        graph.paper_authors = defaultdict(list, self.paper_authors)
+        copied = set()
+        pairs = []  # (scientist_id, scientist_id, paper_id) of the new co-authorships
+        links = []  # (scientist_id, paper_id) of the new authorships
+        for scientist_id, paper_id in new_authors:
+            if scientist_id not in graph.scientists or paper_id not in graph.papers:
+                continue
+            if paper_id not in copied:
+                copied.add(paper_id)
+                graph.paper_authors[paper_id] = list(self.paper_authors.get(paper_id, ()))
+            authors_list = graph.paper_authors[paper_id]
+            pairs.extend((other_id, scientist_id, paper_id) for other_id in authors_list if other_id != scientist_id)
+            authors_list.append(scientist_id)
+            links.append((scientist_id, paper_id))
+        
+        graph._apply_links(self, added_ids, pairs, links)
+        
+        # Indexes: extend what can be extended, drop the landmark oracle
+        if name_collision or self.name_index is None:
+            graph.name_index = NameIndex(graph.scientist_ids.items())
+        else:
+            graph.name_index = self.name_index.extended(added_names)
+        if self.component_index is not None:
+            graph.component_index, touched = self.component_index.merged(added_ids, [pair[:2] for pair in pairs])
+            graph.base = (self.version, self.component_index, touched)
+        
+        return graph, (f"Applied {len(new_scientists)} scientists, {len(new_papers)} papers and "
+                       f"{len(links)} authorships rows")
+    
+    def affected_since(self, version):
+        """
+        Tell which scientists' paths may differ from those of an earlier graph
+        
+        Args:
+            version (int): Version of the earlier graph
+        
+        Returns:
+            callable or None: scientist_id -> True if paths from or to the
+                              scientist may have changed; None if this graph
+                              is not an update of that version
+        """
+        if self.base is None or self.base[0] != version:
+            return None
+        _, components, touched = self.base
+        
+        def affected(scientist_id):
+            number = components.component.get(scientist_id)
+            return number is None or number in touched
+        
+        return affected
+    
+    def dense_graph(self):
+        """
+        Get the collaborations as a CSRGraph indexed in scientist load order
+        
+        Returns:
+            CSRGraph: The compact graph of the csr layout, or a CSR copy built
+                      from the other layouts
+        """
+        if self.compact is not None:
+            return self.compact
+        if self.layout == "bipartite":
+            return CSRGraph.from_groups(list(self.scientists), self.paper_authors.values())
+        return CSRGraph.from_adjacency(self.collaborations, list(self.scientists))
+    
+    def load_landmarks(self, count=DEFAULT_LANDMARKS, workers=None, use_cache=True):
+        """
+        Build the landmark distance oracle for this graph
+        
+        Args:
+            count (int): Number of landmark scientists (highest degree first)
+            workers (int, optional): Processes computing the distances (default: CPU count)
+            use_cache (bool): Reuse the index file next to the CSVs when it is up
+                              to date, and write one after computing it otherwise
+        
+        Returns:
+            tuple: (success, message)
+        """
+        if not self.scientists:
+            return False, "No data loaded"
+        
+        # The oracle works on dense indices
+        graph = self.dense_graph()
+        
+        if use_cache and self.data_dir is not None:
+            landmark_index = read_landmarks(self.data_dir, graph, min(count, len(graph)))
+            if landmark_index is not None:
+                self.landmark_index = landmark_index
+                return True, f"Loaded {len(landmark_index.landmarks)} landmarks from cache"
+        
+        landmark_index = LandmarkIndex.build(graph, count, workers or os.cpu_count() or 1)
+        if use_cache and self.data_dir is not None:
+            write_landmarks(self.data_dir, landmark_index)
+        # Readers see either no oracle or the complete one
+        self.landmark_index = landmark_index
+        return True, f"Computed distances from {len(landmark_index.landmarks)} landmarks"
+    
+    def save_snapshot(self):
+        """
+        Write this graph as a snapshot next to its CSV files
+        
+        Returns:
+            tuple: (success, message); nothing is written when rows were
+                   appended to the files since they were parsed, since the
+                   snapshot would then hide them
+        """
+        if self.checkpoints != data_checkpoints(self.data_dir):
+            return False, "CSV files changed since they were parsed, snapshot not written"
+        
+        ids = list(self.scientists)
+        index = {scientist_id: i for i, scientist_id in enumerate(ids)}
+        
+        # Author lists keep their load order, which picks the canonical paper of every edge
+        paper_index = {paper_id: i for i, paper_id in enumerate(self.papers)}
+        authored_papers = array("i", map(paper_index.__getitem__, self.paper_authors))
+        author_offsets = array("q", [0])
+        author_targets = array("i")
+        for authors_list in self.paper_authors.values():
+            author_targets.extend(map(index.__getitem__, authors_list))
+            author_offsets.append(len(author_targets))
+        
+        # The bipartite layout never materializes collaborations; the snapshot
+        # then only carries the paper -> author links
+        graph = self.compact
+        if graph is None and self.collaborations:
+            graph = CSRGraph.from_adjacency(self.collaborations, ids)
+            graph.labels = array("i", (paper_index[self.edge_papers[_pair_key(scientist_id, ids[j])]]
+                                       for i, scientist_id in enumerate(ids) for j in graph.neighbors(i)))
+        
+        return write_snapshot(self.data_dir, ids, list(self.scientists.values()), list(self.papers),
+                              list(self.papers.values()), authored_papers, author_offsets, author_targets, graph)
+    
+    def scientist_id(self, name):
+        """Get scientist ID from name"""
+        return self.scientist_ids.get(name.lower())
+    
+    def scientist_name(self, scientist_id):
+        """Get scientist name from ID"""
+        return self.scientists.get(scientist_id)
+    
+    def search_scientists(self, partial_name, limit=None):
+        """
+        Search scientists by partial name
+        
+        Args:
+            partial_name (str): Case-insensitive substring of the name
+            limit (int, optional): Maximum number of matches to return
+        
+        Returns:
+            list: (scientist_id, name) tuples in load order
+        """
+        partial_name = partial_name.lower()
+        
+        with instrumentation.phase("search_scientists"):
+            if self.name_index is not None:
+                matches = [(sci_id, self.scientists[sci_id])
+                           for sci_id in self.name_index.search(partial_name, limit)]
+            else:
+                # No index (empty graph): scan every name
+                matches = []
+                for name, sci_id in self.scientist_ids.items():
+                    if partial_name in name:
+                        matches.append((sci_id, self.scientists[sci_id]))
+                        if limit is not None and len(matches) >= limit:
+                            break
+        instrumentation.observe("search_scientists_matches", len(matches))
+        
+        return matches
+    
+    def name_to_id(self):
+        """Get a mapping from each scientist's name, as displayed, to their ID"""
+        return {name: scientist_id for scientist_id, name in self.scientists.items()}
+    
+    def paper_title(self, paper_id):
+        """Get paper title from ID"""
+        return self.papers.get(paper_id)
+    
+    def edge_paper(self, scientist_id, other_id):
+        """
+        Get the canonical paper shared by two collaborators: the first paper
+        linking them in the order the author lists were loaded
+        
+        Args:
+            scientist_id (str): ID of one scientist
+            other_id (str): ID of a collaborator
+        
+        Returns:
+            str or None: Paper ID, or None if they never co-authored a paper
+        """
+        compact = self.compact
+        if compact is not None:
+            i = compact.index.get(scientist_id)
+            j = compact.index.get(other_id)
+            if i is None or j is None:
+                return None
+            label = compact.edge_label(i, j)
+            return None if label is None else self.paper_list[label]
+        if self.layout == "bipartite":
+            # Paper lists follow the author lists' load order, also when restored
+            # from a snapshot, so the first shared one is canonical
+            other_papers = set(self.scientist_papers.get(other_id, ()))
+            for paper_id in self.scientist_papers.get(scientist_id, ()):
+                if paper_id in other_papers:
+                    return paper_id
+            return None
+        return self.edge_papers.get(_pair_key(scientist_id, other_id))
+    
+    def path_info(self, path):
+        """
+        Describe every hop of a path of scientist IDs
+        
+        Args:
+            path (list): Scientist IDs from source to target
+        
+        Returns:
+            list: One dict per hop with the paper linking the previous scientist
+                  to the next one: paper_id, paper_title, scientist_id and
+                  scientist_name (the scientist reached by the hop)
+        """
+        info = []
+        for previous_id, scientist_id in zip(path, path[1:]):
+            paper_id = self.edge_paper(previous_id, scientist_id)
+            info.append({
+                "paper_id": paper_id,
+                "paper_title": self.papers.get(paper_id, "Unknown Title"),
+                "scientist_id": scientist_id,
+                "scientist_name": self.scientists.get(scientist_id),
+            })
+        return info
+    
+    def collaborators(self, scientist_id):
+        """Get all collaborators of a scientist"""
+        if self.compact is not None:
+            return self.compact.collaborators(scientist_id)
+        if self.layout == "bipartite":
+            collaborators = set()
+            for paper_id in self.scientist_papers.get(scientist_id, ()):
+                collaborators.update(self.paper_authors[paper_id])
+            collaborators.discard(scientist_id)
+            return collaborators
+        return self.collaborations.get(scientist_id, set())
+    
+    def papers_of(self, scientist_id):
+        """Get the IDs of the papers a scientist authored (layout="bipartite" only)"""
+        return self.scientist_papers.get(scientist_id, [])
+    
+    def authors_of(self, paper_id):
+        """Get the IDs of the authors of a paper"""
+        return self.paper_authors.get(paper_id, [])
+    
+    def _build_indexes(self):
+        """Index names for substring search and label the connected components"""
+        self.name_index = NameIndex(self.scientist_ids.items())
+        # Unconnected pairs are then answered without searching
+        self.component_index = ComponentIndex.from_groups(list(self.scientists), self.paper_authors.values())
+    
+    def _parse_csv_files(self, data_dir, progress=None, ends=None):
+        """
+        Parse the three CSV files row by row into this graph's tables
+        
+        Args:
+            data_dir (str): Path to directory containing CSV files
+            progress (callable, optional): Called as progress(stage, rows) every
+                                           PROGRESS_ROWS rows
+            ends (dict, optional): file name -> byte offset to stop reading at
+                                   (default: whole files)
+        
+        Returns:
+            tuple: (success, message)
+        """
+        ends = ends or {}
+        scientists = self.scientists
+        scientist_ids = self.scientist_ids
+        papers = self.papers
+        paper_authors = self.paper_authors
+        
+        # Load scientists data
+        scientists_file = os.path.join(data_dir, "scientists.csv")
+        if not os.path.isfile(scientists_file):
+            return False, f"Scientists file not found at '{scientists_file}'"
+        
+        try:
+            with open(scientists_file, 'rb') as f:
+                reader = csv.reader(_text_lines(f, ends.get("scientists.csv")))
+                header = next(reader, None)  # Skip header row
+                
+                # Check for both possible header formats: 'id' or 'scientist_id'
+                if not header:
+                    return False, f"Empty header in scientists file"
+                
+                # Determine column indices based on available headers
+                id_idx = -1
+                name_idx = -1
+                
+                if 'id' in header:
+                    id_idx = header.index('id')
+                elif 'scientist_id' in header:
+                    id_idx = header.index('scientist_id')
+                
+                if 'name' in header:
+                    name_idx = header.index('name')
+                
+                if id_idx == -1 or name_idx == -1:
+                    return False, f"Invalid header in scientists file: {header}. Need 'id' or 'scientist_id' and 'name' columns."
+                
+                for rows_read, row in enumerate(reader, 1):
+                    if progress is not None and rows_read % PROGRESS_ROWS == 0:
+                        progress("scientists", rows_read)
+                    if len(row) <= max(id_idx, name_idx):
+                        continue  # Skip incomplete rows
+                    
+                    scientist_id = row[id_idx].strip()
+                    name = row[name_idx].strip()
+                    
+                    if scientist_id and name:
+                        scientists[scientist_id] = name
+                        scientist_ids[name.lower()] = scientist_id
+        except Cancelled:
+            raise
+        except Exception as e:
+            return False, f"Error reading scientists file: {str(e)}"
+        
+        if not scientists:
+            return False, "No scientists loaded. Check file format."
+        
+        # Load papers data
+        papers_file = os.path.join(data_dir, "papers.csv")
+        if not os.path.isfile(papers_file):
+            return False, f"Papers file not found at '{papers_file}'"
+        
+        try:
+            with open(papers_file, 'rb') as f:
+                reader = csv.reader(_text_lines(f, ends.get("papers.csv")))
+                header = next(reader, None)  # Skip header row
+                
+                paper_id_idx = -1
+                title_idx = -1
+                
+                if 'paper_id' in header:
+                    paper_id_idx = header.index('paper_id')
+                elif 'id' in header:
+                    paper_id_idx = header.index('id')
+                
+                if 'title' in header:
+                    title_idx = header.index('title')
+                
+                if paper_id_idx == -1:
+                    return False, f"Invalid header in papers file: {header}. Need 'paper_id' or 'id' column."
+                
+                for rows_read, row in enumerate(reader, 1):
+                    if progress is not None and rows_read % PROGRESS_ROWS == 0:
+                        progress("papers", rows_read)
+                    if len(row) <= paper_id_idx:
+                        continue
+                    
+                    paper_id = row[paper_id_idx].strip()
+                    title = row[title_idx].strip() if title_idx >= 0 and len(row) > title_idx else "Unknown Title"
+                    
+                    if paper_id:
+                        papers[paper_id] = title
+        except Cancelled:
+            raise
+        except Exception as e:
+            return False, f"Error reading papers file: {str(e)}"
+        
+        # Load author relationships
+        authors_file = os.path.join(data_dir, "authors.csv")
+        if not os.path.isfile(authors_file):
+            return False, f"Authors file not found at '{authors_file}'"
+        
+        try:
+            with open(authors_file, 'rb') as f:
+                reader = csv.reader(_text_lines(f, ends.get("authors.csv")))
+                header = next(reader, None)  # Skip header row
+                
+                scientist_id_idx = -1
+                paper_id_idx = -1
+                
+                if 'scientist_id' in header:
+                    scientist_id_idx = header.index('scientist_id')
+                
+                if 'paper_id' in header:
+                    paper_id_idx = header.index('paper_id')
+                
+                if scientist_id_idx == -1 or paper_id_idx == -1:
+                    return False, f"Invalid header in authors file: {header}. Need 'scientist_id' and 'paper_id' columns."
+                
+                for rows_read, row in enumerate(reader, 1):
+                    if progress is not None and rows_read % PROGRESS_ROWS == 0:
+                        progress("authors", rows_read)
+                    if len(row) <= max(scientist_id_idx, paper_id_idx):
+                        continue
+                    
+                    scientist_id = row[scientist_id_idx].strip()
+                    paper_id = row[paper_id_idx].strip()
+                    
+                    if scientist_id in scientists and paper_id in papers:
+                        paper_authors[paper_id].append(scientist_id)
+        except Cancelled:
+            raise
+        except Exception as e:
+            return False, f"Error reading authors file: {str(e)}"
+        
+        return True, "Parsed CSV files"
+    
+    def _link_collaborations(self, progress=None):
+        """Fill collaborations and edge_papers from paper_authors (layout="sets")"""
+        collaborations = self.collaborations
+        edge_papers = self.edge_papers
+        
+        # Build the collaboration network, remembering the first paper of every pair
+        for papers_linked, (paper_id, authors_list) in enumerate(self.paper_authors.items(), 1):
+            if progress is not None and papers_linked % PROGRESS_ROWS == 0:
+                progress("collaborations", papers_linked)
+            if len(authors_list) < 2:
+                continue  # Skip papers with only one author
+            
+            # For each pair of scientists who co-authored this paper
+            for i in range(len(authors_list)):
+                for j in range(i+1, len(authors_list)):
+                    sci1_id = authors_list[i]
+                    sci2_id = authors_list[j]
+                    if sci1_id == sci2_id:
+                        continue  # Repeated authors rows do not link a scientist to themselves
+                    
+                    # Add bidirectional collaborations
+                    if sci1_id not in collaborations:
+                        collaborations[sci1_id] = set()
+                    if sci2_id not in collaborations:
+                        collaborations[sci2_id] = set()
+                    
+                    collaborations[sci1_id].add(sci2_id)
+                    collaborations[sci2_id].add(sci1_id)
+                    edge_papers.setdefault(_pair_key(sci1_id, sci2_id), paper_id)
+    
+    def _link_scientist_papers(self):
+        """Fill scientist_papers from paper_authors"""
+        scientist_papers = self.scientist_papers
+        for paper_id, authors_list in self.paper_authors.items():
+            for scientist_id in authors_list:
+                paper_list = scientist_papers.get(scientist_id)
+                if paper_list is None:
+                    scientist_papers[scientist_id] = [paper_id]
+                elif paper_list[-1] != paper_id:
+                    paper_list.append(paper_id)
+    
+    def _apply_links(self, base, added_ids, pairs, links):
+        """
+        Derive this graph's collaborations from those of the graph it updates
+        
+        Args:
+            base (CollaborationGraph): Graph being updated
+            added_ids (list): IDs of the new scientists
+            pairs (list): (scientist_id, scientist_id, paper_id) new co-authorships
+            links (list): (scientist_id, paper_id) new authorships
+        """
+        # Canonical papers are the first in author list order, as in a full load
+        order = {paper_id: i for i, paper_id in enumerate(self.paper_authors)} if links else {}
+        
+        if self.layout == "bipartite":
+            self.scientist_papers = dict(base.scientist_papers)
+            linked = defaultdict(set)
+            for scientist_id, paper_id in links:
+                linked[scientist_id].add(paper_id)
+            for scientist_id, paper_ids in linked.items():
+                paper_ids.update(base.scientist_papers.get(scientist_id, ()))
+                self.scientist_papers[scientist_id] = sorted(paper_ids, key=order.__getitem__)
+            return
+        
+        # Earliest paper of every newly linked pair
+        first = {}
+        for scientist_id, other_id, paper_id in pairs:
+            key = _pair_key(scientist_id, other_id)
+            current = first.get(key)
+            if current is None or order[paper_id] < order[current]:
+                first[key] = paper_id
+        
+        if base.compact is not None:
+            compact = base.compact
+            if not first and not added_ids:
+                self.compact = compact
+                return
+            ids = list(compact.ids) + added_ids
+            index = compact.index
+            dense = dict(index)
+            dense.update((scientist_id, len(index) + i) for i, scientist_id in enumerate(added_ids))
+            wanted = set(first.values())
+            paper_index = {paper_id: i for i, paper_id in enumerate(self.paper_list) if paper_id in wanted}
+            additions = defaultdict(dict)
+            for (scientist_id, other_id), paper_id in first.items():
+                i, j = dense[scientist_id], dense[other_id]
+                label = compact.edge_label(i, j) if i < len(index) and j < len(index) else None
+                if label is not None and order[base.paper_list[label]] <= order[paper_id]:
+                    continue
+                additions[i][j] = additions[j][i] = paper_index[paper_id]
+            self.compact = compact.merged(ids, additions)
+            return
+        
+        self.collaborations = dict(base.collaborations)
+        self.edge_papers = dict(base.edge_papers)
+        copied = set()
+        for key, paper_id in first.items():
+            for scientist_id, other_id in (key, key[::-1]):
+                if scientist_id not in copied:
+                    copied.add(scientist_id)
+                    self.collaborations[scientist_id] = set(base.collaborations.get(scientist_id, ()))
+                self.collaborations[scientist_id].add(other_id)
+            current = self.edge_papers.get(key)
+            if current is None or order[paper_id] < order[current]:
+                self.edge_papers[key] = paper_id
+    
+    def _restore_snapshot(self, sections):
+        """Populate this graph from the sections of a memory-mapped snapshot"""
+        ids = sections["scientist_ids"]
+        self.scientists = dict(zip(ids, sections["scientist_names"]))
+        self.scientist_ids = {name.lower(): scientist_id for scientist_id, name in self.scientists.items()}
+        self.papers = dict(zip(sections["paper_ids"], sections["paper_titles"]))
+        
+        paper_ids = sections["paper_ids"]
+        author_offsets = sections["paper_author_offsets"]
+        author_targets = sections["paper_author_targets"]
+        for i, paper in enumerate(sections["authored_papers"]):
+            start, end = author_offsets[i], author_offsets[i + 1]
+            self.paper_authors[paper_ids[paper]] = [ids[j] for j in author_targets[start:end]]
+        
+        if self.layout == "bipartite":
+            self._link_scientist_papers()
+            return
+        
+        paper_list = self.paper_list = sections["paper_ids"]
+        offsets = sections.get("collaboration_offsets")
+        targets = sections.get("collaboration_targets")
+        labels = sections.get("collaboration_papers")
+        if offsets is None or labels is None:
+            # Written by a bipartite load or without edge papers: derive the collaborations now
+            paper_index = {paper_id: i for i, paper_id in enumerate(paper_list)}
+            graph = CSRGraph.from_groups(ids, self.paper_authors.values(),
+                                         map(paper_index.__getitem__, self.paper_authors))
+            offsets, targets, labels = graph.offsets, graph.targets, graph.labels
+        
+        if self.layout == "csr":
+            # The arrays stay backed by the memory mapping
+            self.compact = CSRGraph(ids, offsets, targets, labels)
+            return
+        
+        for i, scientist_id in enumerate(ids):
+            start, end = offsets[i], offsets[i + 1]
+            if start < end:
+                self.collaborations[scientist_id] = {ids[j] for j in targets[start:end]}
+                for position in range(start, end):
+                    j = targets[position]
+                    if i < j:
+                        self.edge_papers[_pair_key(scientist_id, ids[j])] = paper_list[labels[position]]
+
+
+def _text_lines(f, end=None):
+    """Decode the lines of a binary file that start before byte end"""
+    position = 0
+    for line in f:
+        if end is not None and position >= end:
+            break
+        position += len(line)
+        yield line.decode('utf-8', 'replace')
+
+
+def _pair_key(scientist_id, other_id):
+    """Key of edge_papers for an unordered pair of scientists"""
+    return (scientist_id, other_id) if scientist_id < other_id else (other_id, scientist_id)
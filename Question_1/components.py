@@ -0,0 +1,172 @@
+"""
+Components Module - Connected components of the collaboration graph
+
+Components are found with a union-find over the author lists of papers, so
+they are available for every layout without building the collaboration
+sets. Each scientist gets a component number, numbered by decreasing size,
+and two scientists are connected exactly when their numbers match.
+"""
+
+from array import array
+
+
+class ComponentIndex:
+    """Component number and size for every scientist"""
+    
+    __slots__ = ("component", "sizes")
+    
+    def __init__(self, component, sizes):
+        """
+        Args:
+            component (dict): scientist_id -> component number
+            sizes (list): Number of scientists in each component, largest first
+        """
+        self.component = component
+        self.sizes = sizes
+    
+    @classmethod
+    def from_groups(cls, ids, groups):
+        """
+        Label the components where every member of a group is connected to
+        every other member, e.g. the author lists of papers
+        
+        Args:
+            ids (list): All scientist IDs; scientists in no group are
+                        components of their own
+            groups (iterable): Lists of scientist IDs that collaborated
+        
+        Returns:
+            ComponentIndex: The labelled components
+        """
+        index = {scientist_id: i for i, scientist_id in enumerate(ids)}
+        parent = array("i", range(len(ids)))
+        size = array("i", [1]) * len(ids)
+        
+        def find(node):
+            # Path halving keeps the trees flat
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+        
+        for group in groups:
+            if len(group) < 2:
+                continue
+            root = find(index[group[0]])
+            for scientist_id in group[1:]:
+                other = find(index[scientist_id])
+                if other == root:
+                    continue
+                # Union by size
+                if size[other] > size[root]:
+                    root, other = other, root
+                parent[other] = root
+                size[root] += size[other]
+        
+        roots = [find(i) for i in range(len(ids))]
+        # Number the components from the largest down, ties by first member
+        order = sorted(set(roots), key=lambda root: (-size[root], root))
+        number = {root: n for n, root in enumerate(order)}
+        
+        component = {scientist_id: number[root] for scientist_id, root in zip(ids, roots)}
+        return cls(component, [size[root] for root in order])
+    
+    def merged(self, new_ids, groups):
+        """
+        Label the components after scientists and collaborations were added
+        
+        Existing components can only grow or merge, so the union-find runs
+        over component numbers rather than scientists.
+        
+        Args:
+            new_ids (list): IDs of the scientists added since this index was built
+            groups (iterable): Lists of scientist IDs that newly collaborated
+        
+        Returns:
+            tuple: (ComponentIndex, touched) where touched is the set of
+                   numbers in this index of the components that gained a
+                   collaboration, whose distances may therefore have changed
+        """
+        count = len(self.sizes)
+        # Nodes are the current components followed by one per new scientist
+        new_index = {scientist_id: count + i for i, scientist_id in enumerate(new_ids)}
+        parent = array("i", range(count + len(new_ids)))
+        size = array("i", self.sizes)
+        size.extend([1] * len(new_ids))
+        touched = set()
+        
+        def node_of(scientist_id):
+            number = self.component.get(scientist_id)
+            return new_index[scientist_id] if number is None else number
+        
+        def find(node):
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+        
+        for group in groups:
+            if len(group) < 2:
+                continue
+            nodes = [node_of(scientist_id) for scientist_id in group]
+            touched.update(node for node in nodes if node < count)
+            root = find(nodes[0])
+            for node in nodes[1:]:
+                other = find(node)
+                if other == root:
+                    continue
+                if size[other] > size[root]:
+                    root, other = other, root
+                parent[other] = root
+                size[root] += size[other]
+        
+        if not touched and not new_ids:
+            return self, touched
+        
+        roots = [find(node) for node in range(len(parent))]
+        order = sorted(set(roots), key=lambda root: (-size[root], root))
+        number = {root: n for n, root in enumerate(order)}
+        
+        component = {scientist_id: number[roots[old]] for scientist_id, old in self.component.items()}
+        component.update((scientist_id, number[roots[node]]) for scientist_id, node in new_index.items())
+        return ComponentIndex(component, [size[root] for root in order]), touched
+    
+    def __len__(self):
+        return len(self.sizes)
+    
+    def component_of(self, scientist_id):
+        """Get the component number of a scientist, or None if unknown"""
+        return self.component.get(scientist_id)
+    
+    def size_of(self, scientist_id):
+        """Get the number of scientists in the component of a scientist (0 if unknown)"""
+        number = self.component.get(scientist_id)
+        return 0 if number is None else self.sizes[number]
+    
+    def connected(self, source_id, target_id):
+        """True if a path exists between two known scientists"""
+        source = self.component.get(source_id)
+        return source is not None and source == self.component.get(target_id)
+    
+    def summary(self, top=10):
+        """
+        Summarize the component sizes
+        
+        Args:
+            top (int): Number of largest component sizes to list
+        
+        Returns:
+            dict: Component count, scientist count, isolated scientists,
+                  the largest sizes and a histogram of sizes by power of two
+        """
+        histogram = {}
+        for component_size in self.sizes:
+            bucket = 1 << (component_size.bit_length() - 1)
+            histogram[bucket] = histogram.get(bucket, 0) + 1
+        return {
+            "components": len(self.sizes),
+            "scientists": sum(self.sizes),
+            "isolated": sum(1 for component_size in self.sizes if component_size == 1),
+            "largest": self.sizes[:top],
+            "size_histogram": dict(sorted(histogram.items())),
+        }
@@ -0,0 +1,213 @@
+"""
+CSR Graph Module - Compact integer-indexed adjacency for the collaboration graph
+
+Scientist IDs are interned to dense integers and the adjacency is stored as
+compressed sparse row (CSR) arrays: the collaborators of scientist i are
+targets[offsets[i]:offsets[i + 1]]. An optional labels array parallel to
+targets records one integer per edge, such as the paper linking the pair.
+"""
+
+from array import array
+from bisect import bisect_left
+from itertools import repeat
+
+
+class CSRGraph:
+    """Read-only undirected graph stored as CSR offset/neighbor arrays"""
+    
+    __slots__ = ("ids", "index", "offsets", "targets", "labels")
+    
+    def __init__(self, ids, offsets, targets, labels=None):
+        """
+        Args:
+            ids (list): Scientist ID for every dense index
+            offsets (array): len(ids) + 1 start positions into targets
+            targets (array): Concatenated, sorted neighbor indices
+            labels (array, optional): One integer label per entry of targets
+        """
+        self.ids = ids
+        self.index = {scientist_id: i for i, scientist_id in enumerate(ids)}
+        self.offsets = offsets
+        self.targets = targets
+        self.labels = labels
+    
+    @classmethod
+    def from_groups(cls, ids, groups, group_labels=None):
+        """
+        Build the graph where every member of a group is connected to
+        every other member, e.g. the author lists of papers
+        
+        Args:
+            ids (list): All scientist IDs; their order defines the dense indices
+            groups (iterable): Lists of scientist IDs that collaborated
+            group_labels (iterable, optional): One integer per group; each edge
+                                               is labelled by the first group
+                                               that links its pair
+        
+        Returns:
+            CSRGraph: The compact graph
+        """
+        index = {scientist_id: i for i, scientist_id in enumerate(ids)}
+        adjacency = [None] * len(ids)
+        
+        if group_labels is not None:
+            for group, label in zip(groups, group_labels):
+                if len(group) < 2:
+                    continue
+                members = [index[scientist_id] for scientist_id in group]
+                for member in members:
+                    neighbors = adjacency[member]
+                    if neighbors is None:
+                        neighbors = adjacency[member] = {}
+                    for other in members:
+                        if other not in neighbors:
+                            neighbors[other] = label
+            return cls._from_labelled_adjacency(ids, adjacency)
+        
+        for group in groups:
+            if len(group) < 2:
+                continue  # Skip papers with only one author
+            members = [index[scientist_id] for scientist_id in group]
+            for member in members:
+                neighbors = adjacency[member]
+                if neighbors is None:
+                    neighbors = adjacency[member] = set()
+                neighbors.update(members)
+        
+        return cls._from_int_adjacency(ids, adjacency)
+    
+    @classmethod
+    def from_adjacency(cls, adjacency, ids=None):
+        """
+        Build the graph from a dict-of-sets adjacency
+        
+        Args:
+            adjacency (dict): scientist_id -> set of collaborator_ids
+            ids (list, optional): All scientist IDs in dense index order;
+                                  defaults to the dict's key order
+        
+        Returns:
+            CSRGraph: The compact graph
+        """
+        if ids is None:
+            ids = list(adjacency)
+        index = {scientist_id: i for i, scientist_id in enumerate(ids)}
+        int_adjacency = [{index[other] for other in adjacency.get(scientist_id, ())} for scientist_id in ids]
+        return cls._from_int_adjacency(ids, int_adjacency)
+    
+    @classmethod
+    def _from_int_adjacency(cls, ids, adjacency):
+        """Flatten a list of integer neighbor sets (or None) into CSR arrays"""
+        offsets = array("q", [0])
+        targets = array("i")
+        for i, neighbors in enumerate(adjacency):
+            if neighbors:
+                neighbors.discard(i)
+                targets.extend(sorted(neighbors))
+            offsets.append(len(targets))
+        return cls(ids, offsets, targets)
+    
+    @classmethod
+    def _from_labelled_adjacency(cls, ids, adjacency):
+        """Flatten a list of integer neighbor -> label dicts (or None) into CSR arrays"""
+        offsets = array("q", [0])
+        targets = array("i")
+        labels = array("i")
+        for i, neighbors in enumerate(adjacency):
+            if neighbors:
+                neighbors.pop(i, None)
+                ordered = sorted(neighbors)
+                targets.extend(ordered)
+                labels.extend(neighbors[j] for j in ordered)
+            offsets.append(len(targets))
+        return cls(ids, offsets, targets, labels)
+    
+    def merged(self, ids, additions):
+        """
+        Return a new graph with scientists and edges added, leaving this one unchanged
+        
+        Rows of unchanged scientists are copied as whole runs of the arrays.
+        
+        Args:
+            ids (list): All scientist IDs, starting with this graph's IDs in order
+            additions (dict): Dense index -> {neighbor index: label} of the edges
+                              to add, in both directions; existing edges get the
+                              new label (labels are ignored on unlabelled graphs)
+        
+        Returns:
+            CSRGraph: The merged graph
+        """
+        old_count = len(self.ids)
+        old_offsets = self.offsets
+        offsets = array("q", [0])
+        targets = array("i")
+        labels = None if self.labels is None else array("i")
+        
+        start = 0  # first scientist whose row is not written yet
+        for node in sorted(additions) + [len(ids)]:
+            # Unchanged rows of this graph, then new scientists without collaborators
+            end = min(node, old_count)
+            if start < end:
+                first, last = old_offsets[start], old_offsets[end]
+                shift = len(targets) - first
+                offsets.extend(old_offsets[i] + shift for i in range(start + 1, end + 1))
+                targets.frombytes(self.targets[first:last].tobytes())
+                if labels is not None:
+                    labels.frombytes(self.labels[first:last].tobytes())
+            offsets.extend(repeat(len(targets), max(0, node - max(start, old_count))))
+            if node == len(ids):
+                break
+            
+            neighbors = {}
+            if node < old_count:
+                first, last = old_offsets[node], old_offsets[node + 1]
+                old_labels = self.labels[first:last] if labels is not None else repeat(None)
+                neighbors.update(zip(self.targets[first:last], old_labels))
+            neighbors.update(additions[node])
+            neighbors.pop(node, None)
+            ordered = sorted(neighbors)
+            targets.extend(ordered)
+            if labels is not None:
+                labels.extend(neighbors[j] for j in ordered)
+            offsets.append(len(targets))
+            start = node + 1
+        
+        return CSRGraph(ids, offsets, targets, labels)
+    
+    def __len__(self):
+        return len(self.ids)
+    
+    def neighbors(self, i):
+        """Return the neighbor indices of dense index i"""
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+    
+    def degree(self, i):
+        """Return the number of neighbors of dense index i"""
+        return self.offsets[i + 1] - self.offsets[i]
+    
+    def edge_label(self, i, j):
+        """Return the label of the edge between dense indices i and j, or None"""
+        if self.labels is None:
+            return None
+        start, end = self.offsets[i], self.offsets[i + 1]
+        position = bisect_left(self.targets, j, start, end)
+        if position < end and self.targets[position] == j:
+            return self.labels[position]
+        return None
+    
+    def collaborators(self, scientist_id):
+        """Return the set of collaborator IDs for a scientist ID"""
+        i = self.index.get(scientist_id)
+        if i is None:
+            return set()
+        ids = self.ids
+        return {ids[j] for j in self.neighbors(i)}
+    
+    def edge_count(self):
+        """Return the number of undirected edges"""
+        return len(self.targets) // 2
+    
+    def nbytes(self):
+        """Return the size in bytes of the offset and neighbor arrays"""
+        return (len(self.offsets) * self.offsets.itemsize
+                + len(self.targets) * self.targets.itemsize)
@@ -1,204 +1,259 @@
 """
 Data Access Module - Handles loading and accessing scientist and collaboration data
 from papers and authors CSV files
+
+The loaded data lives in a CollaborationGraph. This module holds the current
+one and swaps in a freshly loaded graph only once it is complete, so queries
+keep running against the previous data while a reload is in progress. Code
+that needs a consistent view across several calls should take the graph once
+with get_graph() and query it directly.
 """
 
-import os
-import csv
-from collections import defaultdict
+import threading
+from bulk_loader import DEFAULT_CHUNK_BYTES
+from landmarks import DEFAULT_LANDMARKS
+from collaboration_graph import CollaborationGraph, LAYOUTS, LOADERS, PROGRESS_ROWS
+import instrumentation
+
+# Public API; the layout, loader and progress constants are re-exported for callers
+__all__ = ["load_data", "update_data", "load_landmarks", "get_graph", "set_graph", "get_scientist_id",
+           "get_scientist_name", "search_scientists", "get_all_scientists", "get_name_to_id",
+           "get_paper_title", "get_edge_paper", "get_path_info", "get_collaborators", "get_scientist_papers",
+           "get_paper_authors", "get_layout", "get_component_index", "get_landmark_index",
+           "get_data_version", "get_compact_graph", "LAYOUTS", "LOADERS", "PROGRESS_ROWS"]
+
+# The current dataset; replaced as a whole, never modified in place
+_graph = CollaborationGraph()
 
-# Global data structures
-scientists = {}  # id -> name
-scientist_ids = {}  # name -> id (lowercased for case-insensitive lookup)
-papers = {}  # paper_id -> title
-paper_authors = defaultdict(list)  # paper_id -> list of scientist_ids
-collaborations = {}  # scientist_id -> set of collaborator_ids
+# Serializes loads so two reloads cannot race to install their graphs
+_load_lock = threading.Lock()
 
 
-def load_data(data_dir):
+def load_data(data_dir, layout="sets", use_snapshot=True, loader="csv", chunk_bytes=DEFAULT_CHUNK_BYTES,
+              workers=None, progress=None):
     """
     Load scientists and derive collaborations data from CSV files
     
+    The new data replaces the current data atomically once it is fully
+    loaded; if loading fails or is aborted the current data stays in place.
+    
     Args:
         data_dir (str): Path to directory containing CSV files
+        layout (str): "sets" keeps a dict of collaborator sets, "csr" interns
+                      scientist IDs to ints and stores compact CSR arrays,
+                      "bipartite" keeps only scientist <-> paper links so
+                      papers with many authors are never expanded into cliques
+        use_snapshot (bool): Load from the binary snapshot next to the CSVs
+                             when it is up to date, and write one after
+                             parsing the CSVs otherwise
+        loader (str): "csv" parses row by row, "bulk" parses large chunks
+                      into columns and joins them in bulk, "parallel" does
+                      the same with a process pool
+        chunk_bytes (int): Approximate chunk size for the bulk and parallel loaders
+        workers (int, optional): Worker processes for the parallel loader
+                                 (default: CPU count)
+        progress (callable, optional): Called as progress(stage, count) while
+                                       loading, where stage is "scientists",
+                                       "papers", "authors" (rows parsed so far)
+                                       or "collaborations" (papers linked); it
+                                       may raise to abort the load
     
     Returns:
         tuple: (success, message) where success is a boolean indicating if loading was successful
                and message is a string with details
     """
-    global scientists, scientist_ids, papers, paper_authors, collaborations
-    
-    # Reset data structures
-    scientists = {}
-    scientist_ids = {}
-    papers = {}
-    paper_authors = defaultdict(list)
-    collaborations = {}
-    
-    # Check if directory exists
-    if not os.path.isdir(data_dir):
-        return False, f"Directory '{data_dir}' does not exist"
-    
-    # Load scientists data
-    scientists_file = os.path.join(data_dir, "scientists.csv")
-    if not os.path.isfile(scientists_file):
-        return False, f"Scientists file not found at '{scientists_file}'"
-    
-    try:
-        with open(scientists_file, 'r', encoding='utf-8', errors='replace') as f:
-            reader = csv.reader(f)
-            header = next(reader, None)  # Skip header row
-            
-            # Check for both possible header formats: 'id' or 'scientist_id'
-            if not header:
-                return False, f"Empty header in scientists file"
-            
-            # Determine column indices based on available headers
-            id_idx = -1
-            name_idx = -1
-            
-            if 'id' in header:
-                id_idx = header.index('id')
-            elif 'scientist_id' in header:
-                id_idx = header.index('scientist_id')
-            
-            if 'name' in header:
-                name_idx = header.index('name')
-            
-            if id_idx == -1 or name_idx == -1:
-                return False, f"Invalid header in scientists file: {header}. Need 'id' or 'scientist_id' and 'name' columns."
-            
-            for row in reader:
-                if len(row) <= max(id_idx, name_idx):
-                    continue  # Skip incomplete rows
-                
-                scientist_id = row[id_idx].strip()
-                name = row[name_idx].strip()
-                
-                if scientist_id and name:
-                    scientists[scientist_id] = name
-                    scientist_ids[name.lower()] = scientist_id
-    except Exception as e:
-        return False, f"Error reading scientists file: {str(e)}"
-    
-    if not scientists:
-        return False, "No scientists loaded. Check file format."
+    with _load_lock, instrumentation.phase("load"):
+        graph, message = CollaborationGraph.load(data_dir, layout, use_snapshot, loader, chunk_bytes,
+                                                 workers, progress)
+        if graph is None:
+            instrumentation.count("load_failures")
+            return False, message
+        set_graph(graph)
+    return True, message
+
+
+def update_data(use_snapshot=True, chunk_bytes=DEFAULT_CHUNK_BYTES, progress=None):
+    """
+    Apply the rows appended to the CSV files since the current data was loaded
     
-    # Load papers data
-    papers_file = os.path.join(data_dir, "papers.csv")
-    if not os.path.isfile(papers_file):
-        return False, f"Papers file not found at '{papers_file}'"
+    Only the new rows are parsed and only the parts of the graph and its
+    indexes they touch are rebuilt; cached paths between scientists whose
+    components gained no collaboration stay valid. When a file was changed
+    other than by appending, the data is reloaded in full with the same layout.
+    A landmark oracle loaded for the current data is recomputed for the new
+    data before it replaces the current one.
     
-    try:
-        with open(papers_file, 'r', encoding='utf-8', errors='replace') as f:
-            reader = csv.reader(f)
-            header = next(reader, None)  # Skip header row
-            
-            paper_id_idx = -1
-            title_idx = -1
-            
-            if 'paper_id' in header:
-                paper_id_idx = header.index('paper_id')
-            elif 'id' in header:
-                paper_id_idx = header.index('id')
-                
-            if 'title' in header:
-                title_idx = header.index('title')
-            
-            if paper_id_idx == -1:
-                return False, f"Invalid header in papers file: {header}. Need 'paper_id' or 'id' column."
-            
-            for row in reader:
-                if len(row) <= paper_id_idx:
-                    continue
-                
-                paper_id = row[paper_id_idx].strip()
-                title = row[title_idx].strip() if title_idx >= 0 and len(row) > title_idx else "Unknown Title"
-                
-                if paper_id:
-                    papers[paper_id] = title
-    except Exception as e:
-        return False, f"Error reading papers file: {str(e)}"
+    Args:
+        use_snapshot (bool): Rewrite the snapshot after the update, or use it
+                             for a full reload
+        chunk_bytes (int): Approximate size of each chunk read
+        progress (callable, optional): Called as progress(stage, count) while
+                                       loading, as for load_data
     
-    # Load author relationships
-    authors_file = os.path.join(data_dir, "authors.csv")
-    if not os.path.isfile(authors_file):
-        return False, f"Authors file not found at '{authors_file}'"
+    Returns:
+        tuple: (success, message)
+    """
+    with _load_lock:
+        current = _graph
+        if current.data_dir is None:
+            return False, "No data loaded from CSV files"
+        
+        with instrumentation.phase("update"):
+            graph, message = current.update(chunk_bytes, progress)
+        if graph is None:
+            instrumentation.count("update_full_reloads")
+            graph, message = CollaborationGraph.load(current.data_dir, current.layout, use_snapshot,
+                                                     chunk_bytes=chunk_bytes, progress=progress)
+            if graph is None:
+                return False, message
+        elif graph is not current and use_snapshot:
+            # Skipped while a partial row is pending, which a snapshot would hide
+            graph.save_snapshot()
+        if graph is not current and current.landmark_index is not None:
+            # New collaborations can shorten distances, so the old bounds no longer hold
+            with instrumentation.phase("update_landmarks"):
+                graph.load_landmarks(len(current.landmark_index.landmarks), use_cache=use_snapshot)
+        set_graph(graph)
+    return True, message
+
+
+def load_landmarks(count=DEFAULT_LANDMARKS, workers=None, use_cache=True):
+    """
+    Build the landmark distance oracle for the loaded data
     
-    try:
-        with open(authors_file, 'r', encoding='utf-8', errors='replace') as f:
-            reader = csv.reader(f)
-            header = next(reader, None)  # Skip header row
-            
-            scientist_id_idx = -1
-            paper_id_idx = -1
-            
-            if 'scientist_id' in header:
-                scientist_id_idx = header.index('scientist_id')
-            
-            if 'paper_id' in header:
-                paper_id_idx = header.index('paper_id')
-            
-            if scientist_id_idx == -1 or paper_id_idx == -1:
-                return False, f"Invalid header in authors file: {header}. Need 'scientist_id' and 'paper_id' columns."
-            
-            for row in reader:
-                if len(row) <= max(scientist_id_idx, paper_id_idx):
-                    continue
-                
-                scientist_id = row[scientist_id_idx].strip()
-                paper_id = row[paper_id_idx].strip()
-                
-                if scientist_id in scientists and paper_id in papers:
-                    paper_authors[paper_id].append(scientist_id)
-    except Exception as e:
-        return False, f"Error reading authors file: {str(e)}"
+    Args:
+        count (int): Number of landmark scientists (highest degree first)
+        workers (int, optional): Processes computing the distances (default: CPU count)
+        use_cache (bool): Reuse the index file next to the CSVs when it is up
+                          to date, and write one after computing it otherwise
     
-    # Build the collaboration network
-    for paper_id, authors_list in paper_authors.items():
-        if len(authors_list) < 2:
-            continue  # Skip papers with only one author
-        
-        # For each pair of scientists who co-authored this paper
-        for i in range(len(authors_list)):
-            for j in range(i+1, len(authors_list)):
-                sci1_id = authors_list[i]
-                sci2_id = authors_list[j]
-                
-                # Add bidirectional collaborations
-                if sci1_id not in collaborations:
-                    collaborations[sci1_id] = set()
-                if sci2_id not in collaborations:
-                    collaborations[sci2_id] = set()
-                
-                collaborations[sci1_id].add(sci2_id)
-                collaborations[sci2_id].add(sci1_id)
+    Returns:
+        tuple: (success, message)
+    """
+    return _graph.load_landmarks(count, workers, use_cache)
+
+
+def get_graph():
+    """Get the current CollaborationGraph; it stays valid after a reload"""
+    return _graph
+
+
+def set_graph(graph):
+    """
+    Make a graph the current dataset
     
-    return True, f"Successfully loaded {len(scientists)} scientists and derived collaborations"
+    Args:
+        graph (CollaborationGraph): Fully built graph; queries already running
+                                    finish on the graph they started with
+    """
+    global _graph
+    _graph = graph
 
 
 def get_scientist_id(name):
     """Get scientist ID from name"""
-    return scientist_ids.get(name.lower())
+    return _graph.scientist_id(name)
 
 
 def get_scientist_name(scientist_id):
     """Get scientist name from ID"""
-    return scientists.get(scientist_id)
+    return _graph.scientist_name(scientist_id)
+
+
+def search_scientists(partial_name, limit=None):
+    """
+    Search scientists by partial name
+    
+    Args:
+        partial_name (str): Case-insensitive substring of the name
+        limit (int, optional): Maximum number of matches to return
+    
+    Returns:
+        list: (scientist_id, name) tuples in load order
+    """
+    return _graph.search_scientists(partial_name, limit)
+
+
+def get_all_scientists():
+    """Get the id -> name mapping of all scientists (do not modify it)"""
+    return _graph.scientists
+
+
+def get_name_to_id():
+    """Get a mapping from each scientist's name, as displayed, to their ID"""
+    return _graph.name_to_id()
+
+
+def get_paper_title(paper_id):
+    """Get paper title from ID"""
+    return _graph.paper_title(paper_id)
 
 
-def search_scientists(partial_name):
-    """Search scientists by partial name"""
-    partial_name = partial_name.lower()
-    matches = []
+def get_edge_paper(scientist_id, other_id):
+    """
+    Get the canonical paper shared by two collaborators: the first paper
+    linking them in the order the author lists were loaded
     
-    for name, sci_id in scientist_ids.items():
-        if partial_name in name:
-            matches.append((sci_id, scientists[sci_id]))
+    Args:
+        scientist_id (str): ID of one scientist
+        other_id (str): ID of a collaborator
     
-    return matches
+    Returns:
+        str or None: Paper ID, or None if they never co-authored a paper
+    """
+    return _graph.edge_paper(scientist_id, other_id)
+
+
+def get_path_info(path):
+    """
+    Describe every hop of a path of scientist IDs
+    
+    Args:
+        path (list): Scientist IDs from source to target
+    
+    Returns:
+        list: One dict per hop with the paper linking the previous scientist
+              to the next one: paper_id, paper_title, scientist_id and
+              scientist_name (the scientist reached by the hop)
+    """
+    return _graph.path_info(path)
 
 
 def get_collaborators(scientist_id):
     """Get all collaborators of a scientist"""
-    return collaborations.get(scientist_id, set())
\ No newline at end of file
+    return _graph.collaborators(scientist_id)
+
+
+def get_scientist_papers(scientist_id):
+    """Get the IDs of the papers a scientist authored (layout="bipartite" only)"""
+    return _graph.papers_of(scientist_id)
+
+
+def get_paper_authors(paper_id):
+    """Get the IDs of the authors of a paper"""
+    return _graph.authors_of(paper_id)
+
+
+def get_layout():
+    """Get the layout the current data was loaded with"""
+    return _graph.layout
+
+
+def get_component_index():
+    """Get the ComponentIndex of the loaded data, or None if nothing is loaded"""
+    return _graph.component_index
+
+
+def get_landmark_index():
+    """Get the LandmarkIndex built by load_landmarks, or None"""
+    return _graph.landmark_index
+
+
+def get_data_version():
+    """Get a number that changes every time the data is (re)loaded"""
+    return _graph.version
+
+
+def get_compact_graph():
+    """Get the CSRGraph if data was loaded with layout="csr", otherwise None"""
+    return _graph.compact
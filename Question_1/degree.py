@@ -1,6 +1,7 @@
 import csv
 import sys
-from collections import deque
+from itertools import islice
+from search_core import bipartite_bfs_parents, labelled_path_from_parents, iter_shortest_paths
 
 # Maps names to a set of corresponding scientist_ids
 name_to_ids = {}
@@ -105,36 +106,38 @@ def shortest_path(source, target):
     if source == target:
         return []
     
-    # Initialize a queue for BFS
-    queue = deque([(source, [])])
+    # BFS keeping one (previous scientist, paper) entry per explored scientist,
+    # expanding every paper's author set only once
+    parents, found = bipartite_bfs_parents(
+        source, target,
+        lambda scientist_id: scientist_data[scientist_id]["papers"],
+        lambda paper_id: paper_data[paper_id]["authors"],
+    )
     
-    # Keep track of explored scientists
-    explored = {source}
+    # No path found
+    if not found:
+        return None
     
-    # BFS
-    while queue:
-        # Get the next scientist and path to reach them
-        current_scientist, path = queue.popleft()
-        
-        # Get all neighbors (co-authors)
-        for paper_id, neighbor_id in neighbors_for_person(current_scientist):
-            # Check if we've reached the target
-            if neighbor_id == target:
-                # Return the path including this last step
-                return path + [(paper_id, neighbor_id)]
-            
-            # If neighbor hasn't been explored, add to queue
-            if neighbor_id not in explored:
-                explored.add(neighbor_id)
-                queue.append((neighbor_id, path + [(paper_id, neighbor_id)]))
+    return labelled_path_from_parents(parents, target)
+
+
+def all_shortest_paths(source, target, limit=None):
+    """
+    Lazily yields every shortest list of (paper_id, scientist_id) pairs
+    that connect the source to the target, or the first limit of them.
     
-    # No path found
-    return None
+    Paths through different papers count as different paths. They come
+    out in a fixed order (by scientist_id, then paper_id, hop by hop).
+    """
+    return islice(iter_shortest_paths(source, target, neighbors_for_person), limit)
 
 
-def print_path(path):
+def print_path(path, source=None):
     """
     Prints the path from source to target in the required format.
+    
+    The path does not include the source; pass its scientist_id so the
+    first hop names it directly instead of guessing a co-author.
     """
     if not path:
         print("No connection found.")
@@ -150,7 +153,9 @@ def print_path(path):
         
         # For the first connection, we need to get the previous scientist
         # from our search which isn't stored in the path
-        if i == 1:
+        if i == 1 and source is not None:
+            print(f"{i}: {scientist_data[source]['name']} and {current_scientist} co-authored \"{paper['title']}\"")
+        elif i == 1:
             # Find a scientist who co-authored this paper but isn't our target
             co_author = None
             for author_id in paper["authors"]:
@@ -194,7 +199,7 @@ def main():
     path = shortest_path(source_id, target_id)
     
     # Print the path
-    print_path(path)
+    print_path(path, source_id)
 
 
 if __name__ == "__main__":
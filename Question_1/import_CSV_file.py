@@ -1,60 +1,460 @@
+"""
+Import CSV File Module - Streaming inspection of the scientists, papers and authors files
+
+Scans CSV files one row at a time in bounded memory, however large they are,
+and reports for each:
+
+    rows            data rows, blank lines and malformed rows (wrong number of
+                    fields, empty keys, unparsable records, undecodable bytes)
+    cardinalities   approximate distinct values per column (HyperLogLog)
+    duplicate keys  repeated primary keys (Bloom filter; may overcount by
+                    the reported number of expected false positives)
+    dangling keys   authors rows whose scientist_id or paper_id is not in
+                    scientists.csv or papers.csv (never overcounted)
+
+With --sample only a number of byte ranges spread over each file are read,
+and the row counts are extrapolated from them.
+
+Usage:
+    python import_CSV_file.py [scientists.csv papers.csv authors.csv] [--sample 64] [--json FILE]
+"""
+
+import os
 import csv
 import sys
+import json
+import random
+import argparse
+from operator import itemgetter
+from sketches import HyperLogLog, BloomFilter, DEFAULT_PRECISION
+
+# Primary key columns of the known files
+KEY_COLUMNS = {
+    "scientists.csv": ("scientist_id",),
+    "papers.csv": ("paper_id",),
+    "authors.csv": ("scientist_id", "paper_id"),
+}
+
+# Foreign key column -> referenced file, per file
+FOREIGN_KEYS = {
+    "authors.csv": {"scientist_id": "scientists.csv", "paper_id": "papers.csv"},
+}
+
+DEFAULT_RANGE_BYTES = 1 << 20
+DEFAULT_BLOOM_MB = 64
+
+# Bloom filter false positive rate aimed for, as long as the memory cap allows
+KEY_ERROR_RATE = 0.001
+
+# Rows buffered before they are added to the sketches together
+BATCH_ROWS = 65536
 
-def process_csv_file(filename):
+# Malformed rows, duplicate keys and dangling keys kept as examples
+MAX_EXAMPLES = 5
+
+PROGRESS_ROWS = 1000000
+
+
+def read_header(filename):
     """
-    Process a single CSV file and print its contents.
+    Read the header row of a CSV file
+    
+    Returns:
+        tuple: (column names, byte offset of the first data row)
+    """
+    with open(filename, "rb") as f:
+        line = f.readline()
+        return next(csv.reader([line.decode("utf-8", errors="replace")]), []), f.tell()
+
+
+def estimate_rows(filename, data_start, data_end):
+    """Estimate the number of rows between two byte offsets from the line length of the first 64 KiB"""
+    with open(filename, "rb") as f:
+        f.seek(data_start)
+        chunk = f.read(min(65536, data_end - data_start))
+    if not chunk:
+        return 0
+    return (data_end - data_start) * max(1, chunk.count(b"\n")) // len(chunk)
+
+
+def sample_byte_ranges(data_start, file_size, count, range_bytes, seed=0):
+    """
+    Spread byte ranges over the data rows of a file
+    
+    The data is cut into count equal strata and one range is placed at a
+    random offset inside each, so the ranges never overlap.
+    
+    Args:
+        data_start (int): Offset of the first data row
+        file_size (int): Size of the file
+        count (int): Number of ranges
+        range_bytes (int): Length of each range
+        seed (int): Seed of the offsets
+    
+    Returns:
+        list or None: Sorted (start, end) byte ranges, or None when they
+                      would cover the whole file anyway
+    """
+    data_bytes = file_size - data_start
+    if count <= 0 or count * range_bytes >= data_bytes:
+        return None
+    rng = random.Random(seed)
+    stratum = data_bytes / count
+    ranges = []
+    for i in range(count):
+        start = data_start + int(i * stratum) + rng.randrange(int(stratum) - range_bytes + 1)
+        ranges.append((start, start + range_bytes))
+    return ranges
+
+
+def _range_lines(f, start, end):
+    """Yield the decoded lines of a binary file that start within [start, end)"""
+    if start > 0:
+        # A line starting before the range belongs to the previous one
+        f.seek(start - 1)
+        f.readline()
+    else:
+        f.seek(0)
+    while f.tell() < end:
+        line = f.readline()
+        if not line:
+            return
+        yield line.decode("utf-8", errors="replace")
+
+
+def _parsed_rows(reader):
+    """Yield the rows of a csv reader, with None for each record it cannot parse"""
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error:
+            yield None
+            continue
+        yield row
+
+
+def iter_csv_rows(filename, byte_ranges=None):
+    """
+    Lazily read the data rows of a CSV file
     
     Args:
         filename (str): Path to the CSV file
+        byte_ranges (list, optional): (start, end) byte ranges to read instead
+                                      of the whole file; a row belongs to the
+                                      range it starts in (a quoted field
+                                      spanning lines can be cut at a range
+                                      start and then reads as malformed)
+    
+    Yields:
+        list or None: The fields of each row after the header, or None for a
+                      record the csv module cannot parse
+    """
+    if byte_ranges is None:
+        with open(filename, newline="", encoding="utf-8", errors="replace") as csvfile:
+            reader = csv.reader(csvfile)
+            next(reader, None)
+            yield from _parsed_rows(reader)
+        return
+    
+    with open(filename, "rb") as f:
+        data_start = read_header(filename)[1]
+        for start, end in byte_ranges:
+            yield from _parsed_rows(csv.reader(_range_lines(f, max(start, data_start), end)))
+
+
+class CSVProfile:
+    """Counts and sketches gathered by process_csv_file"""
+    
+    __slots__ = ("filename", "header", "sampled", "data_bytes", "scanned_bytes", "rows", "blank_rows",
+                 "malformed", "malformed_examples", "columns", "key_columns", "key_filter", "duplicate_keys",
+                 "false_duplicates", "duplicate_examples", "dangling", "dangling_examples")
+    
+    def __init__(self, filename, header, key_columns, data_bytes, scanned_bytes, precision, key_filter):
+        self.filename = filename
+        self.header = header
+        self.sampled = scanned_bytes < data_bytes
+        self.data_bytes = data_bytes
+        self.scanned_bytes = scanned_bytes
+        self.rows = 0
+        self.blank_rows = 0
+        self.malformed = {"field_count": 0, "empty_key": 0, "unparsable": 0, "undecodable": 0}
+        self.malformed_examples = []
+        self.columns = [HyperLogLog(precision) for _ in header]
+        self.key_columns = key_columns
+        self.key_filter = key_filter
+        self.duplicate_keys = 0
+        self.false_duplicates = 0.0  # expected Bloom filter false positives among them
+        self.duplicate_examples = []
+        self.dangling = {}  # foreign key column -> rows whose value is missing
+        self.dangling_examples = {}
+    
+    def estimated_rows(self):
+        """Return the number of rows in the whole file, extrapolated when it was sampled"""
+        if not self.sampled or not self.scanned_bytes:
+            return self.rows
+        return round(self.rows * self.data_bytes / self.scanned_bytes)
+    
+    def summary(self):
+        """
+        Get the profile as plain data
         
-    Returns:
-        list: List of rows from the CSV file (each row is a list of values)
+        Returns:
+            dict: Counts, estimated distinct values per column, and the
+                  duplicate and dangling keys with a few examples each
+        """
+        summary = {
+            "file": self.filename,
+            "sampled": self.sampled,
+            "scanned_bytes": self.scanned_bytes,
+            "rows": self.rows,
+            "estimated_rows": self.estimated_rows(),
+            "blank_rows": self.blank_rows,
+            "malformed": dict(self.malformed),
+            "malformed_examples": self.malformed_examples,
+            "distinct": {name: sketch.estimate() for name, sketch in zip(self.header, self.columns)},
+        }
+        if self.key_filter is not None:
+            summary["key"] = list(self.key_columns)
+            summary["duplicate_keys"] = self.duplicate_keys
+            summary["expected_false_duplicates"] = round(self.false_duplicates)
+            summary["duplicate_examples"] = self.duplicate_examples
+            summary["duplicate_false_positive_rate"] = self.key_filter.false_positive_rate()
+        if self.dangling:
+            summary["dangling"] = dict(self.dangling)
+            summary["dangling_examples"] = self.dangling_examples
+        return summary
+
+
+def process_csv_file(filename, key_columns=None, references=None, sample_ranges=0,
+                     range_bytes=DEFAULT_RANGE_BYTES, seed=0, precision=DEFAULT_PRECISION,
+                     bloom_bytes=DEFAULT_BLOOM_MB << 20, show_rows=0, progress=None):
     """
-    print(f"\nProcessing file: {filename}")
-    rows_data = []
+    Profile a CSV file in one streaming pass
+    
+    Memory use is bounded by the sketches (16 KiB per column at the default
+    precision), the key Bloom filter (at most bloom_bytes) and one batch of
+    BATCH_ROWS rows, whatever the size of the file.
     
+    Args:
+        filename (str): Path to the CSV file
+        key_columns (tuple, optional): Columns forming the primary key, whose
+                                       repeats are counted as duplicate keys
+        references (dict, optional): Foreign key column -> BloomFilter holding
+                                     the keys of the referenced file (the
+                                     key_filter of its profile)
+        sample_ranges (int): Read only this many byte ranges, 0 for everything
+        range_bytes (int): Length of each sampled range
+        seed (int): Seed of the sampled ranges
+        precision (int): HyperLogLog precision of the column cardinalities
+        bloom_bytes (int): Memory cap of the key Bloom filter
+        show_rows (int): Print the header and this many first rows
+        progress (callable, optional): Called as progress(filename, rows) every
+                                       PROGRESS_ROWS rows
+    
+    Returns:
+        CSVProfile or None: The profile, or None if the file cannot be read
+    """
     try:
-        with open(filename, newline='', encoding='utf-8', errors='replace') as csvfile:
-            rows = csv.reader(csvfile, delimiter=',')
-            
-            # Print header row with formatting
-            header = next(rows, None)
-            if header:
-                print("HEADER:", header)
-                rows_data.append(header)
-                
-            # Print data rows
-            row_count = 0
-            for row in rows:
-                print(f"Row {row_count}:", row)
-                rows_data.append(row)
-                row_count += 1
+        header, data_start = read_header(filename)
+        file_size = os.path.getsize(filename)
+        byte_ranges = sample_byte_ranges(data_start, file_size, sample_ranges, range_bytes, seed)
+        data_bytes = file_size - data_start
+        scanned_bytes = data_bytes if byte_ranges is None else sum(end - start for start, end in byte_ranges)
+        
+        key_index = None
+        if key_columns:
+            missing = [column for column in key_columns if column not in header]
+            if missing:
+                print(f"Warning: '{filename}' has no key column {', '.join(missing)}")
+            else:
+                key_index = [header.index(column) for column in key_columns]
+        key_filter = None
+        if key_index is not None:
+            expected = estimate_rows(filename, data_start, file_size) * scanned_bytes // max(1, data_bytes)
+            key_filter = BloomFilter(expected, KEY_ERROR_RATE, bloom_bytes)
+        
+        profile = CSVProfile(filename, header, key_columns, data_bytes, scanned_bytes, precision, key_filter)
+        reference_index = []
+        for column, reference_filter in (references or {}).items():
+            if column in header:
+                reference_index.append((column, header.index(column), reference_filter))
+                profile.dangling[column] = 0
+                profile.dangling_examples[column] = []
+        
+        if show_rows:
+            print("HEADER:", header)
+        
+        width = len(header)
+        batch = []
+        
+        def flush():
+            # Columns, keys and foreign keys are gathered from the whole batch at once
+            for sketch, column_values in zip(profile.columns, zip(*batch)):
+                sketch.add_many(column_values)
+            if key_getter is not None:
+                keys = list(map(key_getter, batch))
+                if len(key_index) == 1:
+                    complete = [key for key in keys if key]
+                else:
+                    complete = [key for key in keys if "" not in key]
+                profile.malformed["empty_key"] += len(keys) - len(complete)
+                profile.false_duplicates += key_filter.expected_false_positive_rate() * len(complete)
+                for key, seen in zip(complete, key_filter.add_many(complete)):
+                    if seen:
+                        profile.duplicate_keys += 1
+                        if len(profile.duplicate_examples) < MAX_EXAMPLES:
+                            profile.duplicate_examples.append(key)
+            for column, index, reference_filter in reference_index:
+                # Empty values are missing rather than dangling
+                column_values = [row[index] for row in batch if row[index]]
+                examples = profile.dangling_examples[column]
+                for value, present in zip(column_values, reference_filter.contains_many(column_values)):
+                    if not present:
+                        profile.dangling[column] += 1
+                        if len(examples) < MAX_EXAMPLES:
+                            examples.append(value)
+            batch.clear()
+        
+        key_getter = None if key_index is None else itemgetter(*key_index)
+        for row in iter_csv_rows(filename, byte_ranges):
+            if row is None:
+                profile.rows += 1
+                profile.malformed["unparsable"] += 1
+                continue
+            if not row:
+                profile.blank_rows += 1
+                continue
             
-            print(f"Total rows processed: {row_count}")
+            profile.rows += 1
+            if profile.rows <= show_rows:
+                print(f"Row {profile.rows - 1}:", row)
+            if progress is not None and profile.rows % PROGRESS_ROWS == 0:
+                progress(filename, profile.rows)
             
-        return rows_data
+            if len(row) != width:
+                profile.malformed["field_count"] += 1
+                if len(profile.malformed_examples) < MAX_EXAMPLES:
+                    profile.malformed_examples.append(row[:width + 1])
+                continue
+            if "\ufffd" in "".join(row):
+                profile.malformed["undecodable"] += 1
             
+            batch.append(row)
+            if len(batch) >= BATCH_ROWS:
+                flush()
+        flush()
+        
+        return profile
+    
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found.")
-        return []
-    except Exception as e:
+        return None
+    except (OSError, UnicodeDecodeError) as e:
         print(f"Error processing '{filename}': {e}")
-        return []
+        return None
 
-def main():
-    # List of CSV files to process
-    csv_files = ["authors.csv", "papers.csv", "scientists.csv"]
+
+def print_profile(summary):
+    """Print a profile summary from CSVProfile.summary"""
+    print(f"\n{summary['file']}")
+    if summary["sampled"]:
+        print(f"  Sampled {summary['scanned_bytes']} bytes: {summary['rows']} rows, "
+              f"about {summary['estimated_rows']} in the whole file")
+    else:
+        print(f"  Rows: {summary['rows']}")
+    if summary["blank_rows"]:
+        print(f"  Blank lines: {summary['blank_rows']}")
     
-    # If command line arguments are provided, use those instead
-    if len(sys.argv) > 1:
-        csv_files = sys.argv[1:]
+    malformed = {reason: count for reason, count in summary["malformed"].items() if count}
+    if malformed:
+        print("  Malformed rows: " + ", ".join(f"{reason} {count}" for reason, count in malformed.items()))
+        for example in summary["malformed_examples"]:
+            print(f"    e.g. {example}")
     
+    print("  Distinct values (approximate):")
+    for column, distinct in summary["distinct"].items():
+        print(f"    {column:>20} {distinct}")
+    
+    if "key" in summary:
+        print(f"  Duplicate {'/'.join(summary['key'])} keys: {summary['duplicate_keys']} "
+              f"(about {summary['expected_false_duplicates']} expected false positives, "
+              f"current rate {summary['duplicate_false_positive_rate']:.3%})")
+        for example in summary["duplicate_examples"]:
+            print(f"    e.g. {example}")
+    
+    for column, count in summary.get("dangling", {}).items():
+        print(f"  Dangling {column}: {count} rows")
+        for example in summary["dangling_examples"][column]:
+            print(f"    e.g. {example}")
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Profile CSV files in one streaming pass.")
+    parser.add_argument("files", nargs="*", default=["scientists.csv", "papers.csv", "authors.csv"],
+                        help="CSV files to profile (default: scientists.csv papers.csv authors.csv)")
+    parser.add_argument("--sample", type=int, default=0, metavar="RANGES",
+                        help="Read only this many byte ranges of each file (default: 0, the whole file)")
+    parser.add_argument("--range-bytes", type=int, default=DEFAULT_RANGE_BYTES,
+                        help=f"Length of each sampled range (default: {DEFAULT_RANGE_BYTES})")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the sampled ranges")
+    parser.add_argument("--precision", type=int, default=DEFAULT_PRECISION,
+                        help=f"HyperLogLog precision, 4 to 18 (default: {DEFAULT_PRECISION})")
+    parser.add_argument("--bloom-mb", type=int, default=DEFAULT_BLOOM_MB,
+                        help=f"Memory cap of each key Bloom filter in MiB (default: {DEFAULT_BLOOM_MB})")
+    parser.add_argument("--show", type=int, default=0, metavar="ROWS",
+                        help="Print the header and the first ROWS rows of each file")
+    parser.add_argument("--json", metavar="FILE", help="Also write the profiles to a JSON file")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    
+    # Referenced files first, so their keys are known when checking foreign keys
+    csv_files = sorted(args.files, key=lambda filename: os.path.basename(filename) in FOREIGN_KEYS)
     print(f"Will process {len(csv_files)} CSV files.")
     
-    # Process each file
+    def progress(filename, rows):
+        print(f"\r  {filename}: {rows} rows", end="", file=sys.stderr, flush=True)
+    
+    profiles = {}
+    summaries = []
     for filename in csv_files:
-        process_csv_file(filename)
+        name = os.path.basename(filename)
+        directory = os.path.dirname(filename)
+        
+        references = {}
+        for column, referenced in FOREIGN_KEYS.get(name, {}).items():
+            referenced_profile = profiles.get(os.path.normpath(os.path.join(directory, referenced)))
+            if referenced_profile is None or referenced_profile.key_filter is None:
+                continue
+            if referenced_profile.sampled:
+                # Keys outside the sampled ranges would all look dangling
+                print(f"Not checking {column} against the sampled '{referenced_profile.filename}'")
+                continue
+            references[column] = referenced_profile.key_filter
+        
+        profile = process_csv_file(filename, KEY_COLUMNS.get(name), references, args.sample, args.range_bytes,
+                                   args.seed, args.precision, args.bloom_mb << 20, args.show, progress)
+        if profile is None:
+            continue
+        print("\r" + " " * 60 + "\r", end="", file=sys.stderr)
+        summary = profile.summary()
+        print_profile(summary)
+        summaries.append(summary)
+        
+        # Only the key filters of referenced files are still needed
+        if name in {referenced for keys in FOREIGN_KEYS.values() for referenced in keys.values()}:
+            profiles[os.path.normpath(filename)] = profile
+    
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summaries, f, indent=2)
+        print(f"\nProfiles written to '{args.json}'")
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
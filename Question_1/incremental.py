@@ -0,0 +1,196 @@
+"""
+Incremental Module - Reads the rows appended to the CSV files since a load
+
+A checkpoint records, for every source file, the byte offset up to which it
+was parsed and a digest of the bytes just before that offset. When the file
+still has the same bytes at that position it has only been appended to, so
+the rows after the offset are all that changed. A truncated or rewritten
+file needs a full reload.
+
+Only complete lines are read: a row still being written is left for the
+next update. Like the byte ranges of the parallel loader, appended rows
+must not contain line breaks inside quoted fields.
+"""
+
+import os
+import hashlib
+from itertools import compress, repeat
+from snapshot import SOURCE_FILES
+from bulk_loader import iter_column_chunks, read_header, find_column, report_chunks, DEFAULT_CHUNK_BYTES
+
+# Bytes before the checkpoint offset that must be unchanged
+TAIL_BYTES = 64
+
+
+def file_checkpoint(path, offset=None):
+    """
+    Checkpoint a file at a byte offset
+    
+    Args:
+        path (str): File to checkpoint
+        offset (int, optional): Bytes parsed so far (default: the file size)
+    
+    Returns:
+        list: [offset, digest of the TAIL_BYTES bytes before offset]
+    """
+    if offset is None:
+        offset = os.path.getsize(path)
+    with open(path, "rb") as f:
+        f.seek(max(0, offset - TAIL_BYTES))
+        tail = f.read(min(offset, TAIL_BYTES))
+    return [offset, hashlib.sha1(tail).hexdigest()]
+
+
+def data_checkpoints(data_dir):
+    """
+    Checkpoint every source CSV at its current size
+    
+    Returns:
+        dict or None: file name -> checkpoint, or None if a file is missing
+    """
+    checkpoints = {}
+    for filename in SOURCE_FILES:
+        try:
+            checkpoints[filename] = file_checkpoint(os.path.join(data_dir, filename))
+        except OSError:
+            return None
+    return checkpoints
+
+
+def appended_range(path, checkpoint):
+    """
+    Find the complete lines appended to a file since its checkpoint
+    
+    Args:
+        path (str): File to check
+        checkpoint (list): Checkpoint taken when the file was last parsed
+    
+    Returns:
+        tuple or None: (start, end) byte range of the new lines, empty when
+                       nothing was appended; None when the file was changed
+                       other than by appending
+    """
+    offset = checkpoint[0]
+    size = os.path.getsize(path)
+    if size < offset or file_checkpoint(path, offset) != checkpoint:
+        return None
+    if size == offset:
+        return offset, offset
+    
+    # Stop after the last line break so a row being written is not split
+    with open(path, "rb") as f:
+        end = size
+        while end > offset:
+            f.seek(max(offset, end - 65536))
+            block = f.read(end - f.tell())
+            newline = block.rfind(b"\n")
+            if newline >= 0:
+                return offset, end - len(block) + newline + 1
+            end -= len(block)
+    return offset, offset
+
+
+def read_appended_rows(data_dir, checkpoints, chunk_bytes=DEFAULT_CHUNK_BYTES, progress=None):
+    """
+    Read the rows appended to the three CSV files since their checkpoints
+    
+    Args:
+        data_dir (str): Directory holding the source CSVs
+        checkpoints (dict): file name -> checkpoint from data_checkpoints
+        chunk_bytes (int): Approximate size of each chunk read
+        progress (callable, optional): Called as progress(stage, rows) after
+                                       every chunk, stage being the file name
+    
+    Returns:
+        tuple: (rows, checkpoints) where rows is a tuple of lists of
+               (scientist_id, name), (paper_id, title) and
+               (scientist_id, paper_id) pairs, and checkpoints are the new
+               checkpoints; (None, message) if a full reload is needed
+    """
+    ranges = {}
+    for filename in SOURCE_FILES:
+        path = os.path.join(data_dir, filename)
+        checkpoint = checkpoints.get(filename)
+        if checkpoint is None or not os.path.isfile(path):
+            return None, f"No checkpoint for '{path}'"
+        file_range = appended_range(path, checkpoint)
+        if file_range is None:
+            return None, f"'{path}' was modified other than by appending rows"
+        ranges[filename] = file_range
+    
+    try:
+        scientists = _read_scientists(os.path.join(data_dir, "scientists.csv"), ranges["scientists.csv"],
+                                      chunk_bytes, progress)
+        papers = _read_papers(os.path.join(data_dir, "papers.csv"), ranges["papers.csv"], chunk_bytes, progress)
+        authors = _read_authors(os.path.join(data_dir, "authors.csv"), ranges["authors.csv"],
+                                chunk_bytes, progress)
+    except ValueError as e:
+        return None, str(e)
+    
+    new_checkpoints = {}
+    for filename, (start, end) in ranges.items():
+        if end == start:
+            new_checkpoints[filename] = checkpoints[filename]
+        else:
+            new_checkpoints[filename] = file_checkpoint(os.path.join(data_dir, filename), end)
+    return (scientists, papers, authors), new_checkpoints
+
+
+def _read_scientists(path, file_range, chunk_bytes, progress):
+    """Return the appended (id, name) pairs with a non-empty ID and name"""
+    start, end = file_range
+    if start == end:
+        return []
+    header = read_header(path)
+    id_idx = find_column(header or [], 'id', 'scientist_id')
+    name_idx = find_column(header or [], 'name')
+    if id_idx == -1 or name_idx == -1:
+        raise ValueError(f"Invalid header in scientists file: {header}")
+    
+    pairs = []
+    chunks = iter_column_chunks(path, [id_idx, name_idx], chunk_bytes, start=start, end=end)
+    for ids, names in report_chunks(chunks, "scientists", progress):
+        pairs.extend(compress(zip(ids, names), map(all, zip(ids, names))))
+    return pairs
+
+
+def _read_papers(path, file_range, chunk_bytes, progress):
+    """Return the appended (paper_id, title) pairs with a non-empty ID"""
+    start, end = file_range
+    if start == end:
+        return []
+    header = read_header(path) or []
+    paper_id_idx = find_column(header, 'paper_id', 'id')
+    title_idx = find_column(header, 'title')
+    if paper_id_idx == -1:
+        raise ValueError(f"Invalid header in papers file: {header}")
+    
+    pairs = []
+    if title_idx >= 0:
+        chunks = iter_column_chunks(path, [paper_id_idx, title_idx], chunk_bytes, fill="Unknown Title",
+                                    start=start, end=end)
+        for paper_ids, titles in report_chunks(chunks, "papers", progress):
+            pairs.extend(compress(zip(paper_ids, titles), paper_ids))
+    else:
+        chunks = iter_column_chunks(path, [paper_id_idx], chunk_bytes, start=start, end=end)
+        for (paper_ids,) in report_chunks(chunks, "papers", progress):
+            pairs.extend(zip(compress(paper_ids, paper_ids), repeat("Unknown Title")))
+    return pairs
+
+
+def _read_authors(path, file_range, chunk_bytes, progress):
+    """Return the appended (scientist_id, paper_id) pairs"""
+    start, end = file_range
+    if start == end:
+        return []
+    header = read_header(path) or []
+    scientist_id_idx = find_column(header, 'scientist_id')
+    paper_id_idx = find_column(header, 'paper_id')
+    if scientist_id_idx == -1 or paper_id_idx == -1:
+        raise ValueError(f"Invalid header in authors file: {header}")
+    
+    pairs = []
+    chunks = iter_column_chunks(path, [scientist_id_idx, paper_id_idx], chunk_bytes, start=start, end=end)
+    for scientist_col, paper_col in report_chunks(chunks, "authors", progress):
+        pairs.extend(zip(scientist_col, paper_col))
+    return pairs
@@ -0,0 +1,361 @@
+"""
+Instrumentation Module - Opt-in metrics for the load and search hot paths
+
+Loading, name search and shortest path searches report per-phase timers,
+nodes expanded, frontier sizes, cache hits and misses and (optionally)
+peak traced memory here. Everything is off by default: every reporting
+function then returns after a single flag check and phase() hands out a
+shared no-op context manager, so instrumented code pays close to nothing.
+
+Metrics are identified by a name plus optional labels and come in three
+kinds: counters (monotonic totals), gauges (last value) and summaries
+(count, sum, min and max of observed values). Collectors registered with
+register_collector are sampled at export time, which is how existing
+statistics such as the path cache counters are exposed without touching
+their hot paths. snapshot() returns everything as a dict, to_json() and
+to_prometheus() as text.
+
+Updates are serialized by a lock so that threads reporting concurrently
+(e.g. the query service's search threads) do not lose increments. Each
+thread keeps its own stack of open phases; the tracemalloc peak is still
+process-wide, so memory peaks of phases overlapping in time include each
+other's allocations.
+
+profiled() runs a function under cProfile for the command-line tools.
+"""
+
+import io
+import sys
+import json
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Prefix of every exported Prometheus metric name
+PROMETHEUS_PREFIX = "scinet"
+
+_enabled = False
+_trace_memory = False
+
+# (name, labels) -> value, where labels is a sorted tuple of (key, value) pairs
+_counters = {}
+_gauges = {}
+_summaries = {}
+
+# name -> callable returning {metric: value}, sampled by snapshot()
+_collectors = {}
+
+# Guards the metric dicts; only taken once the enabled flag was checked
+_lock = threading.Lock()
+
+# Per thread: traced memory peaks of the phases currently open, innermost last
+_local = threading.local()
+
+
+def enable(trace_memory=False):
+    """
+    Start collecting metrics
+    
+    Args:
+        trace_memory (bool): Also record the peak Python heap usage of every
+                             phase with tracemalloc, which slows allocations
+                             down noticeably
+    """
+    global _enabled, _trace_memory
+    _enabled = True
+    _trace_memory = trace_memory
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def disable():
+    """Stop collecting metrics; the values collected so far are kept"""
+    global _enabled, _trace_memory
+    _enabled = False
+    if _trace_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _trace_memory = False
+
+
+def is_enabled():
+    """Return True while metrics are being collected"""
+    return _enabled
+
+
+def reset():
+    """Drop every collected value (registered collectors are kept)"""
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
+        _summaries.clear()
+
+
+def count(name, value=1, **labels):
+    """Add value to a counter"""
+    if not _enabled:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def set_gauge(name, value, **labels):
+    """Set a gauge to its latest value"""
+    if not _enabled:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _gauges[key] = value
+
+
+def observe(name, value, **labels):
+    """Add one observation to a summary"""
+    if not _enabled:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        summary = _summaries.get(key)
+        if summary is None:
+            _summaries[key] = [1, value, value, value]
+        else:
+            summary[0] += 1
+            summary[1] += value
+            if value < summary[2]:
+                summary[2] = value
+            if value > summary[3]:
+                summary[3] = value
+
+
+def observe_levels(name, levels, **labels):
+    """
+    Record the frontier sizes of a level-by-level search
+    
+    Adds every level size to the "<name>_frontier_size" summary, their sum to
+    the "<name>_nodes_expanded" counter and the number of levels to the
+    "<name>_levels" summary.
+    """
+    if not _enabled:
+        return
+    for size in levels:
+        observe(f"{name}_frontier_size", size, **labels)
+    count(f"{name}_nodes_expanded", sum(levels), **labels)
+    observe(f"{name}_levels", len(levels), **labels)
+
+
+class _Phase:
+    """Times a block into the phase_seconds summary (and its memory peak)"""
+    
+    __slots__ = ("name", "start", "start_memory")
+    
+    def __init__(self, name):
+        self.name = name
+    
+    def __enter__(self):
+        if _trace_memory:
+            self.start_memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            _phase_peaks().append(0)
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        observe("phase_seconds", time.perf_counter() - self.start, phase=self.name)
+        peaks = _phase_peaks() if _trace_memory else None
+        if peaks:
+            # Inner phases reset the tracemalloc peak, so fold theirs in
+            peak = max(tracemalloc.get_traced_memory()[1], peaks.pop())
+            if peaks:
+                peaks[-1] = max(peaks[-1], peak)
+            observe("phase_peak_bytes", peak - self.start_memory, phase=self.name)
+        return False
+
+
+def _phase_peaks():
+    """Return the calling thread's stack of open phase peaks"""
+    peaks = getattr(_local, "peaks", None)
+    if peaks is None:
+        peaks = _local.peaks = []
+    return peaks
+
+
+class _NullPhase:
+    """Context manager doing nothing, returned by phase() while disabled"""
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+def phase(name):
+    """
+    Time a block of code as a named phase
+    
+    Args:
+        name (str): Phase label, e.g. "load_parse"
+    
+    Returns:
+        context manager: Records the block's duration in the phase_seconds
+                         summary (and with trace_memory its peak traced memory
+                         above the starting level in phase_peak_bytes)
+    """
+    if not _enabled:
+        return _NULL_PHASE
+    return _Phase(name)
+
+
+def register_collector(name, collector):
+    """
+    Sample a statistics function whenever metrics are exported
+    
+    Args:
+        name (str): Prefix of the exported gauges
+        collector (callable): Returns a dict of metric name -> number
+    """
+    _collectors[name] = collector
+
+
+def snapshot():
+    """
+    Get every collected metric
+    
+    Returns:
+        dict: "enabled", then "counters", "gauges" and "summaries" lists of
+              {"name", "labels", ...} entries, summaries carrying count, sum,
+              min, max and mean
+    """
+    with _lock:
+        counters = sorted(_counters.items())
+        gauges = dict(_gauges)
+        summaries = sorted((key, tuple(summary)) for key, summary in _summaries.items())
+    for prefix, collector in list(_collectors.items()):
+        for name, value in collector().items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                gauges[(f"{prefix}_{name}", ())] = value
+    if resource is not None:
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        gauges[("peak_rss_bytes", ())] = peak if sys.platform == "darwin" else peak * 1024
+    
+    return {
+        "enabled": _enabled,
+        "counters": [{"name": name, "labels": dict(labels), "value": value}
+                     for (name, labels), value in counters],
+        "gauges": [{"name": name, "labels": dict(labels), "value": value}
+                   for (name, labels), value in sorted(gauges.items())],
+        "summaries": [{"name": name, "labels": dict(labels), "count": total_count, "sum": total,
+                       "min": minimum, "max": maximum, "mean": total / total_count}
+                      for (name, labels), (total_count, total, minimum, maximum) in summaries],
+    }
+
+
+def to_json(indent=None):
+    """Export the metrics as a JSON document"""
+    return json.dumps(snapshot(), indent=indent)
+
+
+def to_prometheus(prefix=PROMETHEUS_PREFIX):
+    """
+    Export the metrics in the Prometheus text exposition format
+    
+    Summaries become <name>_count and <name>_sum plus <name>_min and
+    <name>_max gauges.
+    """
+    data = snapshot()
+    lines = []
+    declared = set()
+    
+    def sample(name, kind, labels, value):
+        metric = f"{prefix}_{name}"
+        if metric not in declared:
+            declared.add(metric)
+            lines.append(f"# TYPE {metric} {kind}")
+        lines.append(f"{metric}{_prometheus_labels(labels)} {value}")
+    
+    for entry in data["counters"]:
+        sample(f"{entry['name']}_total", "counter", entry["labels"], entry["value"])
+    for entry in data["gauges"]:
+        sample(entry["name"], "gauge", entry["labels"], entry["value"])
+    summaries = {}
+    for entry in data["summaries"]:
+        summaries.setdefault(entry["name"], []).append(entry)
+    for name, entries in summaries.items():
+        # Every family's samples must be contiguous
+        metric = f"{prefix}_{name}"
+        lines.append(f"# TYPE {metric} summary")
+        for entry in entries:
+            lines.append(f"{metric}_count{_prometheus_labels(entry['labels'])} {entry['count']}")
+            lines.append(f"{metric}_sum{_prometheus_labels(entry['labels'])} {entry['sum']}")
+        for bound in ("min", "max"):
+            for entry in entries:
+                sample(f"{name}_{bound}", "gauge", entry["labels"], entry[bound])
+    return "\n".join(lines) + "\n"
+
+
+def _prometheus_labels(labels):
+    """Format a label dict as {key="value",...}"""
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in sorted(labels.items()):
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def write_metrics(path):
+    """
+    Write the metrics to a file, as Prometheus text when the name ends in
+    ".prom" and as JSON otherwise
+    
+    Returns:
+        tuple: (success, message)
+    """
+    text = to_prometheus() if path.endswith(".prom") else to_json(indent=2)
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+    except OSError as e:
+        return False, f"Could not write metrics: {str(e)}"
+    return True, f"Metrics written to '{path}'"
+
+
+def profiled(func, *args, output=None, sort="cumulative", limit=30, **kwargs):
+    """
+    Run func(*args, **kwargs) under cProfile
+    
+    Args:
+        func (callable): Function to profile
+        output (str, optional): File for the raw profile (readable with pstats
+                                or snakeviz); otherwise the top entries are
+                                printed to stderr
+        sort (str): pstats sort key for the printed report
+        limit (int): Number of entries printed
+    
+    Returns:
+        The return value of func
+    """
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *args, **kwargs)
+    finally:
+        if output is not None:
+            profiler.dump_stats(output)
+            print(f"Profile written to '{output}'", file=sys.stderr)
+        else:
+            report = io.StringIO()
+            pstats.Stats(profiler, stream=report).sort_stats(sort).print_stats(limit)
+            print(report.getvalue(), file=sys.stderr)
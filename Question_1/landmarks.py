@@ -0,0 +1,331 @@
+"""
+Landmarks Module - Landmark distance oracle for degrees of separation
+
+Breadth-first search distances from k high-degree scientists ("landmarks")
+are stored as one uint8 array per landmark, 255 meaning unreachable or too
+far to record. By the triangle inequality every landmark L bounds the
+distance between s and t:
+
+    |d(s, L) - d(L, t)| <= d(s, t) <= d(s, L) + d(L, t)
+
+so lower and upper bounds cost O(k) per query. The same bounds prune an
+exact search: a node at depth d whose lower bound to the target exceeds
+upper - d cannot lie on a shortest path.
+
+The distances are computed in parallel (one landmark per task, workers
+forked so they share the graph) and written next to the CSV files,
+tagged like the snapshot with the size and modification time of the sources.
+"""
+
+import os
+import json
+import mmap
+import struct
+import hashlib
+import multiprocessing
+from array import array
+from snapshot import source_stats
+from search_core import dense_path_from_parents, PROGRESS_NODES
+
+LANDMARKS_NAME = "landmarks.index"
+LANDMARKS_VERSION = 1
+MAGIC = b"SCILMRK\0"
+
+DEFAULT_LANDMARKS = 16
+
+# Distance recorded for unreachable nodes and nodes 255 or more hops away
+UNKNOWN = 255
+
+_PREFIX = struct.Struct("<8sII")
+
+# Graph shared with forked workers
+_worker_graph = None
+
+
+class LandmarkIndex:
+    """Per-landmark uint8 distance arrays over a CSRGraph"""
+    
+    __slots__ = ("graph", "landmarks", "distances")
+    
+    def __init__(self, graph, landmarks, distances):
+        """
+        Args:
+            graph (CSRGraph): Graph the distances were computed on
+            landmarks (list): Dense indices of the landmark scientists
+            distances (list): One array or memoryview of len(graph) uint8
+                              distances per landmark
+        """
+        self.graph = graph
+        self.landmarks = landmarks
+        self.distances = distances
+    
+    @classmethod
+    def build(cls, graph, count=DEFAULT_LANDMARKS, workers=1):
+        """
+        Pick the count highest-degree scientists and compute their distances
+        
+        Args:
+            graph (CSRGraph): Collaboration graph
+            count (int): Number of landmarks
+            workers (int): Worker processes; more than one requires the
+                           "fork" start method and otherwise runs serially
+        
+        Returns:
+            LandmarkIndex: The computed index
+        """
+        global _worker_graph
+        
+        by_degree = sorted(range(len(graph)), key=lambda i: (-graph.degree(i), i))
+        landmarks = by_degree[:count]
+        
+        if workers > 1 and len(landmarks) > 1 and "fork" in multiprocessing.get_all_start_methods():
+            _worker_graph = graph
+            try:
+                with multiprocessing.get_context("fork").Pool(min(workers, len(landmarks))) as pool:
+                    blobs = pool.map(_worker_distances, landmarks)
+            finally:
+                _worker_graph = None
+            distances = [array("B", blob) for blob in blobs]
+        else:
+            distances = [bfs_distances(graph.offsets, graph.targets, landmark) for landmark in landmarks]
+        
+        return cls(graph, landmarks, distances)
+    
+    def landmark_ids(self):
+        """Get the scientist IDs of the landmarks"""
+        return [self.graph.ids[i] for i in self.landmarks]
+    
+    def bounds(self, source_id, target_id):
+        """
+        Bound the degree of separation between two scientists
+        
+        Args:
+            source_id (str): ID of the source scientist
+            target_id (str): ID of the target scientist
+        
+        Returns:
+            tuple or None: (lower, upper) where upper is None if no landmark
+                           reaches both scientists; None for unknown IDs
+        """
+        source = self.graph.index.get(source_id)
+        target = self.graph.index.get(target_id)
+        if source is None or target is None:
+            return None
+        return self._bounds(source, target)
+    
+    def _bounds(self, source, target):
+        """bounds() over dense indices"""
+        if source == target:
+            return 0, 0
+        lower = 1
+        upper = None
+        for dist in self.distances:
+            ds = dist[source]
+            dt = dist[target]
+            if ds == UNKNOWN or dt == UNKNOWN:
+                continue
+            gap = ds - dt if ds > dt else dt - ds
+            if gap > lower:
+                lower = gap
+            if upper is None or ds + dt < upper:
+                upper = ds + dt
+        return lower, upper
+    
+    def search(self, source_id, target_id, progress=None, levels=None):
+        """
+        Exact shortest path search pruned with the landmark bounds
+        
+        Args:
+            source_id (str): ID of the source scientist
+            target_id (str): ID of the target scientist
+            progress (callable, optional): Called as progress("search", expanded)
+                                           every PROGRESS_NODES expanded nodes
+            levels (list, optional): Receives the size of every (pruned)
+                                     frontier expanded
+        
+        Returns:
+            tuple: (path, visited_count) where path is a list of scientist IDs or None
+        """
+        graph = self.graph
+        source = graph.index.get(source_id)
+        target = graph.index.get(target_id)
+        if source is None or target is None:
+            return None, 0
+        if source == target:
+            return [source_id], 1
+        
+        _, upper = self._bounds(source, target)
+        # Landmarks that reach the target; the others give no pruning
+        target_distances = [(dist, dist[target]) for dist in self.distances if dist[target] != UNKNOWN]
+        if upper is None:
+            upper = len(graph)
+        
+        offsets = graph.offsets
+        targets = graph.targets
+        parents = array("i", [-1]) * len(graph)
+        parents[source] = source
+        visited_count = 1
+        expanded = 0
+        frontier = [source]
+        depth = 0
+        while frontier:
+            if levels is not None:
+                levels.append(len(frontier))
+            depth += 1
+            # Nodes farther than this from the target cannot be on a shortest path
+            slack = upper - depth
+            next_frontier = []
+            for current in frontier:
+                expanded += 1
+                if progress is not None and expanded % PROGRESS_NODES == 0:
+                    progress("search", expanded)
+                for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                    if parents[neighbor] >= 0:
+                        continue
+                    parents[neighbor] = current
+                    visited_count += 1
+                    if neighbor == target:
+                        return [graph.ids[i] for i in dense_path_from_parents(parents, target)], visited_count
+                    if _lower_bound(neighbor, target_distances) <= slack:
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        
+        return None, visited_count
+
+
+def _lower_bound(node, target_distances):
+    """Largest landmark lower bound on the distance from node to the target"""
+    lower = 1
+    for dist, dt in target_distances:
+        dn = dist[node]
+        if dn == UNKNOWN:
+            continue
+        gap = dn - dt if dn > dt else dt - dn
+        if gap > lower:
+            lower = gap
+    return lower
+
+
+def bfs_distances(offsets, targets, source):
+    """
+    Breadth-first distances from one node over CSR arrays
+    
+    Args:
+        offsets (array): CSR offsets
+        targets (array): CSR neighbor indices
+        source (int): Start node index
+    
+    Returns:
+        array: uint8 distance per node, UNKNOWN when unreachable or too far
+    """
+    distances = array("B", [UNKNOWN]) * (len(offsets) - 1)
+    distances[source] = 0
+    frontier = [source]
+    depth = 0
+    while frontier and depth < UNKNOWN - 1:
+        depth += 1
+        next_frontier = []
+        for current in frontier:
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if distances[neighbor] == UNKNOWN:
+                    distances[neighbor] = depth
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    return distances
+
+
+def _worker_distances(landmark):
+    """Worker: distances from one landmark of the inherited graph, as bytes"""
+    return bfs_distances(_worker_graph.offsets, _worker_graph.targets, landmark).tobytes()
+
+
+def landmarks_path(data_dir):
+    """Return the landmark index location for a data directory"""
+    return os.path.join(data_dir, LANDMARKS_NAME)
+
+
+def _ids_digest(ids):
+    """Fingerprint of the scientist ID order the distances are indexed by"""
+    digest = hashlib.sha1()
+    for scientist_id in ids:
+        digest.update(scientist_id.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def write_landmarks(data_dir, index):
+    """
+    Write a landmark index next to the CSV files
+    
+    Args:
+        data_dir (str): Directory holding the source CSVs
+        index (LandmarkIndex): Index to persist
+    
+    Returns:
+        tuple: (success, message)
+    """
+    stats = source_stats(data_dir)
+    if stats is None:
+        return False, "Source files missing, landmark index not written"
+    
+    header = json.dumps({
+        "sources": stats,
+        "scientists": len(index.graph),
+        "ids": _ids_digest(index.graph.ids),
+        "landmarks": index.landmarks,
+    }).encode("utf-8")
+    
+    path = landmarks_path(data_dir)
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(_PREFIX.pack(MAGIC, LANDMARKS_VERSION, len(header)))
+            f.write(header)
+            for dist in index.distances:
+                f.write(dist)
+        os.replace(temp_path, path)
+    except OSError as e:
+        return False, f"Could not write landmark index: {str(e)}"
+    
+    return True, f"Landmark index written to '{path}'"
+
+
+def read_landmarks(data_dir, graph, count):
+    """
+    Memory-map the landmark index for a data directory if it is still valid
+    
+    Args:
+        data_dir (str): Directory holding the source CSVs
+        graph (CSRGraph): Graph of the loaded data
+        count (int): Number of landmarks wanted
+    
+    Returns:
+        LandmarkIndex or None: None when the file is missing, stale, from
+                               another version or has another landmark count
+    """
+    path = landmarks_path(data_dir)
+    stats = source_stats(data_dir)
+    if stats is None or not os.path.isfile(path):
+        return None
+    
+    try:
+        with open(path, "rb") as f:
+            magic, version, header_length = _PREFIX.unpack(f.read(_PREFIX.size))
+            if magic != MAGIC or version != LANDMARKS_VERSION:
+                return None
+            header = json.loads(f.read(header_length).decode("utf-8"))
+            if (header.get("sources") != stats or header.get("scientists") != len(graph)
+                    or len(header.get("landmarks", ())) != count
+                    or header.get("ids") != _ids_digest(graph.ids)):
+                return None
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError, struct.error):
+        return None
+    
+    base = _PREFIX.size + header_length
+    size = len(graph)
+    if len(mapping) != base + size * count:
+        return None
+    view = memoryview(mapping)
+    distances = [view[base + i * size:base + (i + 1) * size] for i in range(count)]
+    return LandmarkIndex(graph, header["landmarks"], distances)
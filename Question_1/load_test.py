@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Load Test - Drives a running service.py instance with concurrent requests
+
+Opens keep-alive connections to a local service, sends a mix of /search and
+/path requests between scientists picked from the loaded data, and reports
+throughput with client-side latency percentiles next to the server's own
+/metrics.
+
+Usage:
+    python service.py DATA_DIR --port 8080 &
+    python load_test.py [--port 8080] [--concurrency 16] [--requests 2000]
+"""
+
+import json
+import time
+import random
+import asyncio
+import argparse
+from urllib.parse import urlencode
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection to the service"""
+    
+    __slots__ = ("host", "port", "reader", "writer")
+    
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+    
+    async def request(self, method, target, payload=None):
+        """
+        Send a request and read its JSON answer, reconnecting if needed
+        
+        Returns:
+            tuple: (status, decoded JSON answer)
+        """
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        head = (f"{method} {target} HTTP/1.1\r\nHost: {self.host}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n")
+        self.writer.write(head.encode("latin-1") + body)
+        await self.writer.drain()
+        
+        status_line, *header_lines = (await self.reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        answer = json.loads(await self.reader.readexactly(int(headers.get("content-length", 0))) or b"null")
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return int(status_line.split(" ", 2)[1]), answer
+    
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+def percentile(sorted_values, quantile):
+    """Nearest-rank percentile of a sorted list"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(quantile * len(sorted_values)))]
+
+
+def make_requests(ids, names, count, search_share, rng):
+    """Build the (method, target) list: name searches mixed with paths between random scientists"""
+    requests = []
+    for _ in range(count):
+        if rng.random() < search_share:
+            name = rng.choice(names)
+            requests.append(("GET", "/search?" + urlencode({"q": name[:max(3, len(name) // 2)], "limit": 10})))
+        else:
+            source, target = rng.sample(ids, 2)
+            requests.append(("GET", "/path?" + urlencode({"source": source, "target": target})))
+    return requests
+
+
+async def worker(host, port, queue, latencies, statuses):
+    """Send queued requests over one connection, recording latency per endpoint"""
+    connection = Connection(host, port)
+    try:
+        while True:
+            try:
+                method, target = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            endpoint = target.split("?", 1)[0]
+            start = time.perf_counter()
+            try:
+                status, _ = await connection.request(method, target)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                connection.close()
+                status = 0
+            latencies.setdefault(endpoint, []).append((time.perf_counter() - start) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        connection.close()
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    control = Connection(args.host, args.port)
+    # An empty query matches every scientist; the first matches are the sample
+    status, answer = await control.request("GET", "/search?" + urlencode({"q": "", "limit": args.sample}))
+    if status != 200 or len(answer["matches"]) < 2:
+        raise SystemExit(f"Could not sample scientists from the service (HTTP {status}): {answer}")
+    ids = [match["id"] for match in answer["matches"]]
+    names = [match["name"] for match in answer["matches"]]
+    
+    queue = asyncio.Queue()
+    for request in make_requests(ids, names, args.requests, args.search_share, rng):
+        queue.put_nowait(request)
+    latencies = {}
+    statuses = {}
+    
+    print(f"Sending {args.requests} requests over {args.concurrency} connections...")
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(args.host, args.port, queue, latencies, statuses)
+                           for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+    
+    print(f"{args.requests} requests in {elapsed:.2f} s ({args.requests / elapsed:.0f} requests/s)")
+    print("Status codes: " + ", ".join(f"{code or 'failed'}: {count}" for code, count in sorted(statuses.items())))
+    print(f"{'endpoint':>10} {'count':>8} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'max ms':>10}")
+    for endpoint, values in sorted(latencies.items()):
+        values.sort()
+        print(f"{endpoint:>10} {len(values):>8} {percentile(values, 0.50):>10.2f} {percentile(values, 0.95):>10.2f} "
+              f"{percentile(values, 0.99):>10.2f} {values[-1]:>10.2f}")
+    
+    status, metrics = await control.request("GET", "/metrics")
+    control.close()
+    print("\nServer metrics:")
+    print(json.dumps(metrics, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test a running shortest path service.")
+    parser.add_argument("--host", default="127.0.0.1", help="Service address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="Service port (default: 8080)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Simultaneous connections (default: 16)")
+    parser.add_argument("--requests", type=int, default=2000, help="Total requests to send (default: 2000)")
+    parser.add_argument("--search-share", type=float, default=0.5,
+                        help="Fraction of requests that are name searches (default: 0.5)")
+    parser.add_argument("--sample", type=int, default=1000,
+                        help="Scientists sampled from the service as query endpoints (default: 1000)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the request mix")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,26 +4,172 @@ Minimal Main Module
 """
 
 import sys
-from data_access import load_data, get_scientist_id, get_scientist_name, search_scientists
-from scientists_network import shortest_path, print_path
+import argparse
+from data_access import (load_data, load_landmarks, get_scientist_id, get_scientist_name, search_scientists,
+                         get_component_index, LAYOUTS, LOADERS)
+from scientists_network import (shortest_path, print_path, configure_cache, degree_bounds, all_shortest_paths,
+                                SEARCH_MODES)
+from landmarks import DEFAULT_LANDMARKS
+from path_cache import DEFAULT_MAXSIZE, DEFAULT_TREE_MAXSIZE
+from batch import read_queries, run_batch, write_results, summarize, OUTPUT_FORMATS
+import instrumentation
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Find degrees of separation between scientists.")
+    parser.add_argument("data_directory", help="Directory containing scientists.csv, papers.csv and authors.csv")
+    parser.add_argument("--search", choices=SEARCH_MODES, default="bfs",
+                        help="Shortest path strategy; landmark prunes BFS with the landmark oracle "
+                             "(default: bfs)")
+    parser.add_argument("--paths", type=int, default=1,
+                        help="Show up to this many shortest paths per query, in a fixed order (default: 1)")
+    parser.add_argument("--landmarks", type=int, default=0,
+                        help=f"Precompute distances from this many landmark scientists and print "
+                             f"estimated degrees before each search (default: {DEFAULT_LANDMARKS} "
+                             f"with --search landmark, otherwise off)")
+    parser.add_argument("--layout", choices=LAYOUTS, default="sets",
+                        help="In-memory graph layout: dict of sets, compact CSR arrays or scientist-paper "
+                             "bipartite links (default: sets)")
+    parser.add_argument("--loader", choices=LOADERS, default="csv",
+                        help="CSV ingestion strategy: row by row, chunked bulk parsing or a process "
+                             "pool (default: csv)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for --loader parallel (default: CPU count)")
+    parser.add_argument("--max-matches", type=int, default=50,
+                        help="Maximum number of name matches to list, 0 for no limit (default: 50)")
+    parser.add_argument("--no-snapshot", action="store_true",
+                        help="Always parse the CSV files and do not write a binary snapshot")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAXSIZE,
+                        help=f"Shortest paths kept in the LRU cache, 0 to disable (default: {DEFAULT_MAXSIZE})")
+    parser.add_argument("--tree-cache-size", type=int, default=DEFAULT_TREE_MAXSIZE,
+                        help=f"Search trees of frequently queried sources kept in the cache "
+                             f"(default: {DEFAULT_TREE_MAXSIZE})")
+    parser.add_argument("--components", action="store_true",
+                        help="Print the number and sizes of connected components and exit")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="Answer the source,target pairs (IDs or names) in FILE, or '-' for stdin, "
+                             "instead of prompting")
+    parser.add_argument("--output", metavar="FILE",
+                        help="Where to write batch results (default: stdout)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="jsonl",
+                        help="Batch output format (default: jsonl)")
+    parser.add_argument("--batch-workers", type=int, default=1,
+                        help="Processes answering batch queries in parallel (default: 1)")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="Collect load and search metrics and write them to FILE on exit, as "
+                             "Prometheus text if it ends in .prom and as JSON otherwise")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="With --metrics, also record the peak memory of every phase (slower)")
+    parser.add_argument("--profile", metavar="FILE", nargs="?", const="",
+                        help="Run under cProfile and print the most expensive functions, or save "
+                             "the profile to FILE")
+    return parser.parse_args(argv)
+
+
+def find_matches(query, max_matches):
+    """
+    Search scientists by partial name, telling the user when the list is cut short
+    
+    Args:
+        query (str): Partial name entered by the user
+        max_matches (int): Maximum number of matches to return, 0 for no limit
+    
+    Returns:
+        list: (scientist_id, name) tuples
+    """
+    if max_matches <= 0:
+        return search_scientists(query)
+    
+    matches = search_scientists(query, limit=max_matches + 1)
+    if len(matches) > max_matches:
+        print(f"More than {max_matches} scientists match '{query}'; showing the first {max_matches}.")
+        matches = matches[:max_matches]
+    return matches
+
+
+def print_components(top=10):
+    """Print the number and sizes of the connected components"""
+    summary = get_component_index().summary(top)
+    print(f"{summary['components']} components over {summary['scientists']} scientists "
+          f"({summary['isolated']} without collaborators)")
+    print(f"Largest components: {', '.join(str(size) for size in summary['largest'])}")
+    print("Components by size:")
+    for bucket, count in summary["size_histogram"].items():
+        print(f"  {bucket:>10}-{bucket * 2 - 1:<10} {count}")
+
+
+def batch_mode(args):
+    """
+    Answer every query of the batch file and write the results
+    
+    Args:
+        args (Namespace): Parsed command line arguments
+    """
+    if args.batch == "-":
+        results = run_batch(read_queries(sys.stdin), args.batch_workers)
+    else:
+        with open(args.batch, 'r', encoding='utf-8', newline='') as f:
+            results = run_batch(read_queries(f), args.batch_workers)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            write_results(results, f, args.format)
+    else:
+        write_results(results, sys.stdout, args.format)
+    
+    counts = ", ".join(f"{count} {status}" for status, count in sorted(summarize(results).items()))
+    print(f"Answered {len(results)} queries ({counts}).", file=sys.stderr)
 
 
 def main():
-    # Check arguments
-    if len(sys.argv) != 2:
-        print("Usage: python main.py <data_directory>")
-        sys.exit(1)
+    args = parse_args()
+    if args.metrics:
+        instrumentation.enable(trace_memory=args.trace_memory)
+    try:
+        if args.profile is not None:
+            instrumentation.profiled(run, args, output=args.profile or None)
+        else:
+            run(args)
+    finally:
+        if args.metrics:
+            print(instrumentation.write_metrics(args.metrics)[1], file=sys.stderr)
+
+
+def run(args):
+    """
+    Load the data and answer the queries selected by the command line
     
-    data_dir = sys.argv[1]
+    Args:
+        args (Namespace): Parsed command line arguments
+    """
+    data_dir = args.data_directory
+    configure_cache(args.cache_size, args.tree_cache_size)
+    # Batch results may go to stdout, so keep status messages apart
+    log = sys.stderr if args.batch else sys.stdout
     
     # Load data
-    print(f"Loading data from '{data_dir}'...")
-    success, message = load_data(data_dir)
+    print(f"Loading data from '{data_dir}'...", file=log)
+    success, message = load_data(data_dir, layout=args.layout, use_snapshot=not args.no_snapshot,
+                                 loader=args.loader, workers=args.workers)
     if not success:
-        print(f"Error: {message}")
+        print(f"Error: {message}", file=log)
         sys.exit(1)
     
-    print("Data loaded successfully.")
+    print("Data loaded successfully.", file=log)
+    
+    landmark_count = args.landmarks or (DEFAULT_LANDMARKS if args.search == "landmark" else 0)
+    if landmark_count > 0:
+        success, message = load_landmarks(landmark_count, args.workers, use_cache=not args.no_snapshot)
+        print(message, file=log)
+    
+    if args.components:
+        print_components()
+        return
+    
+    if args.batch:
+        batch_mode(args)
+        return
     
     while True:
         # Get source scientist
@@ -32,7 +178,7 @@ def main():
             break
         
         # Search scientists
-        matches = search_scientists(source_input)
+        matches = find_matches(source_input, args.max_matches)
         if not matches:
             print(f"No scientists found matching '{source_input}'.")
             continue
@@ -66,7 +212,7 @@ def main():
             break
         
         # Search scientists
-        matches = search_scientists(target_input)
+        matches = find_matches(target_input, args.max_matches)
         if not matches:
             print(f"No scientists found matching '{target_input}'.")
             continue
@@ -94,9 +240,14 @@ def main():
             target_name = matches[0][1]
             print(f"Using scientist: {target_name}")
         
+        # Landmark estimate before the exact search
+        bounds = degree_bounds(source_id, target_id) if landmark_count > 0 else None
+        if bounds is not None and bounds[1] is not None:
+            print(f"Estimated degrees of separation: between {bounds[0]} and {bounds[1]}.")
+        
         # Find path
         print(f"Searching for connection...")
-        path = shortest_path(source_id, target_id)
+        path = shortest_path(source_id, target_id, mode=args.search)
         
         # Display results
         if source_id == target_id:
@@ -106,7 +257,12 @@ def main():
         else:
             degrees = len(path) - 1
             print(f"{degrees} degree{'s' if degrees > 1 else ''} of separation.")
-            print_path(path)
+            if args.paths > 1:
+                for i, equal_path in enumerate(all_shortest_paths(source_id, target_id, args.paths), 1):
+                    print(f"\nShortest path {i}:")
+                    print_path(equal_path)
+            else:
+                print_path(path)
 
 
 if __name__ == "__main__":
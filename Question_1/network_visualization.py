@@ -8,6 +8,23 @@ from tkinter import ttk, messagebox, filedialog
 import os
 from scientists_network import shortest_path
 from data_access import get_all_scientists, get_path_info, get_scientist_name, get_paper_title, load_data, get_name_to_id
+from data_access import get_scientist_id, search_scientists
+from background import BackgroundTask
+
+# Number of suggestions pulled from the search index while typing
+TYPEAHEAD_LIMIT = 20
+# Delay after the last keystroke before the suggestions are refreshed
+TYPEAHEAD_DELAY_MS = 150
+# Interval between two checks of a running background task
+POLL_MS = 100
+# How the progress of each load or search stage is described
+PROGRESS_UNITS = {
+    "scientists": "scientist rows parsed",
+    "papers": "paper rows parsed",
+    "authors": "author rows parsed",
+    "collaborations": "papers linked",
+    "search": "scientists visited",
+}
 
 class ScientistNetworkApp:
     def __init__(self, root):
@@ -36,8 +53,16 @@ class ScientistNetworkApp:
         data_status_label.pack(fill=tk.X, pady=5)
         
         # Load data button
-        load_button = ttk.Button(main_frame, text="Load Data", command=self.load_data_dialog)
-        load_button.pack(pady=5)
+        self.load_button = ttk.Button(main_frame, text="Load Data", command=self.load_data_dialog)
+        self.load_button.pack(pady=5)
+        
+        # Progress of the running load or search, with a cancel button
+        self.progress_frame = ttk.Frame(main_frame)
+        self.progress_var = tk.StringVar()
+        self.progress_bar = ttk.Progressbar(self.progress_frame, mode="indeterminate", length=200)
+        self.progress_bar.pack(side=tk.LEFT, padx=5)
+        ttk.Label(self.progress_frame, textvariable=self.progress_var).pack(side=tk.LEFT, padx=5)
+        ttk.Button(self.progress_frame, text="Cancel", command=self.cancel_task).pack(side=tk.RIGHT, padx=5)
         
         # Create source and target selection frame
         self.selection_frame = ttk.LabelFrame(main_frame, text="Find Shortest Path", padding="10")
@@ -49,12 +74,14 @@ class ScientistNetworkApp:
         self.source_var = tk.StringVar()
         self.source_combo = ttk.Combobox(self.selection_frame, textvariable=self.source_var, width=30)
         self.source_combo.grid(row=0, column=1, padx=5, pady=5)
+        self.bind_typeahead(self.source_combo, self.source_var)
         
         # Target scientist selection
         ttk.Label(self.selection_frame, text="Target Scientist:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=5)
         self.target_var = tk.StringVar()
         self.target_combo = ttk.Combobox(self.selection_frame, textvariable=self.target_var, width=30)
         self.target_combo.grid(row=1, column=1, padx=5, pady=5)
+        self.bind_typeahead(self.target_combo, self.target_var)
         
         # Find path button
         find_button = ttk.Button(self.selection_frame, text="Find Path", command=self.find_path)
@@ -96,7 +123,102 @@ class ScientistNetworkApp:
         # Initialize scientists data
         self.scientists = {}
         self.name_to_id = {}
+        self.typeahead_jobs = {}
+        
+        # Background load or search currently running
+        self.task = None
+        self.task_description = None
+        self.task_complete = None
+        self.task_cancelled = None
+    
+    def start_task(self, description, func, args, on_complete, on_cancel=None):
+        """
+        Run func(*args) on a worker thread while showing its progress
+        
+        Args:
+            description (str): What the task does, shown next to the progress bar
+            func (callable): Function accepting a progress keyword argument
+            args (tuple): Positional arguments for func
+            on_complete (callable): Called with the result on the Tk thread
+            on_cancel (callable, optional): Called on the Tk thread if the task is cancelled
+        
+        Returns:
+            bool: False if another task is still running
+        """
+        if self.task is not None:
+            messagebox.showinfo("Busy", "Please wait for the current task to finish or cancel it")
+            return False
+        
+        self.task = BackgroundTask(func, *args).start()
+        self.task_description = description
+        self.task_complete = on_complete
+        self.task_cancelled = on_cancel
+        
+        self.progress_var.set(f"{description}...")
+        self.progress_frame.pack(fill=tk.X, pady=5, after=self.load_button)
+        self.progress_bar.start(10)
+        self.root.after(POLL_MS, self.poll_task)
+        return True
+    
+    def poll_task(self):
+        """Show the progress of the running task and hand its result to the UI once done"""
+        task = self.task
+        if not task.done:
+            if task.progress is not None and not task.cancel_requested:
+                stage, count = task.progress
+                self.progress_var.set(f"{self.task_description}: {count:,} {PROGRESS_UNITS.get(stage, stage)}")
+            self.root.after(POLL_MS, self.poll_task)
+            return
+        
+        self.task = None
+        self.progress_bar.stop()
+        self.progress_frame.pack_forget()
         
+        if task.cancelled:
+            self.status_var.set(f"{self.task_description} cancelled")
+            if self.task_cancelled is not None:
+                self.task_cancelled()
+        elif task.error is not None:
+            messagebox.showerror("Error", f"{self.task_description} failed: {str(task.error)}")
+        else:
+            self.task_complete(task.result)
+    
+    def cancel_task(self):
+        """Ask the running task to stop at its next progress report"""
+        if self.task is not None:
+            self.task.cancel()
+            self.progress_var.set(f"Cancelling {self.task_description.lower()}...")
+    
+    def bind_typeahead(self, combo, variable):
+        """Refresh a combobox's suggestions from the search index as the user types"""
+        combo.bind("<KeyRelease>", lambda event: self.schedule_suggestions(event, combo, variable))
+    
+    def schedule_suggestions(self, event, combo, variable):
+        """Debounce keystrokes so only the last one triggers a search"""
+        if event.keysym in ("Up", "Down", "Left", "Right", "Return", "Escape", "Tab"):
+            return
+        
+        pending = self.typeahead_jobs.pop(combo, None)
+        if pending is not None:
+            self.root.after_cancel(pending)
+        self.typeahead_jobs[combo] = self.root.after(
+            TYPEAHEAD_DELAY_MS, lambda: self.update_suggestions(combo, variable))
+    
+    def update_suggestions(self, combo, variable):
+        """Show the top matches for the text typed so far"""
+        self.typeahead_jobs.pop(combo, None)
+        text = variable.get().strip()
+        if not text:
+            combo['values'] = ()
+            return
+        
+        matches = search_scientists(text, limit=TYPEAHEAD_LIMIT)
+        combo['values'] = [name for _, name in matches]
+    
+    def resolve_scientist(self, name):
+        """Return the ID for a displayed name, falling back to a case-insensitive match"""
+        return self.name_to_id.get(name) or get_scientist_id(name)
+    
     def load_data_dialog(self):
         """Open dialog to select directory containing CSV files"""
         directory = filedialog.askdirectory(
@@ -108,28 +230,42 @@ class ScientistNetworkApp:
             self.load_data(directory)
     
     def load_data(self, directory):
-        """Load data from CSV files in the specified directory"""
+        """Start loading data from CSV files in the specified directory"""
+        # Check if the required files exist
+        required_files = ["scientists.csv", "papers.csv", "authors.csv"]
+        for file in required_files:
+            if not os.path.isfile(os.path.join(directory, file)):
+                messagebox.showerror("Error", f"Missing required file: {file}")
+                return False
+        
+        # Load the data on a worker thread
+        return self.start_task("Loading data", load_data, (directory,),
+                               lambda result: self.data_loaded(directory, result),
+                               self.data_unloaded)
+    
+    def data_unloaded(self):
+        """Update the UI after a load that was cancelled or failed"""
+        # The previous data stays loaded until a new load succeeds
+        if self.scientists:
+            self.status_var.set("Load stopped, previous data kept")
+            return
+        self.data_status_var.set("No data loaded. Please load data from CSV files.")
+        self.selection_frame.pack_forget()
+        self.results_frame.pack_forget()
+    
+    def data_loaded(self, directory, result):
+        """Update the UI with the outcome of a load"""
         try:
-            # Check if the required files exist
-            required_files = ["scientists.csv", "papers.csv", "authors.csv"]
-            for file in required_files:
-                if not os.path.isfile(os.path.join(directory, file)):
-                    messagebox.showerror("Error", f"Missing required file: {file}")
-                    return False
-            
-            # Load the data
-            success = load_data(directory)
+            success, message = result
             
             if success:
                 # Get updated scientists data
                 self.scientists = get_all_scientists()
                 self.name_to_id = get_name_to_id()
                 
-                # Update comboboxes with scientist names
-                scientist_names = list(self.scientists.values())
-                scientist_names.sort()  # Sort names alphabetically
-                self.source_combo['values'] = scientist_names
-                self.target_combo['values'] = scientist_names
+                # Suggestions are filled in as the user types
+                self.source_combo['values'] = ()
+                self.target_combo['values'] = ()
                 
                 # Update status
                 self.data_status_var.set(f"Loaded data from {directory}")
@@ -145,12 +281,13 @@ class ScientistNetworkApp:
                 self.status_var.set(f"Loaded {len(self.scientists)} scientists")
                 return True
             else:
-                messagebox.showerror("Error", f"Failed to load data from {directory}")
+                self.data_unloaded()
+                messagebox.showerror("Error", f"Failed to load data from {directory}: {message}")
                 return False
         except Exception as e:
             messagebox.showerror("Error", f"Error loading data: {str(e)}")
             return False
-            
+    
     def find_path(self):
         """Find and display the shortest path between selected scientists"""
         source_name = self.source_var.get()
@@ -164,38 +301,53 @@ class ScientistNetworkApp:
         if not source_name or not target_name:
             messagebox.showerror("Error", "Please select both source and target scientists")
             return
-            
-        # Find source and target IDs using the name-to-ID mapping
-        source_id = None
-        target_id = None
         
-        for name, id in self.name_to_id.items():
-            if name == source_name:
-                source_id = id
-            if name == target_name:
-                target_id = id
+        # Find source and target IDs using the name-to-ID mapping
+        source_id = self.resolve_scientist(source_name)
+        target_id = self.resolve_scientist(target_name)
         
         if not source_id or not target_id:
             messagebox.showerror("Error", "Could not find scientist IDs")
             return
-            
-        # Find shortest path
-        path = shortest_path(source_id, target_id)
         
+        # Find shortest path on a worker thread
+        self.start_task("Searching", shortest_path, (source_id, target_id),
+                        lambda path: self.show_path(source_name, target_name, path))
+    
+    def show_path(self, source_name, target_name, path):
+        """Display the path found between the selected scientists"""
         if path is None:
             self.status_var.set(f"No path found between {source_name} and {target_name}")
             return
-            
-        if len(path) == 0:
+        
+        if len(path) <= 1:
             self.status_var.set(f"Source and target are the same scientist: {source_name}")
             return
-            
+        
         # Get detailed path information
         path_info = get_path_info(path)
         
         # Display path
-        current_scientist = source_id
         current_scientist_name = source_name
         
         for i, step in enumerate(path_info):
-            paper_title = step["paper_title"]
\ No newline at end of file
+            paper_title = step["paper_title"]
+            next_scientist_name = step["scientist_name"]
+            
+            self.tree.insert("", tk.END, values=(i + 1, current_scientist_name, paper_title, next_scientist_name))
+            
+            current_scientist_name = next_scientist_name
+        
+        degrees = len(path_info)
+        self.status_var.set(f"{degrees} degree{'s' if degrees > 1 else ''} of separation "
+                            f"between {source_name} and {target_name}")
+
+
+def main():
+    root = tk.Tk()
+    ScientistNetworkApp(root)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
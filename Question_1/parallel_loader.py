@@ -0,0 +1,173 @@
+"""
+Parallel Loader Module - Parses the three CSV files with a process pool
+
+scientists.csv and papers.csv do not depend on each other, and authors.csv
+can be split into byte ranges, so every file and every range is parsed by a
+separate worker at the same time. The partial results are merged in file
+order into the same structures the other loaders fill.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress, repeat
+from operator import itemgetter
+from background import Cancelled
+from bulk_loader import (iter_column_chunks, read_header, find_column, resolve_backend,
+                         join_authors, report_chunks, paused_gc, DEFAULT_CHUNK_BYTES)
+
+# Byte ranges smaller than this are not worth a separate worker
+MIN_RANGE_BYTES = 1 << 22
+
+
+def split_ranges(path, parts, min_bytes=MIN_RANGE_BYTES, size=None):
+    """
+    Split a file into at most parts contiguous byte ranges
+    
+    Args:
+        path (str): File to split
+        parts (int): Maximum number of ranges
+        min_bytes (int): Minimum size of a range
+        size (int, optional): Bytes to split (default: the whole file)
+    
+    Returns:
+        list: (start, end) tuples covering the first size bytes
+    """
+    if size is None:
+        size = os.path.getsize(path)
+    parts = max(1, min(parts, size // min_bytes))
+    bounds = [size * i // parts for i in range(parts + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _parse_scientists(path, id_idx, name_idx, chunk_bytes, end=None):
+    """Worker: return the (id, name) pairs with a non-empty ID and name"""
+    pairs = []
+    for ids, names in iter_column_chunks(path, [id_idx, name_idx], chunk_bytes, end=end):
+        pairs.extend(compress(zip(ids, names), map(all, zip(ids, names))))
+    return pairs
+
+
+def _parse_papers(path, paper_id_idx, title_idx, chunk_bytes, end=None):
+    """Worker: return the (paper_id, title) pairs with a non-empty ID"""
+    pairs = []
+    if title_idx >= 0:
+        chunks = iter_column_chunks(path, [paper_id_idx, title_idx], chunk_bytes, fill="Unknown Title", end=end)
+        for paper_ids, titles in chunks:
+            pairs.extend(compress(zip(paper_ids, titles), paper_ids))
+    else:
+        for (paper_ids,) in iter_column_chunks(path, [paper_id_idx], chunk_bytes, end=end):
+            pairs.extend(zip(compress(paper_ids, paper_ids), repeat("Unknown Title")))
+    return pairs
+
+
+def _parse_author_range(path, scientist_id_idx, paper_id_idx, start, end, chunk_bytes):
+    """Worker: return the (scientist_ids, paper_ids) columns of one byte range"""
+    scientist_col = []
+    paper_col = []
+    chunks = iter_column_chunks(path, [scientist_id_idx, paper_id_idx], chunk_bytes, start=start, end=end)
+    for scientist_ids, paper_ids in chunks:
+        scientist_col.extend(scientist_ids)
+        paper_col.extend(paper_ids)
+    return scientist_col, paper_col
+
+
+def parse_files_parallel(data_dir, scientists, scientist_ids, papers, paper_authors,
+                         workers=None, chunk_bytes=DEFAULT_CHUNK_BYTES, backend="auto", progress=None, ends=None):
+    """
+    Parse the three CSV files into the given data structures with a process pool
+    
+    Args:
+        data_dir (str): Path to directory containing CSV files
+        scientists (dict): Filled with id -> name
+        scientist_ids (dict): Filled with lowercased name -> id
+        papers (dict): Filled with paper_id -> title
+        paper_authors (defaultdict): Filled with paper_id -> list of scientist_ids
+        workers (int, optional): Number of worker processes (default: CPU count)
+        chunk_bytes (int): Approximate size of each block a worker reads
+        backend (str): Join backend, see bulk_loader.BACKENDS
+        progress (callable, optional): Called as progress(stage, rows) as each
+                                       partial result is merged
+        ends (dict, optional): file name -> byte offset to stop reading at,
+                               e.g. checkpoint offsets (default: whole files)
+    
+    Returns:
+        tuple: (success, message)
+    """
+    backend, error = resolve_backend(backend)
+    if error:
+        return False, error
+    workers = workers or os.cpu_count() or 1
+    ends = ends or {}
+    
+    # Validate files and headers before starting any worker
+    scientists_file = os.path.join(data_dir, "scientists.csv")
+    papers_file = os.path.join(data_dir, "papers.csv")
+    authors_file = os.path.join(data_dir, "authors.csv")
+    for label, path in (("Scientists", scientists_file), ("Papers", papers_file), ("Authors", authors_file)):
+        if not os.path.isfile(path):
+            return False, f"{label} file not found at '{path}'"
+    
+    header = read_header(scientists_file)
+    if not header:
+        return False, "Empty header in scientists file"
+    id_idx = find_column(header, 'id', 'scientist_id')
+    name_idx = find_column(header, 'name')
+    if id_idx == -1 or name_idx == -1:
+        return False, f"Invalid header in scientists file: {header}. Need 'id' or 'scientist_id' and 'name' columns."
+    
+    header = read_header(papers_file) or []
+    paper_id_idx = find_column(header, 'paper_id', 'id')
+    title_idx = find_column(header, 'title')
+    if paper_id_idx == -1:
+        return False, f"Invalid header in papers file: {header}. Need 'paper_id' or 'id' column."
+    
+    header = read_header(authors_file) or []
+    author_scientist_idx = find_column(header, 'scientist_id')
+    author_paper_idx = find_column(header, 'paper_id')
+    if author_scientist_idx == -1 or author_paper_idx == -1:
+        return False, f"Invalid header in authors file: {header}. Need 'scientist_id' and 'paper_id' columns."
+    
+    ranges = split_ranges(authors_file, workers, size=ends.get("authors.csv"))
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        scientists_future = pool.submit(_parse_scientists, scientists_file, id_idx, name_idx, chunk_bytes,
+                                        ends.get("scientists.csv"))
+        papers_future = pool.submit(_parse_papers, papers_file, paper_id_idx, title_idx, chunk_bytes,
+                                    ends.get("papers.csv"))
+        author_futures = [pool.submit(_parse_author_range, authors_file, author_scientist_idx,
+                                      author_paper_idx, start, end, chunk_bytes)
+                          for start, end in ranges]
+        
+        # Merging creates millions of containers at once; skip cyclic GC meanwhile
+        with paused_gc():
+            try:
+                pairs = scientists_future.result()
+            except Exception as e:
+                return False, f"Error reading scientists file: {str(e)}"
+            if progress is not None:
+                progress("scientists", len(pairs))
+            scientists.update(pairs)
+            scientist_ids.update(zip(map(str.lower, map(itemgetter(1), pairs)), map(itemgetter(0), pairs)))
+            del pairs
+            if not scientists:
+                return False, "No scientists loaded. Check file format."
+            
+            try:
+                pairs = papers_future.result()
+            except Exception as e:
+                return False, f"Error reading papers file: {str(e)}"
+            if progress is not None:
+                progress("papers", len(pairs))
+            papers.update(pairs)
+            del pairs
+            
+            try:
+                # Ranges are joined in file order, keeping author order per paper
+                chunks = (future.result() for future in author_futures)
+                join_authors(report_chunks(chunks, "authors", progress), scientists, papers, paper_authors, backend)
+            except Cancelled:
+                raise
+            except Exception as e:
+                return False, f"Error reading authors file: {str(e)}"
+    
+    return True, f"Parsed CSV files with {workers} workers ({len(ranges)} authors.csv ranges)"
@@ -0,0 +1,234 @@
+"""
+Path Cache Module - Bounded LRU cache of shortest path results
+
+Paths are cached per (source, target) pair and looked up in both
+directions, since collaborations are undirected. Sources that keep coming
+back ("hot" sources) get their whole breadth-first search tree cached, so
+every later target from them is answered without searching. The cache is
+tagged with the data version it was filled from and empties itself when
+the data is reloaded; after an incremental update only the entries that
+may have changed are dropped.
+
+The cache is shared by every thread answering queries. A lock guards its
+lookups and updates, while search trees are built outside of it so a slow
+build never holds up other queries.
+"""
+
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 1024
+DEFAULT_TREE_MAXSIZE = 4
+DEFAULT_HOT_THRESHOLD = 3
+
+
+class PathCache:
+    """LRU cache of paths plus search trees for frequently queried sources"""
+    
+    __slots__ = ("maxsize", "tree_maxsize", "hot_threshold", "tree_builder", "version", "lock",
+                 "paths", "trees", "source_counts", "building", "hits", "misses", "tree_hits")
+    
+    def __init__(self, tree_builder, maxsize=DEFAULT_MAXSIZE, tree_maxsize=DEFAULT_TREE_MAXSIZE,
+                 hot_threshold=DEFAULT_HOT_THRESHOLD):
+        """
+        Args:
+            tree_builder (callable): Called as tree_builder(source_id, graph,
+                                     progress); returns a function mapping a
+                                     target_id to its path from source_id
+                                     (or None)
+            maxsize (int): Maximum number of cached paths, 0 disables the cache
+            tree_maxsize (int): Maximum number of cached search trees, 0 disables them
+            hot_threshold (int): Queries from a source before its tree is cached
+        """
+        self.tree_builder = tree_builder
+        self.maxsize = maxsize
+        self.tree_maxsize = tree_maxsize
+        self.hot_threshold = hot_threshold
+        self.version = None
+        self.lock = threading.Lock()
+        self.paths = OrderedDict()  # (source_id, target_id) -> path or None
+        self.trees = OrderedDict()  # source_id -> path lookup function
+        self.source_counts = OrderedDict()  # source_id -> number of queries
+        self.building = set()  # sources whose tree is being built
+        self.hits = 0
+        self.misses = 0
+        self.tree_hits = 0
+    
+    def clear(self):
+        """Drop every cached entry and reset the counters"""
+        with self.lock:
+            self._clear()
+    
+    def _clear(self):
+        self.paths.clear()
+        self.trees.clear()
+        self.source_counts.clear()
+        self.hits = 0
+        self.misses = 0
+        self.tree_hits = 0
+    
+    def validate(self, version, affected_since=None):
+        """
+        Drop the entries that may be stale if the cache was filled from
+        another data version
+        
+        Args:
+            version (int): Version of the data about to be queried
+            affected_since (callable, optional): old version -> predicate telling
+                                                 whether a scientist's paths may
+                                                 have changed since then, or None
+                                                 if everything may have changed
+        """
+        with self.lock:
+            if version == self.version:
+                return
+            affected = None
+            if affected_since is not None and self.version is not None:
+                affected = affected_since(self.version)
+            self.version = version
+            if affected is None:
+                self._clear()
+                return
+            
+            # A path (or the lack of one) stays valid unless both ends were affected
+            for key in [key for key in self.paths if affected(key[0]) and affected(key[1])]:
+                del self.paths[key]
+            for source_id in [source_id for source_id in self.trees if affected(source_id)]:
+                del self.trees[source_id]
+    
+    def get(self, source_id, target_id, graph=None, progress=None):
+        """
+        Look up the path between two scientists
+        
+        Args:
+            source_id (str): ID of the source scientist
+            target_id (str): ID of the target scientist
+            graph (CollaborationGraph, optional): Data the cache was validated
+                                                  for, which the search tree of
+                                                  a hot source is built from
+            progress (callable, optional): Passed to the tree builder; it may
+                                           raise to abandon the build
+        
+        Returns:
+            tuple: (found, path) where path is a list of IDs or None (no path);
+                   found is False on a cache miss
+        """
+        with self.lock:
+            if self.maxsize <= 0:
+                self.misses += 1
+                return False, None
+            version = self.version
+            if graph is not None and graph.version != version:
+                # Another thread validated the cache for newer data
+                self.misses += 1
+                return False, None
+            build = self._note_source(source_id)
+        
+        if build:
+            # Built unlocked; only kept if the data has not changed meanwhile
+            try:
+                tree = self.tree_builder(source_id, graph, progress)
+            finally:
+                with self.lock:
+                    self.building.discard(source_id)
+            with self.lock:
+                if self.version == version:
+                    self.trees[source_id] = tree
+                    while len(self.trees) > self.tree_maxsize:
+                        self.trees.popitem(last=False)
+        
+        with self.lock:
+            if self.version != version:
+                self.misses += 1
+                return False, None
+            return self._lookup(source_id, target_id)
+    
+    def _lookup(self, source_id, target_id):
+        """Answer a query from the cached paths and trees; the lock is held"""
+        key = (source_id, target_id)
+        if key in self.paths:
+            self.paths.move_to_end(key)
+            self.hits += 1
+            return True, _copy(self.paths[key])
+        
+        reverse_key = (target_id, source_id)
+        if reverse_key in self.paths:
+            self.paths.move_to_end(reverse_key)
+            self.hits += 1
+            return True, _reversed(self.paths[reverse_key])
+        
+        if source_id in self.trees:
+            self.trees.move_to_end(source_id)
+            path = self.trees[source_id](target_id)
+        elif target_id in self.trees:
+            self.trees.move_to_end(target_id)
+            path = _reversed(self.trees[target_id](source_id))
+        else:
+            self.misses += 1
+            return False, None
+        
+        self.hits += 1
+        self.tree_hits += 1
+        self._store(source_id, target_id, path)
+        return True, _copy(path)
+    
+    def put(self, source_id, target_id, path, version=None):
+        """
+        Store the path (or None for no path) found between two scientists
+        
+        Args:
+            version (int, optional): Data version the path was found in; it is
+                                     dropped if the cache moved on to another
+        """
+        with self.lock:
+            if self.maxsize <= 0 or (version is not None and version != self.version):
+                return
+            self._store(source_id, target_id, path)
+    
+    def _store(self, source_id, target_id, path):
+        self.paths[(source_id, target_id)] = _copy(path)
+        self.paths.move_to_end((source_id, target_id))
+        while len(self.paths) > self.maxsize:
+            self.paths.popitem(last=False)
+    
+    def stats(self):
+        """
+        Returns:
+            dict: Hit and miss counters and the number of cached entries
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "tree_hits": self.tree_hits,
+                    "paths": len(self.paths), "trees": len(self.trees),
+                    "maxsize": self.maxsize, "tree_maxsize": self.tree_maxsize}
+    
+    def _note_source(self, source_id):
+        """
+        Count a query from source_id; the lock is held
+        
+        Returns:
+            bool: True if the source just became hot and the caller should
+                  build its search tree
+        """
+        if self.tree_maxsize <= 0 or source_id in self.trees or source_id in self.building:
+            return False
+        
+        count = self.source_counts.pop(source_id, 0) + 1
+        if count < self.hot_threshold:
+            self.source_counts[source_id] = count
+            # Only recent sources are tracked, bounded like the paths
+            while len(self.source_counts) > self.maxsize:
+                self.source_counts.popitem(last=False)
+            return False
+        
+        self.building.add(source_id)
+        return True
+
+
+def _copy(path):
+    """Copy a path so callers cannot modify cached lists"""
+    return None if path is None else list(path)
+
+
+def _reversed(path):
+    """Reverse a path found in the other direction"""
+    return None if path is None else path[::-1]
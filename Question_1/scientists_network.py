@@ -2,17 +2,34 @@
 Scientists Network Module - Handles the graph operations and shortest path algorithms
 """
 
-from collections import deque
-from data_access import get_scientist_name, get_collaborators
+from itertools import islice
+from data_access import get_scientist_name, get_graph
+from search_core import (bfs_parents, path_from_parents, bidirectional_search,
+                         dense_bfs_parents, dense_path_from_parents,
+                         bipartite_bfs_parents, bipartite_neighbors, labelled_path_from_parents,
+                         reporting_neighbors, bfs_parents_multi, dense_bfs_parents_multi,
+                         bipartite_bfs_parents_multi, iter_shortest_paths)
+from path_cache import PathCache, DEFAULT_MAXSIZE, DEFAULT_TREE_MAXSIZE, DEFAULT_HOT_THRESHOLD
+import instrumentation
 
 
-def shortest_path(source_id, target_id):
+SEARCH_MODES = ("bfs", "bidirectional", "landmark")
+
+
+def shortest_path(source_id, target_id, mode="bfs", progress=None, graph=None):
     """
     Find the shortest path between two scientists
     
     Args:
         source_id (str): ID of the source scientist
         target_id (str): ID of the target scientist
+        mode (str): Search strategy: "bfs" (one-sided), "bidirectional"
+                    (frontiers grown from both ends) or "landmark" (BFS
+                    pruned with the landmark bounds, see load_landmarks)
+        progress (callable, optional): Called as progress("search", count)
+                                       while scientists are being expanded
+        graph (CollaborationGraph, optional): Data to search (default: the
+                                              current data_access graph)
     
     Returns:
         list or None: List of scientist IDs representing the path,
@@ -22,43 +39,323 @@ def shortest_path(source_id, target_id):
     if source_id == target_id:
         return [source_id]
     
-    # Get collaborators of source and target for debugging
-    source_collaborators = get_collaborators(source_id)
-    target_collaborators = get_collaborators(target_id)
+    # Searched as a whole even if the data is reloaded meanwhile
+    if graph is None:
+        graph = get_graph()
     
-    # Check if either scientist has no collaborators
-    if not source_collaborators:
-        print(f"Warning: Source scientist has no collaborators in dataset")
-    if not target_collaborators:
-        print(f"Warning: Target scientist has no collaborators in dataset")
+    with instrumentation.phase("shortest_path"):
+        # Answer repeated queries from the cache, which drops stale entries on reload
+        cache = path_cache
+        cache.validate(graph.version, graph.affected_since)
+        found, path = cache.get(source_id, target_id, graph, progress)
+        if found:
+            return path
+        
+        # Frontier sizes are only collected for the instrumentation
+        levels = [] if instrumentation.is_enabled() else None
+        path, visited_count = find_path(source_id, target_id, mode, progress, graph, levels)
+        if levels is not None:
+            _record_search(graph, source_id, target_id, mode, path, visited_count, levels)
+        cache.put(source_id, target_id, path, graph.version)
+    return path
+
+
+def _record_search(graph, source_id, target_id, mode, path, visited_count, levels):
+    """Report one uncached shortest path search to the instrumentation"""
+    instrumentation.observe_levels("search", levels, mode=mode)
+    instrumentation.observe("search_nodes_visited", visited_count, mode=mode)
+    if not graph.collaborators(source_id) or not graph.collaborators(target_id):
+        instrumentation.count("shortest_path_isolated_endpoints")
+    if path is None:
+        # Nothing visited means the component index ruled the pair out
+        instrumentation.count("shortest_path_no_path", reason="different_components" if visited_count == 0
+                              else "searched")
+    else:
+        instrumentation.observe("shortest_path_degrees", len(path) - 1)
+
+
+def all_shortest_paths(source_id, target_id, limit=None, graph=None):
+    """
+    Lazily enumerate every shortest path between two scientists
     
-    # Direct connection check (optimization)
-    if target_id in source_collaborators:
-        return [source_id, target_id]
+    Args:
+        source_id (str): ID of the source scientist
+        target_id (str): ID of the target scientist
+        limit (int, optional): Stop after this many paths (the k shortest)
+        graph (CollaborationGraph, optional): Data to search (default: the
+                                              current data_access graph)
+    
+    Yields:
+        list: Scientist IDs from source to target, in lexicographic order
+              of the IDs along the path; nothing if no path exists
+    """
+    if graph is None:
+        graph = get_graph()
+    components = graph.component_index
+    if components is not None and source_id != target_id and not components.connected(source_id, target_id):
+        return
+    
+    def labelled_collaborators(scientist_id):
+        return ((None, collaborator_id) for collaborator_id in graph.collaborators(scientist_id))
     
-    # Use BFS to find shortest path
-    visited = set([source_id])
-    queue = deque([(source_id, [source_id])])
+    paths = iter_shortest_paths(source_id, target_id, labelled_collaborators)
+    for hops in islice(paths, limit):
+        yield [source_id] + [scientist_id for _, scientist_id in hops]
+
+
+def degree_bounds(source_id, target_id, graph=None):
+    """
+    Bound the degrees of separation between two scientists without searching
+    
+    Args:
+        source_id (str): ID of the source scientist
+        target_id (str): ID of the target scientist
+        graph (CollaborationGraph, optional): Data to use (default: the
+                                              current data_access graph)
+    
+    Returns:
+        tuple or None: (lower, upper) from the landmark oracle, upper being
+                       None when no landmark reaches both; None when the
+                       scientists are not connected or no oracle is loaded
+    """
+    if graph is None:
+        graph = get_graph()
+    components = graph.component_index
+    if components is not None and source_id != target_id and not components.connected(source_id, target_id):
+        return None
+    landmarks = graph.landmark_index
+    if landmarks is None:
+        return None
+    return landmarks.bounds(source_id, target_id)
+
+
+def configure_cache(maxsize=DEFAULT_MAXSIZE, tree_maxsize=DEFAULT_TREE_MAXSIZE,
+                    hot_threshold=DEFAULT_HOT_THRESHOLD):
+    """
+    Replace the shortest_path cache with an empty one of the given sizes
+    
+    Args:
+        maxsize (int): Maximum number of cached paths, 0 disables caching
+        tree_maxsize (int): Maximum number of cached search trees of hot sources
+        hot_threshold (int): Queries from a source before its tree is cached
+    """
+    global path_cache
+    path_cache = PathCache(path_tree, maxsize, tree_maxsize, hot_threshold)
+
+
+def cache_stats():
+    """Get the hit/miss counters and sizes of the shortest_path cache"""
+    return path_cache.stats()
+
+
+def find_path(source_id, target_id, mode="bfs", progress=None, graph=None, levels=None):
+    """
+    Run the selected search strategy without printing diagnostics
+    
+    Args:
+        source_id (str): ID of the source scientist
+        target_id (str): ID of the target scientist
+        mode (str): One of SEARCH_MODES
+        progress (callable, optional): Called as progress("search", count)
+                                       while scientists are being expanded
+        graph (CollaborationGraph, optional): Data to search (default: the
+                                              current data_access graph)
+        levels (list, optional): Receives the size of every frontier expanded
+    
+    Returns:
+        tuple: (path, visited_count) where path is a list of scientist IDs
+               or None, and visited_count is the number of scientists reached
+    """
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode '{mode}'. Expected one of {SEARCH_MODES}")
+    if graph is None:
+        graph = get_graph()
     
-    visited_count = 1  # Counter for debugging
+    # Scientists in different components are never connected
+    components = graph.component_index
+    if components is not None and source_id != target_id and not components.connected(source_id, target_id):
+        return None, 0
     
-    while queue:
-        current_id, path = queue.popleft()
+    if mode == "landmark":
+        landmarks = graph.landmark_index
+        if landmarks is None:
+            raise ValueError("The landmark search mode requires data_access.load_landmarks() first")
+        return landmarks.search(source_id, target_id, progress, levels)
+    
+    if graph.compact is not None:
+        return _compact_search(graph.compact, source_id, target_id, mode, progress, levels)
+    if graph.layout == "bipartite":
+        return _bipartite_search(graph, source_id, target_id, mode, progress, levels)
+    if mode == "bfs":
+        return _bfs(graph, source_id, target_id, progress, levels)
+    return _bidirectional_bfs(graph, source_id, target_id, progress, levels)
+
+
+def paths_from_source(source_id, target_ids, graph=None):
+    """
+    Find the shortest paths from one scientist to many, with a single
+    breadth-first search that stops once every target has been reached
+    
+    Args:
+        source_id (str): ID of the source scientist
+        target_ids (iterable): IDs of the target scientists
+        graph (CollaborationGraph, optional): Data to search (default: the
+                                              current data_access graph)
+    
+    Returns:
+        dict: target_id -> list of scientist IDs, or None if no path exists
+    """
+    if graph is None:
+        graph = get_graph()
+    target_ids = set(target_ids)
+    paths = {}
+    
+    # Only search for the targets in the source's component
+    components = graph.component_index
+    if components is not None:
+        for target_id in target_ids:
+            if target_id != source_id and not components.connected(source_id, target_id):
+                paths[target_id] = None
+        target_ids.difference_update(paths)
+        if not target_ids:
+            return paths
+    
+    compact = graph.compact
+    if compact is not None:
+        source = compact.index.get(source_id)
+        if source is None:
+            paths.update((target_id, None) for target_id in target_ids)
+            return paths
+        goals = {compact.index[target_id] for target_id in target_ids if target_id in compact.index}
+        parents, _ = dense_bfs_parents_multi(source, goals, compact.offsets, compact.targets)
+        for target_id in target_ids:
+            target = compact.index.get(target_id)
+            if target is None or parents[target] < 0:
+                paths[target_id] = None
+            else:
+                paths[target_id] = [compact.ids[i] for i in dense_path_from_parents(parents, target)]
+        return paths
+    
+    if graph.layout == "bipartite":
+        parents = bipartite_bfs_parents_multi(source_id, target_ids, graph.papers_of, graph.authors_of)
+        paths.update((target_id, [source_id] + [scientist_id for _, scientist_id
+                                                in labelled_path_from_parents(parents, target_id)]
+                      if target_id in parents else None)
+                     for target_id in target_ids)
+        return paths
+    
+    parents = bfs_parents_multi(source_id, target_ids, graph.collaborators)
+    paths.update((target_id, path_from_parents(parents, target_id) if target_id in parents else None)
+                 for target_id in target_ids)
+    return paths
+
+
+def path_tree(source_id, graph=None, progress=None):
+    """
+    Search the whole component of a scientist once
+    
+    Args:
+        source_id (str): ID of the source scientist
+        graph (CollaborationGraph, optional): Data to search (default: the
+                                              current data_access graph)
+        progress (callable, optional): Called as progress("search", count)
+                                       while scientists are being expanded
+    
+    Returns:
+        callable: target_id -> list of scientist IDs from source_id, or None
+                  if no path exists
+    """
+    if graph is None:
+        graph = get_graph()
+    compact = graph.compact
+    if compact is not None:
+        source = compact.index.get(source_id)
+        if source is None:
+            return lambda target_id: None
+        parents, _, _ = dense_bfs_parents(source, -1, compact.offsets, compact.targets, progress)
+        
+        def dense_lookup(target_id):
+            target = compact.index.get(target_id)
+            if target is None or parents[target] < 0:
+                return None
+            return [compact.ids[i] for i in dense_path_from_parents(parents, target)]
+        
+        return dense_lookup
+    
+    if graph.layout == "bipartite":
+        parents, _ = bipartite_bfs_parents(source_id, None, reporting_neighbors(graph.papers_of, progress),
+                                           graph.authors_of)
+        
+        def bipartite_lookup(target_id):
+            if target_id not in parents:
+                return None
+            return [source_id] + [scientist_id for _, scientist_id in labelled_path_from_parents(parents, target_id)]
         
-        # Get all collaborators of the current scientist
-        for collaborator_id in get_collaborators(current_id):
-            if collaborator_id == target_id:
-                # Found the target
-                return path + [collaborator_id]
-            
-            if collaborator_id not in visited:
-                visited.add(collaborator_id)
-                visited_count += 1
-                queue.append((collaborator_id, path + [collaborator_id]))
-    
-    # No path found - include debugging information
-    print(f"Debug: Searched through {visited_count} scientists but found no path")
-    return None
+        return bipartite_lookup
+    
+    parents, _ = bfs_parents(source_id, None, reporting_neighbors(graph.collaborators, progress))
+    return lambda target_id: path_from_parents(parents, target_id) if target_id in parents else None
+
+
+def _bfs(graph, source_id, target_id, progress=None, levels=None):
+    """One-sided breadth-first search from the source"""
+    # Direct connection check (optimization)
+    if source_id != target_id and target_id in graph.collaborators(source_id):
+        if levels is not None:
+            levels.append(1)
+        return [source_id, target_id], 2
+    
+    parents, found = bfs_parents(source_id, target_id, reporting_neighbors(graph.collaborators, progress),
+                                 levels)
+    if not found:
+        return None, len(parents)
+    return path_from_parents(parents, target_id), len(parents)
+
+
+def _bidirectional_bfs(graph, source_id, target_id, progress=None, levels=None):
+    """Breadth-first search grown from both the source and the target"""
+    return bidirectional_search(source_id, target_id, reporting_neighbors(graph.collaborators, progress),
+                                levels=levels)
+
+
+def _bipartite_search(graph, source_id, target_id, mode, progress=None, levels=None):
+    """Search through shared papers without materializing co-author cliques"""
+    # Papers are looked up once per expanded scientist
+    papers_of = reporting_neighbors(graph.papers_of, progress)
+    if mode == "bidirectional":
+        return bidirectional_search(source_id, target_id,
+                                    bipartite_neighbors(papers_of, graph.authors_of),
+                                    bipartite_neighbors(papers_of, graph.authors_of), levels)
+    
+    parents, found = bipartite_bfs_parents(source_id, target_id, papers_of, graph.authors_of, levels)
+    if not found:
+        return None, len(parents)
+    return [source_id] + [scientist_id for _, scientist_id in labelled_path_from_parents(parents, target_id)], len(parents)
+
+
+def _compact_search(graph, source_id, target_id, mode, progress=None, levels=None):
+    """Run a search on the integer-indexed CSR graph and map the path back to IDs"""
+    source = graph.index.get(source_id)
+    target = graph.index.get(target_id)
+    if source is None or target is None:
+        return None, 0
+    
+    if mode == "bidirectional":
+        path, visited_count = bidirectional_search(source, target, reporting_neighbors(graph.neighbors, progress),
+                                                   levels=levels)
+    else:
+        parents, found, visited_count = dense_bfs_parents(source, target, graph.offsets, graph.targets,
+                                                          progress, levels)
+        path = dense_path_from_parents(parents, target) if found else None
+    
+    if path is None:
+        return None, visited_count
+    return [graph.ids[i] for i in path], visited_count
+
+
+# Cache shared by every shortest_path call
+path_cache = PathCache(path_tree)
+instrumentation.register_collector("path_cache", lambda: path_cache.stats())
 
 
 def print_path(path):
@@ -0,0 +1,602 @@
+"""
+Search Core Module - Breadth-first search primitives shared by the
+scientist network modules
+
+Searches record a single parent entry per visited node and the path is
+rebuilt only once the target has been reached, instead of copying a
+partial path for every enqueued node.
+"""
+
+from array import array
+from collections import deque
+
+# Nodes expanded between two progress reports
+PROGRESS_NODES = 1024
+
+
+def bfs_parents(source, target, neighbors, levels=None):
+    """
+    Breadth-first search recording one parent pointer per visited node
+    
+    Args:
+        source: Start node
+        target: Node to stop at (may be None to explore the whole component)
+        neighbors (callable): Returns an iterable of nodes adjacent to a node
+        levels (list, optional): Receives the size of every frontier expanded
+    
+    Returns:
+        tuple: (parents, found) where parents maps each visited node to its
+               parent (None for the source) and found tells if target was reached
+    """
+    parents = {source: None}
+    if source == target:
+        return parents, True
+    
+    frontier = [source]
+    while frontier:
+        if levels is not None:
+            levels.append(len(frontier))
+        next_frontier = []
+        for current in frontier:
+            for neighbor in neighbors(current):
+                if neighbor not in parents:
+                    parents[neighbor] = current
+                    if neighbor == target:
+                        return parents, True
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    
+    return parents, False
+
+
+def dense_bfs_parents(source, target, offsets, targets, progress=None, levels=None):
+    """
+    Breadth-first search over integer nodes stored as CSR arrays
+    
+    Parents are kept in a flat array instead of a dict, with -1 marking
+    unvisited nodes and the source pointing to itself.
+    
+    Args:
+        source (int): Start node index
+        target (int): Node index to stop at (may be -1 to explore the whole component)
+        offsets (array): CSR offsets, len(nodes) + 1 entries
+        targets (array): CSR neighbor indices
+        progress (callable, optional): Called as progress("search", expanded)
+                                       every PROGRESS_NODES expanded nodes
+        levels (list, optional): Receives the size of every frontier expanded
+    
+    Returns:
+        tuple: (parents, found, visited_count)
+    """
+    parents = array("i", [-1]) * (len(offsets) - 1)
+    parents[source] = source
+    if source == target:
+        return parents, True, 1
+    
+    visited_count = 1
+    expanded = 0
+    frontier = [source]
+    while frontier:
+        if levels is not None:
+            levels.append(len(frontier))
+        next_frontier = []
+        for current in frontier:
+            if progress is not None:
+                expanded += 1
+                if expanded % PROGRESS_NODES == 0:
+                    progress("search", expanded)
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if parents[neighbor] < 0:
+                    parents[neighbor] = current
+                    visited_count += 1
+                    if neighbor == target:
+                        return parents, True, visited_count
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    
+    return parents, False, visited_count
+
+
+def bfs_parents_multi(source, goals, neighbors):
+    """
+    Breadth-first search that stops once every goal node has been reached
+    
+    Args:
+        source: Start node
+        goals (set): Nodes to reach
+        neighbors (callable): Returns an iterable of nodes adjacent to a node
+    
+    Returns:
+        dict: Parent map as produced by bfs_parents; goals missing from it
+              are unreachable
+    """
+    parents = {source: None}
+    remaining = set(goals)
+    remaining.discard(source)
+    
+    queue = deque([source])
+    while queue and remaining:
+        current = queue.popleft()
+        for neighbor in neighbors(current):
+            if neighbor not in parents:
+                parents[neighbor] = current
+                queue.append(neighbor)
+                if neighbor in remaining:
+                    remaining.discard(neighbor)
+                    if not remaining:
+                        break
+    
+    return parents
+
+
+def dense_bfs_parents_multi(source, goals, offsets, targets):
+    """
+    CSR counterpart of bfs_parents_multi
+    
+    Args:
+        source (int): Start node index
+        goals (set): Node indices to reach
+        offsets (array): CSR offsets, len(nodes) + 1 entries
+        targets (array): CSR neighbor indices
+    
+    Returns:
+        tuple: (parents, visited_count) with the parent array format of
+               dense_bfs_parents
+    """
+    parents = array("i", [-1]) * (len(offsets) - 1)
+    parents[source] = source
+    remaining = set(goals)
+    remaining.discard(source)
+    
+    visited_count = 1
+    queue = deque([source])
+    while queue and remaining:
+        current = queue.popleft()
+        for neighbor in targets[offsets[current]:offsets[current + 1]]:
+            if parents[neighbor] < 0:
+                parents[neighbor] = current
+                visited_count += 1
+                queue.append(neighbor)
+                if neighbor in remaining:
+                    remaining.discard(neighbor)
+                    if not remaining:
+                        break
+    
+    return parents, visited_count
+
+
+def dense_bfs_counts(source, offsets, targets):
+    """
+    Breadth-first search over CSR arrays counting the shortest paths to
+    every reached node, as needed for Brandes' dependency accumulation
+    
+    Args:
+        source (int): Start node index
+        offsets (array): CSR offsets, len(nodes) + 1 entries
+        targets (array): CSR neighbor indices
+    
+    Returns:
+        tuple: (order, depths, counts) where order lists the reached nodes by
+               non-decreasing depth starting with the source, depths holds
+               each node's hop count (-1 when unreached) and counts the number
+               of shortest paths from the source (as floats, which do not
+               overflow on large graphs)
+    """
+    node_count = len(offsets) - 1
+    depths = array("i", [-1]) * node_count
+    counts = array("d", [0.0]) * node_count
+    depths[source] = 0
+    counts[source] = 1.0
+    
+    order = [source]
+    for current in order:
+        next_depth = depths[current] + 1
+        current_count = counts[current]
+        for neighbor in targets[offsets[current]:offsets[current + 1]]:
+            depth = depths[neighbor]
+            if depth < 0:
+                depths[neighbor] = next_depth
+                counts[neighbor] = current_count
+                order.append(neighbor)
+            elif depth == next_depth:
+                counts[neighbor] += current_count
+    
+    return order, depths, counts
+
+
+def labelled_bfs_parents(source, target, neighbors):
+    """
+    Breadth-first search over labelled edges, such as (paper_id, scientist_id)
+    
+    Args:
+        source: Start node
+        target: Node to stop at (may be None to explore the whole component)
+        neighbors (callable): Returns an iterable of (label, node) pairs
+    
+    Returns:
+        tuple: (parents, found) where parents maps each visited node to a
+               (parent, label) pair (None for the source)
+    """
+    parents = {source: None}
+    if source == target:
+        return parents, True
+    
+    queue = deque([source])
+    while queue:
+        current = queue.popleft()
+        for label, neighbor in neighbors(current):
+            if neighbor not in parents:
+                parents[neighbor] = (current, label)
+                if neighbor == target:
+                    return parents, True
+                queue.append(neighbor)
+    
+    return parents, False
+
+
+def bipartite_bfs_parents(source, target, papers_of, authors_of, levels=None):
+    """
+    Breadth-first search over the scientist-paper bipartite graph
+    
+    Co-authors are reached through their shared papers and every paper is
+    expanded at most once, so a paper with k authors costs O(k) instead of
+    the O(k^2) of its co-authorship clique.
+    
+    Args:
+        source: Start scientist
+        target: Scientist to stop at (may be None to explore the whole component)
+        papers_of (callable): Returns the papers of a scientist
+        authors_of (callable): Returns the authors of a paper
+        levels (list, optional): Receives the number of scientists in every
+                                 frontier expanded
+    
+    Returns:
+        tuple: (parents, found) with the same (parent, paper) entries as
+               labelled_bfs_parents
+    """
+    parents = {source: None}
+    if source == target:
+        return parents, True
+    
+    expanded = set()
+    frontier = [source]
+    while frontier:
+        if levels is not None:
+            levels.append(len(frontier))
+        next_frontier = []
+        for current in frontier:
+            for paper in papers_of(current):
+                if paper in expanded:
+                    continue
+                expanded.add(paper)
+                for author in authors_of(paper):
+                    if author not in parents:
+                        parents[author] = (current, paper)
+                        if author == target:
+                            return parents, True
+                        next_frontier.append(author)
+        frontier = next_frontier
+    
+    return parents, False
+
+
+def bipartite_bfs_parents_multi(source, goals, papers_of, authors_of):
+    """
+    Bipartite counterpart of bfs_parents_multi
+    
+    Args:
+        source: Start scientist
+        goals (set): Scientists to reach
+        papers_of (callable): Returns the papers of a scientist
+        authors_of (callable): Returns the authors of a paper
+    
+    Returns:
+        dict: Parent map with the (parent, paper) entries of labelled_bfs_parents
+    """
+    parents = {source: None}
+    remaining = set(goals)
+    remaining.discard(source)
+    
+    expanded = set()
+    queue = deque([source])
+    while queue and remaining:
+        current = queue.popleft()
+        for paper in papers_of(current):
+            if paper in expanded:
+                continue
+            expanded.add(paper)
+            for author in authors_of(paper):
+                if author not in parents:
+                    parents[author] = (current, paper)
+                    queue.append(author)
+                    remaining.discard(author)
+            if not remaining:
+                break
+    
+    return parents
+
+
+def bipartite_neighbors(papers_of, authors_of):
+    """
+    Build a co-author neighbor function that expands every paper only once
+    
+    Each returned function keeps its own set of expanded papers, so it must
+    be used by a single search (or a single side of a bidirectional search).
+    
+    Args:
+        papers_of (callable): Returns the papers of a scientist
+        authors_of (callable): Returns the authors of a paper
+    
+    Returns:
+        callable: scientist -> iterator of co-authors from unexpanded papers
+    """
+    expanded = set()
+    
+    def neighbors(scientist):
+        for paper in papers_of(scientist):
+            if paper not in expanded:
+                expanded.add(paper)
+                yield from authors_of(paper)
+    
+    return neighbors
+
+
+def reporting_neighbors(neighbors, progress):
+    """
+    Wrap a neighbor function so that expanding nodes reports progress
+    
+    Args:
+        neighbors (callable): Neighbor function of a search
+        progress (callable, optional): Called as progress("search", expanded)
+                                       every PROGRESS_NODES calls
+    
+    Returns:
+        callable: neighbors itself when progress is None, otherwise a
+                  counting wrapper (one per search)
+    """
+    if progress is None:
+        return neighbors
+    expanded = 0
+    
+    def counted(node):
+        nonlocal expanded
+        expanded += 1
+        if expanded % PROGRESS_NODES == 0:
+            progress("search", expanded)
+        return neighbors(node)
+    
+    return counted
+
+
+def iter_shortest_paths(source, target, neighbors):
+    """
+    Lazily enumerate every shortest path between two nodes of an undirected
+    graph with labelled edges
+    
+    A breadth-first search from the source stops at the target's level, a
+    backward pass from the target keeps only the nodes of the shortest-path
+    DAG, and a depth-first walk over that DAG yields one path at a time.
+    Successors are visited in (node, label) order, so paths come out in a
+    deterministic lexicographic order and only the current path is held in
+    memory besides the DAG itself.
+    
+    Args:
+        source: Start node
+        target: Goal node
+        neighbors (callable): Returns an iterable of (label, node) pairs
+    
+    Yields:
+        list: (label, node) pairs for every hop, excluding the source; a
+              single empty list when source == target, nothing when the
+              target is unreachable
+    """
+    if source == target:
+        yield []
+        return
+    
+    # Depth of every node up to the target's level
+    depth = {source: 0}
+    frontier = [source]
+    found = False
+    while frontier and not found:
+        next_frontier = []
+        for current in frontier:
+            next_depth = depth[current] + 1
+            for _, neighbor in neighbors(current):
+                if neighbor not in depth:
+                    depth[neighbor] = next_depth
+                    next_frontier.append(neighbor)
+                    if neighbor == target:
+                        found = True
+                        break
+            if found:
+                break
+        frontier = next_frontier
+    if not found:
+        return
+    
+    # Nodes lying on at least one shortest path
+    on_path = {target}
+    frontier = {target}
+    while frontier:
+        previous = set()
+        for current in frontier:
+            parent_depth = depth[current] - 1
+            for _, neighbor in neighbors(current):
+                if depth.get(neighbor) == parent_depth and neighbor not in on_path:
+                    previous.add(neighbor)
+        on_path.update(previous)
+        frontier = previous
+    
+    successors = {}
+    
+    def dag_successors(node):
+        steps = successors.get(node)
+        if steps is None:
+            child_depth = depth[node] + 1
+            steps = sorted({(label, neighbor) for label, neighbor in neighbors(node)
+                            if neighbor in on_path and depth[neighbor] == child_depth},
+                           key=lambda step: (step[1], step[0]))
+            successors[node] = steps
+        return steps
+    
+    path = []
+    stack = [iter(dag_successors(source))]
+    while stack:
+        step = next(stack[-1], None)
+        if step is None:
+            stack.pop()
+            if path:
+                path.pop()
+            continue
+        if step[1] == target:
+            yield path + [step]
+            continue
+        path.append(step)
+        stack.append(iter(dag_successors(step[1])))
+
+
+def path_from_parents(parents, target):
+    """
+    Rebuild the node path from the search source to target
+    
+    Args:
+        parents (dict): Parent map produced by bfs_parents
+        target: A node present in parents
+    
+    Returns:
+        list: Nodes from source to target, both included
+    """
+    path = []
+    node = target
+    while node is not None:
+        path.append(node)
+        node = parents[node]
+    path.reverse()
+    return path
+
+
+def dense_path_from_parents(parents, target):
+    """
+    Rebuild the node path from a parent array produced by dense_bfs_parents
+    
+    Args:
+        parents (array): Parent array, the source being its own parent
+        target (int): A visited node index
+    
+    Returns:
+        list: Node indices from source to target, both included
+    """
+    path = [target]
+    node = target
+    while parents[node] != node:
+        node = parents[node]
+        path.append(node)
+    path.reverse()
+    return path
+
+
+def labelled_path_from_parents(parents, target):
+    """
+    Rebuild the labelled hops from the search source to target
+    
+    Args:
+        parents (dict): Parent map produced by labelled_bfs_parents
+        target: A node present in parents
+    
+    Returns:
+        list: (label, node) pairs for every hop, excluding the source
+    """
+    path = []
+    node = target
+    entry = parents[node]
+    while entry is not None:
+        parent, label = entry
+        path.append((label, node))
+        node = parent
+        entry = parents[node]
+    path.reverse()
+    return path
+
+
+def bidirectional_search(source, target, neighbors, backward_neighbors=None, levels=None):
+    """
+    Breadth-first search grown from both ends, always expanding one full
+    level of whichever frontier is currently smaller
+    
+    Args:
+        source: Start node
+        target: Goal node
+        neighbors (callable): Returns an iterable of nodes adjacent to a node
+                              (the graph must be undirected)
+        backward_neighbors (callable, optional): Neighbor function for the
+                              side grown from the target; defaults to neighbors
+        levels (list, optional): Receives the size of every frontier expanded,
+                                 from either side
+    
+    Returns:
+        tuple: (path, visited_count) where path is a list of nodes or None
+    """
+    if source == target:
+        return [source], 1
+    
+    forward_parents = {source: None}
+    backward_parents = {target: None}
+    forward_depth = {source: 0}
+    backward_depth = {target: 0}
+    forward_frontier = [source]
+    backward_frontier = [target]
+    if backward_neighbors is None:
+        backward_neighbors = neighbors
+    
+    while forward_frontier and backward_frontier:
+        # Expand the smaller side; ties go to the forward search
+        if len(forward_frontier) <= len(backward_frontier):
+            frontier, parents, depth = forward_frontier, forward_parents, forward_depth
+            other_parents, other_depth = backward_parents, backward_depth
+            expand = neighbors
+        else:
+            frontier, parents, depth = backward_frontier, backward_parents, backward_depth
+            other_parents, other_depth = forward_parents, forward_depth
+            expand = backward_neighbors
+        if levels is not None:
+            levels.append(len(frontier))
+        
+        next_frontier = []
+        best_length = None
+        meeting = None
+        
+        # Finish the whole level so the shortest meeting point is kept
+        for current in frontier:
+            next_depth = depth[current] + 1
+            for neighbor in expand(current):
+                if neighbor in other_parents:
+                    length = next_depth + other_depth[neighbor]
+                    if best_length is None or length < best_length:
+                        best_length = length
+                        meeting = (current, neighbor)
+                if neighbor not in parents:
+                    parents[neighbor] = current
+                    depth[neighbor] = next_depth
+                    next_frontier.append(neighbor)
+        
+        if meeting is not None:
+            visited_count = len(forward_parents) + len(backward_parents)
+            # Orient the meeting edge from the source side to the target side
+            if parents is forward_parents:
+                near, far = meeting
+            else:
+                far, near = meeting
+            path = path_from_parents(forward_parents, near)
+            node = far
+            while node is not None:
+                path.append(node)
+                node = backward_parents[node]
+            return path, visited_count
+        
+        if frontier is forward_frontier:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+    
+    return None, len(forward_parents) + len(backward_parents)
@@ -0,0 +1,156 @@
+"""
+Search Index Module - Substring search over scientist names in sublinear time
+
+Queries of three or more characters are answered from a character-trigram
+inverted index: only names containing the query's rarest trigram are
+checked. Shorter queries use a small depth-two trie over the name
+suffixes, stored flattened as a dict keyed by its one- and two-character
+paths. Postings hold entry numbers in insertion order, so results come
+back in the same stable order as a linear scan.
+"""
+
+from array import array
+from collections import defaultdict
+
+TRIGRAM = 3
+TRIE_DEPTH = TRIGRAM - 1
+
+
+class NameIndex:
+    """Trigram index plus a short-query suffix trie over lowercased names"""
+    
+    __slots__ = ("names", "ids", "trigrams", "short")
+    
+    def __init__(self, entries):
+        """
+        Args:
+            entries (iterable): (lowercased name, scientist_id) pairs in the
+                                order results should be returned
+        """
+        self.names = []
+        self.ids = []
+        # trigram -> entry numbers
+        trigrams = defaultdict(list)
+        # Depth-2 trie over name suffixes, flattened: 1 or 2 chars -> entry numbers
+        short = defaultdict(list)
+        
+        for entry, (name, scientist_id) in enumerate(entries):
+            self.names.append(name)
+            self.ids.append(scientist_id)
+            for gram in _trigrams(name):
+                trigrams[gram].append(entry)
+            for prefix in _short_prefixes(name):
+                short[prefix].append(entry)
+        
+        # Compact the postings once they are complete
+        self.trigrams = {gram: array("i", postings) for gram, postings in trigrams.items()}
+        self.short = {prefix: array("i", postings) for prefix, postings in short.items()}
+    
+    def add(self, name, scientist_id):
+        """
+        Append one entry to the index
+        
+        Args:
+            name (str): Lowercased name
+            scientist_id (str): ID returned for matches
+        """
+        entry = len(self.names)
+        self.names.append(name)
+        self.ids.append(scientist_id)
+        for gram in _trigrams(name):
+            self.trigrams.setdefault(gram, array("i")).append(entry)
+        for prefix in _short_prefixes(name):
+            self.short.setdefault(prefix, array("i")).append(entry)
+    
+    def extended(self, entries):
+        """
+        Return a new index with entries appended, leaving this one unchanged
+        
+        Postings untouched by the new names are shared with this index.
+        
+        Args:
+            entries (iterable): (lowercased name, scientist_id) pairs
+        
+        Returns:
+            NameIndex: The extended index
+        """
+        index = NameIndex(())
+        index.names = list(self.names)
+        index.ids = list(self.ids)
+        index.trigrams = dict(self.trigrams)
+        index.short = dict(self.short)
+        # Copy a posting list the first time it grows
+        copied_trigrams = set()
+        copied_short = set()
+        for name, scientist_id in entries:
+            for gram in _trigrams(name) - copied_trigrams:
+                copied_trigrams.add(gram)
+                index.trigrams[gram] = array("i", index.trigrams.get(gram, ()))
+            for prefix in _short_prefixes(name) - copied_short:
+                copied_short.add(prefix)
+                index.short[prefix] = array("i", index.short.get(prefix, ()))
+            index.add(name, scientist_id)
+        return index
+    
+    def __len__(self):
+        return len(self.names)
+    
+    def search(self, query, limit=None):
+        """
+        Find the entries whose name contains query
+        
+        Args:
+            query (str): Lowercased substring to look for
+            limit (int, optional): Maximum number of results
+        
+        Returns:
+            list: Matching scientist IDs in insertion order
+        """
+        if limit is not None and limit <= 0:
+            return []
+        
+        if not query:
+            candidates = range(len(self.names))
+            verify = False
+        elif len(query) <= TRIE_DEPTH:
+            candidates = self._trie_postings(query)
+            verify = False
+        else:
+            candidates = self._rarest_trigram_postings(query)
+            verify = True
+        
+        matches = []
+        names = self.names
+        ids = self.ids
+        for entry in candidates:
+            if verify and query not in names[entry]:
+                continue
+            matches.append(ids[entry])
+            if limit is not None and len(matches) >= limit:
+                break
+        return matches
+    
+    def _trie_postings(self, query):
+        """Postings of the trie node for a query of at most TRIE_DEPTH characters"""
+        return self.short.get(query, ())
+    
+    def _rarest_trigram_postings(self, query):
+        """Postings of the query trigram with the fewest entries, or () if one is absent"""
+        best = None
+        for i in range(len(query) - TRIGRAM + 1):
+            postings = self.trigrams.get(query[i:i + TRIGRAM])
+            if postings is None:
+                return ()
+            if best is None or len(postings) < len(best):
+                best = postings
+        return best
+
+
+def _trigrams(name):
+    """Distinct trigrams of a name"""
+    return {name[i:i + TRIGRAM] for i in range(len(name) - TRIGRAM + 1)}
+
+
+def _short_prefixes(name):
+    """Distinct substrings of one and two characters (trie paths of every suffix)"""
+    return set(name) | {name[i:i + TRIE_DEPTH] for i in range(len(name) - TRIE_DEPTH + 1)}
@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+Service Module - Long-lived HTTP/JSON query service over the loaded data
+
+The data is loaded once through data_access.load_data and served over a
+small asyncio HTTP/1.1 server (keep-alive, JSON bodies):
+
+    GET  /search?q=NAME&limit=N          scientists whose name contains NAME
+    GET  /path?source=A&target=B&mode=M  shortest path between two scientists
+                                         given by ID or name
+    POST /batch-path                     {"queries": [[source, target], ...]}
+    POST /reload                         apply rows appended to the CSV files
+    GET  /metrics                        request counts and latency per endpoint
+                                         (?format=prometheus for the load and
+                                         search instrumentation, see --instrument)
+    GET  /health                         liveness and data version
+
+Searches run in an executor so the event loop keeps accepting requests:
+threads by default, or processes forked after loading (--processes) so
+pure-Python searches use several CPUs. Forked workers share the graph
+copy-on-write and are replaced after a reload.
+
+Usage:
+    python service.py DATA_DIR [--port 8080] [--workers 4] [--processes]
+"""
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from urllib.parse import urlsplit, parse_qsl
+from data_access import load_data, update_data, load_landmarks, get_graph, LAYOUTS, LOADERS
+from scientists_network import shortest_path, configure_cache, SEARCH_MODES
+from path_cache import DEFAULT_MAXSIZE
+from batch import resolve_scientist, run_batch
+from background import Cancelled
+import instrumentation
+
+DEFAULT_PORT = 8080
+DEFAULT_WORKERS = 4
+DEFAULT_LIMIT = 20
+DEFAULT_TIMEOUT = 30.0
+
+# Largest accepted request head and body, and batch size
+MAX_HEADER_BYTES = 1 << 16
+MAX_BODY_BYTES = 1 << 24
+MAX_BATCH_QUERIES = 100000
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf"))
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 504: "Gateway Timeout"}
+
+
+class HTTPError(Exception):
+    """Raised by handlers to answer with an error status and message"""
+    
+    def __init__(self, status, message):
+        # Both in args so the error survives pickling from a worker process
+        super().__init__(status, message)
+        self.status = status
+        self.message = message
+
+
+class LatencyMetrics:
+    """Request counts, status codes and latency histograms per endpoint"""
+    
+    __slots__ = ("started", "endpoints")
+    
+    def __init__(self):
+        self.started = time.time()
+        # endpoint -> {"count", "errors", "statuses", "buckets", "sum", "max"}
+        self.endpoints = {}
+    
+    def observe(self, endpoint, status, seconds):
+        """
+        Record one answered request
+        
+        Args:
+            endpoint (str): Route path, or "other" for unknown routes
+            status (int): HTTP status code sent
+            seconds (float): Time from reading the request to sending the answer
+        """
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = self.endpoints[endpoint] = {"count": 0, "errors": 0, "statuses": {},
+                                                "buckets": [0] * len(LATENCY_BUCKETS_MS), "sum": 0.0, "max": 0.0}
+        stats["count"] += 1
+        if status >= 500:
+            stats["errors"] += 1
+        stats["statuses"][status] = stats["statuses"].get(status, 0) + 1
+        milliseconds = seconds * 1000
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if milliseconds <= bound:
+                stats["buckets"][i] += 1
+                break
+        stats["sum"] += milliseconds
+        if milliseconds > stats["max"]:
+            stats["max"] = milliseconds
+    
+    def summary(self):
+        """
+        Returns:
+            dict: Uptime and, per endpoint, the request count, server errors,
+                  status counts, mean/max latency and p50/p95/p99 bucket bounds
+                  in milliseconds
+        """
+        endpoints = {}
+        for endpoint, stats in sorted(self.endpoints.items()):
+            endpoints[endpoint] = {
+                "count": stats["count"],
+                "errors": stats["errors"],
+                "statuses": {str(status): count for status, count in sorted(stats["statuses"].items())},
+                "mean_ms": round(stats["sum"] / stats["count"], 3),
+                "max_ms": round(stats["max"], 3),
+                "p50_ms": _bucket_quantile(stats, 0.50),
+                "p95_ms": _bucket_quantile(stats, 0.95),
+                "p99_ms": _bucket_quantile(stats, 0.99),
+            }
+        return {"uptime_s": round(time.time() - self.started, 1), "endpoints": endpoints}
+
+
+def _bucket_quantile(stats, quantile):
+    """Upper bound of the histogram bucket holding a quantile, capped at the slowest request"""
+    rank = quantile * stats["count"]
+    seen = 0
+    for bound, count in zip(LATENCY_BUCKETS_MS, stats["buckets"]):
+        seen += count
+        if seen >= rank and count:
+            return round(min(bound, stats["max"]), 3)
+    return round(stats["max"], 3)
+
+
+def search_request(query, limit):
+    """Executor job: name search on the current graph"""
+    graph = get_graph()
+    return {"query": query,
+            "matches": [{"id": scientist_id, "name": name}
+                        for scientist_id, name in graph.search_scientists(query, limit)]}
+
+
+def path_request(source, target, mode, timeout):
+    """Executor job: shortest path on the current graph, abandoned after timeout seconds"""
+    graph = get_graph()
+    source_id = resolve_scientist(source, graph)
+    if source_id is None:
+        raise HTTPError(404, f"Unknown source scientist '{source}'")
+    target_id = resolve_scientist(target, graph)
+    if target_id is None:
+        raise HTTPError(404, f"Unknown target scientist '{target}'")
+    
+    deadline = time.monotonic() + timeout
+    
+    def check_deadline(stage, count):
+        if time.monotonic() > deadline:
+            raise Cancelled()
+    
+    # The shared path cache also builds the trees of hot sources under the deadline
+    try:
+        path = shortest_path(source_id, target_id, mode, check_deadline, graph)
+    except Cancelled:
+        raise HTTPError(504, f"Search did not finish within {timeout:g} seconds")
+    
+    answer = {"source": {"id": source_id, "name": graph.scientist_name(source_id)},
+              "target": {"id": target_id, "name": graph.scientist_name(target_id)},
+              "status": "no_path" if path is None else "ok", "degrees": None, "path": None, "hops": None}
+    if path is not None:
+        answer["degrees"] = len(path) - 1
+        answer["path"] = path
+        answer["hops"] = graph.path_info(path)
+    return answer
+
+
+def batch_request(queries):
+    """Executor job: answer a batch of (source, target) queries on the current graph"""
+    results = run_batch(queries, graph=get_graph())
+    return {"results": results}
+
+
+class QueryService:
+    """Routes HTTP requests to executor jobs and records their latency"""
+    
+    __slots__ = ("executor", "reload_executor", "processes", "workers", "timeout", "metrics", "routes")
+    
+    def __init__(self, workers=DEFAULT_WORKERS, processes=False, timeout=DEFAULT_TIMEOUT):
+        """
+        Args:
+            workers (int): Threads or processes running searches
+            processes (bool): Use processes forked from the loaded service
+                              (requires the "fork" start method)
+            timeout (float): Seconds after which a single path search is abandoned
+        """
+        self.workers = workers
+        self.processes = processes
+        self.timeout = timeout
+        self.executor = self._new_executor()
+        # Reloads run one at a time, apart from the searches
+        self.reload_executor = ThreadPoolExecutor(1)
+        self.metrics = LatencyMetrics()
+        self.routes = {
+            "/search": ("GET", self.search),
+            "/path": ("GET", self.path),
+            "/batch-path": ("POST", self.batch_path),
+            "/reload": ("POST", self.reload),
+            "/metrics": ("GET", self.get_metrics),
+            "/health": ("GET", self.health),
+        }
+    
+    def _new_executor(self):
+        """Create the search executor; forked workers inherit the current graph"""
+        if self.processes:
+            return ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("fork"))
+        return ThreadPoolExecutor(self.workers, thread_name_prefix="search")
+    
+    async def run(self, func, *args):
+        """Run a job in the search executor"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+    
+    async def search(self, params, body):
+        query = params.get("q", "")
+        limit = _int_param(params, "limit", DEFAULT_LIMIT)
+        return await self.run(search_request, query, limit if limit > 0 else None)
+    
+    async def path(self, params, body):
+        source = params.get("source")
+        target = params.get("target")
+        if not source or not target:
+            raise HTTPError(400, "Both 'source' and 'target' are required")
+        mode = params.get("mode", "bfs")
+        if mode not in SEARCH_MODES:
+            raise HTTPError(400, f"Unknown search mode '{mode}'. Expected one of {SEARCH_MODES}")
+        if mode == "landmark" and get_graph().landmark_index is None:
+            raise HTTPError(400, "The landmark search mode needs the service started with --landmarks")
+        return await self.run(path_request, source, target, mode, self.timeout)
+    
+    async def batch_path(self, params, body):
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError as e:
+            raise HTTPError(400, f"Invalid JSON body: {str(e)}")
+        queries = request.get("queries") if isinstance(request, dict) else request
+        if not isinstance(queries, list):
+            raise HTTPError(400, "Expected {\"queries\": [[source, target], ...]}")
+        if len(queries) > MAX_BATCH_QUERIES:
+            raise HTTPError(413, f"At most {MAX_BATCH_QUERIES} queries per batch")
+        pairs = []
+        for query in queries:
+            if isinstance(query, dict):
+                query = (query.get("source"), query.get("target"))
+            if not isinstance(query, (list, tuple)) or len(query) != 2 or not all(isinstance(value, str)
+                                                                                 for value in query):
+                raise HTTPError(400, f"Invalid query {json.dumps(query)}: expected [source, target]")
+            pairs.append((query[0].strip(), query[1].strip()))
+        return await self.run(batch_request, pairs)
+    
+    async def reload(self, params, body):
+        loop = asyncio.get_running_loop()
+        success, message = await loop.run_in_executor(self.reload_executor, update_data)
+        if not success:
+            raise HTTPError(500, message)
+        if self.processes:
+            # Forked workers still hold the previous graph
+            old_executor = self.executor
+            self.executor = self._new_executor()
+            old_executor.shutdown(wait=False)
+        return {"message": message, "version": get_graph().version}
+    
+    async def get_metrics(self, params, body):
+        if params.get("format") == "prometheus":
+            return instrumentation.to_prometheus()
+        summary = self.metrics.summary()
+        if instrumentation.is_enabled():
+            summary["instrumentation"] = instrumentation.snapshot()
+        return summary
+    
+    async def health(self, params, body):
+        graph = get_graph()
+        return {"status": "ok", "scientists": len(graph), "layout": graph.layout, "version": graph.version}
+    
+    async def dispatch(self, method, target, body):
+        """
+        Answer one request
+        
+        Returns:
+            tuple: (endpoint, status, JSON-serializable answer)
+        """
+        url = urlsplit(target)
+        route = self.routes.get(url.path)
+        if route is None:
+            return "other", 404, {"error": f"No endpoint '{url.path}'"}
+        expected_method, handler = route
+        if method != expected_method:
+            return url.path, 405, {"error": f"Use {expected_method} for '{url.path}'"}
+        try:
+            return url.path, 200, await handler(dict(parse_qsl(url.query, keep_blank_values=True)), body)
+        except HTTPError as e:
+            return url.path, e.status, {"error": e.message}
+        except Exception as e:
+            return url.path, 500, {"error": f"{type(e).__name__}: {str(e)}"}
+    
+    async def handle_connection(self, reader, writer):
+        """Serve the requests of one (keep-alive) connection"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break  # Client closed the connection
+                except asyncio.LimitOverrunError:
+                    await _send(writer, 413, {"error": "Request head too large"}, False)
+                    break
+                started = time.perf_counter()
+                
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = request_line.split(" ", 2)
+                except ValueError:
+                    await _send(writer, 400, {"error": "Malformed request line"}, False)
+                    break
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+                
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await _send(writer, 400, {"error": "Invalid Content-Length"}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await _send(writer, 413, {"error": "Request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+                
+                endpoint, status, answer = await self.dispatch(method.upper(), target, body)
+                await _send(writer, status, answer, keep_alive)
+                self.metrics.observe(endpoint, status, time.perf_counter() - started)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+    
+    def close(self):
+        """Stop the executors"""
+        self.executor.shutdown(wait=False)
+        self.reload_executor.shutdown(wait=False)
+
+
+async def _send(writer, status, answer, keep_alive):
+    """Write a JSON response, or a plain text one for a string answer"""
+    if isinstance(answer, str):
+        body = answer.encode("utf-8")
+        content_type = "text/plain; version=0.0.4; charset=utf-8"
+    else:
+        body = json.dumps(answer, ensure_ascii=False).encode("utf-8")
+        content_type = "application/json; charset=utf-8"
+    head = (f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode("latin-1") + body)
+    await writer.drain()
+
+
+def _int_param(params, name, default):
+    """Parse an integer query parameter"""
+    value = params.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise HTTPError(400, f"'{name}' must be an integer")
+
+
+async def serve(service, host, port, ready=None):
+    """
+    Run the HTTP server until cancelled
+    
+    Args:
+        service (QueryService): Request handler
+        host (str): Address to listen on
+        port (int): Port to listen on, 0 for any free port
+        ready (callable, optional): Called with the bound (host, port) once listening
+    """
+    server = await asyncio.start_server(service.handle_connection, host, port, limit=MAX_HEADER_BYTES)
+    if ready is not None:
+        ready(server.sockets[0].getsockname()[:2])
+    async with server:
+        await server.serve_forever()
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Serve shortest path queries over HTTP.")
+    parser.add_argument("data_directory", help="Directory containing scientists.csv, papers.csv and authors.csv")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument("--layout", choices=LAYOUTS, default="csr", help="In-memory graph layout (default: csr)")
+    parser.add_argument("--loader", choices=LOADERS, default="csv", help="CSV ingestion strategy (default: csv)")
+    parser.add_argument("--no-snapshot", action="store_true",
+                        help="Always parse the CSV files and do not write a binary snapshot")
+    parser.add_argument("--landmarks", type=int, default=0,
+                        help="Precompute this many landmarks to enable mode=landmark (default: off)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Threads (or processes) running searches (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--processes", action="store_true",
+                        help="Run searches in processes forked after loading instead of threads")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help=f"Seconds before a single path search is abandoned (default: {DEFAULT_TIMEOUT:g})")
+    parser.add_argument("--instrument", action="store_true",
+                        help="Collect load and search metrics, served on /metrics (searches run in "
+                             "--processes workers are not included)")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAXSIZE,
+                        help=f"Paths kept in the LRU cache, 0 to disable (default: {DEFAULT_MAXSIZE})")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    if args.instrument:
+        instrumentation.enable()
+    
+    print(f"Loading data from '{args.data_directory}'...")
+    success, message = load_data(args.data_directory, layout=args.layout, use_snapshot=not args.no_snapshot,
+                                 loader=args.loader)
+    if not success:
+        print(f"Error: {message}")
+        sys.exit(1)
+    print(message)
+    if args.landmarks > 0:
+        print(load_landmarks(args.landmarks, use_cache=not args.no_snapshot)[1])
+    
+    if args.processes and "fork" not in multiprocessing.get_all_start_methods():
+        print("Process workers need the 'fork' start method; using threads")
+        args.processes = False
+    configure_cache(args.cache_size)
+    service = QueryService(args.workers, args.processes, args.timeout)
+    
+    def ready(address):
+        print(f"Listening on http://{address[0]}:{address[1]}", flush=True)
+    
+    try:
+        asyncio.run(serve(service, args.host, args.port, ready))
+    except KeyboardInterrupt:
+        print("\nService stopped.")
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
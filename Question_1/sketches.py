@@ -0,0 +1,255 @@
+"""
+Sketches Module - Fixed-size approximate set summaries for streaming scans
+
+HyperLogLog estimates the number of distinct values seen in a few kilobytes,
+and a Bloom filter answers "seen before?" with no false negatives and a
+bounded false positive rate. Both keep the same size however many values
+are added, so files far larger than memory can be profiled in one pass.
+
+Values are hashed with Python's built-in hash(), spread with a 64-bit
+finalizer since ints hash to themselves. String hashes are salted per
+process (see PYTHONHASHSEED):
+sketches can only be compared or combined within one run, and estimates
+vary slightly from run to run.
+
+The add_many methods take a batch of values at once and use NumPy when it
+is installed, which is several times faster than adding them one by one.
+"""
+
+import math
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+DEFAULT_PRECISION = 14
+DEFAULT_ERROR_RATE = 0.01
+
+_MASK64 = (1 << 64) - 1
+_MASK32 = (1 << 32) - 1
+_MIX1 = 0xFF51AFD7ED558CCD
+_MIX2 = 0xC4CEB9FE1A85EC53
+
+# Smaller batches are added one by one
+_MIN_BATCH = 64
+
+
+class HyperLogLog:
+    """Distinct count estimator with a relative error of about 1.04 / sqrt(2 ** precision)"""
+    
+    __slots__ = ("precision", "registers")
+    
+    def __init__(self, precision=DEFAULT_PRECISION):
+        """
+        Args:
+            precision (int): log2 of the number of one-byte registers, 4 to 18
+                             (the default 14 uses 16 KiB for about 0.8% error)
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+    
+    def add(self, value):
+        """Add a hashable value"""
+        hashed = _mix(hash(value))
+        index = hashed >> (64 - self.precision)
+        # Rank: position of the first set bit among the remaining bits
+        rank = 65 - self.precision - (hashed & ((1 << (64 - self.precision)) - 1)).bit_length()
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+    
+    def add_many(self, values):
+        """Add every value of a list"""
+        if np is None or len(values) < _MIN_BATCH:
+            for value in values:
+                self.add(value)
+            return
+        hashed = _hash_array(values)
+        low_bits = 64 - self.precision
+        index = (hashed >> np.uint64(low_bits)).astype(np.intp)
+        # frexp gives the bit length exactly since the remaining bits fit a double
+        rank = low_bits + 1 - np.frexp((hashed & np.uint64((1 << low_bits) - 1)).astype(np.float64))[1]
+        registers = np.frombuffer(self.registers, dtype=np.uint8)
+        np.maximum.at(registers, index, rank.astype(np.uint8))
+    
+    def merge(self, other):
+        """Fold in a sketch of the same precision, as if its values had been added"""
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches of different precisions")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+    
+    def estimate(self):
+        """
+        Return the estimated number of distinct values added
+        
+        Uses Ertl's improved estimator ("New cardinality estimation algorithms
+        for HyperLogLog sketches", 2017), which needs no empirical bias
+        correction between the small and large cardinality ranges.
+        """
+        size = len(self.registers)
+        rank_bits = 64 - self.precision
+        histogram = [0] * (rank_bits + 2)
+        for rank in self.registers:
+            histogram[rank] += 1
+        
+        z = size * _tau(1 - histogram[rank_bits + 1] / size)
+        for rank in range(rank_bits, 0, -1):
+            z = 0.5 * (z + histogram[rank])
+        z += size * _sigma(histogram[0] / size)
+        return round(size * size / (2 * math.log(2) * z))
+
+
+class BloomFilter:
+    """Set membership test without false negatives, in a fixed number of bits"""
+    
+    __slots__ = ("size", "hashes", "bits", "count")
+    
+    def __init__(self, capacity, error_rate=DEFAULT_ERROR_RATE, max_bytes=None):
+        """
+        Args:
+            capacity (int): Expected number of distinct values
+            error_rate (float): False positive rate wanted at that capacity
+            max_bytes (int, optional): Memory cap; a smaller filter than
+                                       capacity calls for has a higher
+                                       error rate (see false_positive_rate)
+        """
+        capacity = max(1, capacity)
+        size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        if max_bytes is not None:
+            size = min(size, max_bytes * 8)
+        self.size = max(64, size)
+        self.hashes = max(1, min(16, round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+    
+    def add(self, value):
+        """
+        Add a value
+        
+        Returns:
+            bool: True if the value was possibly added before, False if it
+                  certainly was not
+        """
+        # Double hashing: the two halves of one 64-bit hash generate every position
+        hashed = _mix(hash(value))
+        position, step = hashed & _MASK32, (hashed >> 32) | 1
+        size, bits = self.size, self.bits
+        seen = True
+        for _ in range(self.hashes):
+            position %= size
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                seen = False
+            position += step
+        if not seen:
+            self.count += 1
+        return seen
+    
+    def add_many(self, values):
+        """
+        Add every value of a list
+        
+        Returns:
+            list: add(value) of every value, except that a value whose bits
+                  were all set by others of the same batch is not reported
+        """
+        if np is None or len(values) < _MIN_BATCH:
+            return [self.add(value) for value in values]
+        hashed = _hash_array(values)
+        byte_index, masks = self._bit_positions(hashed)
+        bits = np.frombuffer(self.bits, dtype=np.uint8)
+        seen = (bits[byte_index] & masks).all(axis=1)
+        # Repeats within the batch were seen at their first occurrence
+        first = np.zeros(len(values), dtype=bool)
+        first[np.unique(hashed, return_index=True)[1]] = True
+        seen |= ~first
+        np.bitwise_or.at(bits, byte_index.ravel(), masks.ravel())
+        self.count += len(values) - int(seen.sum())
+        return seen.tolist()
+    
+    def contains_many(self, values):
+        """Return value in self for every value of a list"""
+        if np is None or len(values) < _MIN_BATCH:
+            return [value in self for value in values]
+        byte_index, masks = self._bit_positions(_hash_array(values))
+        return (np.frombuffer(self.bits, dtype=np.uint8)[byte_index] & masks).all(axis=1).tolist()
+    
+    def _bit_positions(self, hashed):
+        """Byte indices and bit masks of the positions of hashed values, one row per value"""
+        first = hashed & np.uint64(_MASK32)
+        step = (hashed >> np.uint64(32)) | np.uint64(1)
+        positions = (first[:, None] + step[:, None] * np.arange(self.hashes, dtype=np.uint64)) % np.uint64(self.size)
+        return (positions >> np.uint64(3)).astype(np.intp), (np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8))
+    
+    def __contains__(self, value):
+        hashed = _mix(hash(value))
+        position, step = hashed & _MASK32, (hashed >> 32) | 1
+        size, bits = self.size, self.bits
+        for _ in range(self.hashes):
+            position %= size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+            position += step
+        return True
+    
+    def expected_false_positive_rate(self):
+        """Return the false positive rate expected from the number of values added, without scanning the bits"""
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+    
+    def false_positive_rate(self):
+        """Return the current probability that an unseen value tests as present"""
+        filled = int.from_bytes(self.bits, "little").bit_count() / self.size
+        return filled ** self.hashes
+
+
+def _sigma(x):
+    """Ertl's sigma function, correcting for empty registers"""
+    if x == 1:
+        return math.inf
+    y, z = 1.0, x
+    while True:
+        x *= x
+        previous = z
+        z += x * y
+        y += y
+        if z == previous:
+            return z
+
+
+def _tau(x):
+    """Ertl's tau function, correcting for saturated registers"""
+    if x == 0 or x == 1:
+        return 0.0
+    y, z = 1.0, 1 - x
+    while True:
+        x = math.sqrt(x)
+        previous = z
+        y *= 0.5
+        z -= (1 - x) ** 2 * y
+        if z == previous:
+            return z / 3
+
+
+def _mix(hashed):
+    """MurmurHash3 finalizer of hash(value), so that nearby hashes (such as those of ints) spread out"""
+    hashed &= _MASK64
+    hashed ^= hashed >> 33
+    hashed = (hashed * _MIX1) & _MASK64
+    hashed ^= hashed >> 33
+    hashed = (hashed * _MIX2) & _MASK64
+    return hashed ^ (hashed >> 33)
+
+
+def _hash_array(values):
+    """_mix(hash(value)) of every value as a uint64 array"""
+    hashed = np.fromiter(map(hash, values), dtype=np.int64, count=len(values)).view(np.uint64)
+    shift = np.uint64(33)
+    hashed ^= hashed >> shift
+    hashed *= np.uint64(_MIX1)
+    hashed ^= hashed >> shift
+    hashed *= np.uint64(_MIX2)
+    hashed ^= hashed >> shift
+    return hashed
@@ -0,0 +1,223 @@
+"""
+Snapshot Module - Versioned binary cache of the loaded collaboration data
+
+The snapshot is written next to the CSV files after a successful load and
+memory-mapped on later runs, so restarts skip CSV parsing and the pairwise
+collaboration build. It records the size and modification time of every
+source CSV and is ignored as soon as any of them changes.
+
+File layout:
+    8 bytes   magic
+    4 bytes   format version (little-endian uint32)
+    4 bytes   header length (little-endian uint32)
+    header    UTF-8 JSON: source file stats, counts and section positions
+    sections  8-byte aligned string tables and CSR arrays
+"""
+
+import os
+import json
+import mmap
+import struct
+from array import array
+
+SNAPSHOT_NAME = "collaborations.snapshot"
+SNAPSHOT_VERSION = 2
+MAGIC = b"SCISNAP\0"
+SOURCE_FILES = ("scientists.csv", "papers.csv", "authors.csv")
+
+# Separator for string tables; values containing it are not snapshotted
+SEPARATOR = "\0"
+
+_PREFIX = struct.Struct("<8sII")
+
+# Typecode of every array section
+ARRAY_SECTIONS = {
+    "authored_papers": "i",
+    "paper_author_offsets": "q",
+    "paper_author_targets": "i",
+    "collaboration_offsets": "q",
+    "collaboration_targets": "i",
+    "collaboration_papers": "i",
+}
+STRING_SECTIONS = ("scientist_ids", "scientist_names", "paper_ids", "paper_titles")
+
+# Sections every snapshot has; the collaboration arrays are optional
+REQUIRED_SECTIONS = STRING_SECTIONS + ("authored_papers", "paper_author_offsets", "paper_author_targets")
+
+
+def snapshot_path(data_dir):
+    """Return the snapshot location for a data directory"""
+    return os.path.join(data_dir, SNAPSHOT_NAME)
+
+
+def source_stats(data_dir):
+    """
+    Get the size and modification time of every source CSV
+    
+    Returns:
+        dict or None: file name -> [size, mtime_ns], or None if a file is missing
+    """
+    stats = {}
+    for filename in SOURCE_FILES:
+        try:
+            st = os.stat(os.path.join(data_dir, filename))
+        except OSError:
+            return None
+        stats[filename] = [st.st_size, st.st_mtime_ns]
+    return stats
+
+
+def write_snapshot(data_dir, scientist_ids, scientist_names, paper_ids, paper_titles,
+                   authored_papers, paper_author_offsets, paper_author_targets, graph):
+    """
+    Write a snapshot of the loaded data next to the CSV files
+    
+    Args:
+        data_dir (str): Directory holding the source CSVs
+        scientist_ids (list): Scientist IDs in dense index order
+        scientist_names (list): Names aligned with scientist_ids
+        paper_ids (list): Paper IDs in dense index order
+        paper_titles (list): Titles aligned with paper_ids
+        authored_papers (array): Indices into paper_ids of the papers with
+                                 authors, in the order their author lists
+                                 were loaded
+        paper_author_offsets (array): CSR offsets of the author indices of
+                                      every paper in authored_papers
+        paper_author_targets (array): CSR author indices
+        graph (CSRGraph or None): Collaboration graph indexed like
+                                  scientist_ids, its labels (if any) being
+                                  indices into paper_ids; None to store
+                                  paper -> author links only
+    
+    Returns:
+        tuple: (success, message)
+    """
+    stats = source_stats(data_dir)
+    if stats is None:
+        return False, "Source files missing, snapshot not written"
+    
+    strings = {
+        "scientist_ids": scientist_ids,
+        "scientist_names": scientist_names,
+        "paper_ids": paper_ids,
+        "paper_titles": paper_titles,
+    }
+    arrays = {
+        "authored_papers": authored_papers,
+        "paper_author_offsets": paper_author_offsets,
+        "paper_author_targets": paper_author_targets,
+    }
+    if graph is not None:
+        arrays["collaboration_offsets"] = graph.offsets
+        arrays["collaboration_targets"] = graph.targets
+        if graph.labels is not None:
+            arrays["collaboration_papers"] = graph.labels
+    
+    blobs = []
+    for name in STRING_SECTIONS:
+        values = strings[name]
+        if any(SEPARATOR in value for value in values):
+            return False, f"Values in {name} contain NUL characters, snapshot not written"
+        blobs.append((name, SEPARATOR.join(values).encode("utf-8")))
+    for name, data in arrays.items():
+        typecode = ARRAY_SECTIONS[name]
+        if not isinstance(data, array) or data.typecode != typecode:
+            data = array(typecode, data)
+        blobs.append((name, data.tobytes()))
+    
+    # Section offsets are relative to the end of the header
+    sections = {}
+    position = 0
+    for name, blob in blobs:
+        sections[name] = [position, len(blob)]
+        position += _aligned(len(blob))
+    
+    header = json.dumps({
+        "sources": stats,
+        "scientists": len(scientist_ids),
+        "papers": len(paper_ids),
+        "sections": sections,
+    }).encode("utf-8")
+    header += b" " * (_aligned(_PREFIX.size + len(header)) - _PREFIX.size - len(header))
+    
+    path = snapshot_path(data_dir)
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(_PREFIX.pack(MAGIC, SNAPSHOT_VERSION, len(header)))
+            f.write(header)
+            for _, blob in blobs:
+                f.write(blob)
+                f.write(b"\0" * (_aligned(len(blob)) - len(blob)))
+        os.replace(temp_path, path)
+    except OSError as e:
+        return False, f"Could not write snapshot: {str(e)}"
+    
+    return True, f"Snapshot written to '{path}'"
+
+
+def read_snapshot(data_dir):
+    """
+    Memory-map the snapshot for a data directory if it is still valid
+    
+    Args:
+        data_dir (str): Directory holding the source CSVs
+    
+    Returns:
+        dict or None: Section name -> list of strings (string tables) or
+                      memoryview over the mapping (arrays); None when the
+                      snapshot is missing, stale, truncated or from another
+                      version.
+                      The collaboration arrays are absent from snapshots
+                      written by a bipartite load, and the per-edge paper
+                      indices from older snapshots.
+    """
+    path = snapshot_path(data_dir)
+    stats = source_stats(data_dir)
+    if stats is None or not os.path.isfile(path):
+        return None
+    
+    try:
+        with open(path, "rb") as f:
+            magic, version, header_length = _PREFIX.unpack(f.read(_PREFIX.size))
+            if magic != MAGIC or version != SNAPSHOT_VERSION:
+                return None
+            header = json.loads(f.read(header_length).decode("utf-8"))
+            if header.get("sources") != stats:
+                return None
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError, struct.error):
+        return None
+    
+    # A truncated or damaged file must not be trusted any more than a stale one
+    base = _PREFIX.size + header_length
+    view = memoryview(mapping)
+    sections = {}
+    for name, (offset, length) in header["sections"].items():
+        if offset < 0 or length < 0 or base + offset + length > len(mapping):
+            return None
+        data = view[base + offset:base + offset + length]
+        if name in ARRAY_SECTIONS:
+            typecode = ARRAY_SECTIONS[name]
+            if length % array(typecode).itemsize:
+                return None
+            sections[name] = data.cast(typecode)
+        else:
+            try:
+                text = bytes(data).decode("utf-8")
+            except UnicodeDecodeError:
+                return None
+            sections[name] = text.split(SEPARATOR) if text else []
+    
+    if any(name not in sections for name in REQUIRED_SECTIONS):
+        return None
+    if (len(sections["scientist_ids"]) != header["scientists"]
+            or len(sections["paper_ids"]) != header["papers"]
+            or len(sections["paper_author_offsets"]) != len(sections["authored_papers"]) + 1):
+        return None
+    return sections
+
+
+def _aligned(size):
+    """Round size up to a multiple of 8"""
+    return (size + 7) & ~7
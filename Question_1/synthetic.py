@@ -0,0 +1,254 @@
+"""
+Synthetic Data Module - Generates random collaboration graphs for benchmarks
+"""
+
+import os
+import csv
+import random
+from itertools import accumulate
+
+# Defaults of the power-law authorship model used by write_csv_dataset
+DEFAULT_AUTHOR_EXPONENT = 2.5
+DEFAULT_MAX_AUTHORS = 100
+DEFAULT_PAPERS_PER_SCIENTIST = 4
+
+
+def random_collaboration_graph(num_scientists, average_degree=8, seed=0):
+    """
+    Build a random undirected collaboration graph
+    
+    Edges are drawn uniformly at random, which gives the short average
+    distances (a handful of hops) seen in real co-authorship networks.
+    
+    Args:
+        num_scientists (int): Number of scientist nodes
+        average_degree (int): Target average number of collaborators
+        seed (int): Seed for the random number generator
+    
+    Returns:
+        dict: scientist_id -> set of collaborator_ids, using IDs "s0", "s1", ...
+    """
+    rng = random.Random(seed)
+    ids = [f"s{i}" for i in range(num_scientists)]
+    graph = {scientist_id: set() for scientist_id in ids}
+    
+    num_edges = num_scientists * average_degree // 2
+    for _ in range(num_edges):
+        a = rng.randrange(num_scientists)
+        b = rng.randrange(num_scientists)
+        if a == b:
+            continue
+        graph[ids[a]].add(ids[b])
+        graph[ids[b]].add(ids[a])
+    
+    return graph
+
+
+def grid_collaboration_graph(width, height):
+    """
+    Build a width x height grid where each scientist collaborates with
+    their horizontal and vertical neighbours
+    
+    Grids have a large diameter, which makes them useful for deep searches.
+    
+    Args:
+        width (int): Number of columns
+        height (int): Number of rows
+    
+    Returns:
+        dict: scientist_id -> set of collaborator_ids; "s0" and
+              f"s{width * height - 1}" are opposite corners
+    """
+    ids = [f"s{i}" for i in range(width * height)]
+    graph = {scientist_id: set() for scientist_id in ids}
+    
+    for row in range(height):
+        for col in range(width):
+            node = ids[row * width + col]
+            if col + 1 < width:
+                right = ids[row * width + col + 1]
+                graph[node].add(right)
+                graph[right].add(node)
+            if row + 1 < height:
+                below = ids[(row + 1) * width + col]
+                graph[node].add(below)
+                graph[below].add(node)
+    
+    return graph
+
+
+def random_query_pairs(graph, count, seed=0):
+    """
+    Pick random (source_id, target_id) pairs from a graph
+    
+    Args:
+        graph (dict): scientist_id -> set of collaborator_ids
+        count (int): Number of pairs to generate
+        seed (int): Seed for the random number generator
+    
+    Returns:
+        list: List of (source_id, target_id) tuples
+    """
+    rng = random.Random(seed)
+    ids = list(graph)
+    return [(rng.choice(ids), rng.choice(ids)) for _ in range(count)]
+
+
+def mean_authors_per_paper(exponent=DEFAULT_AUTHOR_EXPONENT, max_authors=DEFAULT_MAX_AUTHORS):
+    """Expected author count of a paper when P(k) is proportional to k ** -exponent for k in 1..max_authors"""
+    weights = [k ** -exponent for k in range(1, max_authors + 1)]
+    return sum(k * weight for k, weight in enumerate(weights, 1)) / sum(weights)
+
+
+def power_law_dataset_sizes(num_authorships, exponent=DEFAULT_AUTHOR_EXPONENT, max_authors=DEFAULT_MAX_AUTHORS,
+                            papers_per_scientist=DEFAULT_PAPERS_PER_SCIENTIST):
+    """
+    Pick scientist and paper counts matching a number of authorship rows
+    
+    Args:
+        num_authorships (int): Number of rows in authors.csv
+        exponent (float): Exponent of the authors-per-paper power law
+        max_authors (int): Largest author count of a paper
+        papers_per_scientist (float): Average authorships per scientist
+    
+    Returns:
+        tuple: (num_scientists, num_papers) for write_csv_dataset
+    """
+    num_papers = round(num_authorships / mean_authors_per_paper(exponent, max_authors))
+    num_scientists = round(num_authorships / papers_per_scientist)
+    return max(2, num_scientists), max(1, num_papers)
+
+
+def power_law_author_counts(rng, num_papers, num_authorships, exponent, max_authors):
+    """
+    Draw the number of authors of every paper from a truncated power law
+    
+    The counts are cut off once num_authorships is reached, and a shortfall
+    is topped up one author at a time on random papers, so they always sum
+    to num_authorships.
+    
+    Args:
+        rng (random.Random): Random number generator
+        num_papers (int): Number of papers
+        num_authorships (int): Required sum of the counts
+        exponent (float): P(k) is proportional to k ** -exponent
+        max_authors (int): Largest count of a paper
+    
+    Returns:
+        list: Author count per paper
+    """
+    if num_authorships > num_papers * max_authors:
+        raise ValueError(f"{num_papers} papers cannot hold {num_authorships} authorships "
+                         f"with at most {max_authors} authors each")
+    
+    cum_weights = list(accumulate(k ** -exponent for k in range(1, max_authors + 1)))
+    counts = rng.choices(range(1, max_authors + 1), cum_weights=cum_weights, k=num_papers)
+    
+    remaining = num_authorships
+    for paper, count in enumerate(counts):
+        counts[paper] = min(count, remaining)
+        remaining -= counts[paper]
+    while remaining:
+        paper = rng.randrange(num_papers)
+        if counts[paper] < max_authors:
+            counts[paper] += 1
+            remaining -= 1
+    return counts
+
+
+def write_csv_dataset(data_dir, num_scientists, num_papers, num_authorships, seed=0, author_exponent=None,
+                      max_authors=DEFAULT_MAX_AUTHORS):
+    """
+    Write scientists.csv, papers.csv and authors.csv with random authorships
+    
+    By default every authorship links a uniformly random scientist to a
+    uniformly random paper, so author counts per paper are Poisson
+    distributed. With author_exponent the author count of each paper follows
+    a power law instead, like in real bibliographies: most papers have one
+    or two authors and a few have dozens. The authors of a paper are then
+    distinct and their rows are written together.
+    
+    Args:
+        data_dir (str): Directory to write the files into (created if needed)
+        num_scientists (int): Number of rows in scientists.csv
+        num_papers (int): Number of rows in papers.csv
+        num_authorships (int): Number of rows in authors.csv
+        seed (int): Seed for the random number generator
+        author_exponent (float, optional): Exponent of the authors-per-paper
+                                           power law (2 to 3 is realistic,
+                                           see power_law_dataset_sizes)
+        max_authors (int): Largest author count of a paper for the power law
+    """
+    rng = random.Random(seed)
+    os.makedirs(data_dir, exist_ok=True)
+    
+    with open(os.path.join(data_dir, "scientists.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["scientist_id", "name"])
+        writer.writerows((f"s{i}", f"Scientist {i}") for i in range(num_scientists))
+    
+    with open(os.path.join(data_dir, "papers.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["paper_id", "title", "year"])
+        writer.writerows((f"p{i}", f"Paper {i}, a study", 1950 + i % 75) for i in range(num_papers))
+    
+    with open(os.path.join(data_dir, "authors.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["scientist_id", "paper_id"])
+        if author_exponent is None:
+            writer.writerows((f"s{rng.randrange(num_scientists)}", f"p{rng.randrange(num_papers)}")
+                             for _ in range(num_authorships))
+        else:
+            counts = power_law_author_counts(rng, num_papers, num_authorships, author_exponent,
+                                             min(max_authors, num_scientists))
+            scientists = range(num_scientists)
+            for paper, count in enumerate(counts):
+                if count == 1:
+                    writer.writerow((f"s{rng.randrange(num_scientists)}", f"p{paper}"))
+                elif count:
+                    writer.writerows((f"s{author}", f"p{paper}") for author in rng.sample(scientists, count))
+
+
+def append_csv_rows(data_dir, first_scientist, num_scientists, first_paper, num_papers, num_authorships, seed=0):
+    """
+    Append new scientists, papers and authorships to a dataset from write_csv_dataset
+    
+    Authorships link any scientist to any paper, old or new.
+    
+    Args:
+        data_dir (str): Directory holding the CSV files
+        first_scientist (int): Number of the first new scientist (the current count)
+        num_scientists (int): Number of scientists to append
+        first_paper (int): Number of the first new paper (the current count)
+        num_papers (int): Number of papers to append
+        num_authorships (int): Number of authors rows to append
+        seed (int): Seed for the random number generator
+    """
+    rng = random.Random(seed)
+    total_scientists = first_scientist + num_scientists
+    total_papers = first_paper + num_papers
+    
+    with open(os.path.join(data_dir, "scientists.csv"), "a", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows((f"s{i}", f"Scientist {i}") for i in range(first_scientist, total_scientists))
+    
+    with open(os.path.join(data_dir, "papers.csv"), "a", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows((f"p{i}", f"Paper {i}, a study", 1950 + i % 75)
+                                for i in range(first_paper, total_papers))
+    
+    with open(os.path.join(data_dir, "authors.csv"), "a", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows((f"s{rng.randrange(total_scientists)}", f"p{rng.randrange(total_papers)}")
+                                for _ in range(num_authorships))
+
+
+def install_graph(graph):
+    """
+    Make a synthetic graph the active dataset in data_access
+    
+    Args:
+        graph (dict): scientist_id -> set of collaborator_ids
+    """
+    from data_access import set_graph
+    from collaboration_graph import CollaborationGraph
+    
+    scientists = {scientist_id: f"Scientist {scientist_id}" for scientist_id in graph}
+    set_graph(CollaborationGraph.from_collaborations(scientists, graph))
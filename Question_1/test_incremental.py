@@ -0,0 +1,110 @@
+import csv
+import os
+import random
+
+import pytest
+
+import data_access
+from collaboration_graph import CollaborationGraph, LAYOUTS, LOADERS
+from scientists_network import shortest_path
+from synthetic import write_csv_dataset
+
+
+def write_dataset(data_dir, num_authorships=1200):
+    # Random authorships list papers out of order and repeat some rows
+    write_csv_dataset(data_dir, 300, 200, num_authorships, seed=1)
+    with open(os.path.join(data_dir, "authors.csv"), newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))[1:]
+    assert len(set(map(tuple, rows))) < len(rows)
+
+
+def append_authors(data_dir, rows):
+    with open(os.path.join(data_dir, "authors.csv"), "a", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(rows)
+
+
+def edges(graph):
+    """Every collaboration with its canonical paper"""
+    assert not any(scientist_id in graph.collaborators(scientist_id) for scientist_id in graph.scientists)
+    return {(scientist_id, other_id): graph.edge_paper(scientist_id, other_id)
+            for scientist_id in graph.scientists for other_id in graph.collaborators(scientist_id)}
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_snapshot_matches_full_load(tmp_path, layout):
+    data_dir = str(tmp_path)
+    write_dataset(data_dir)
+    
+    loaded, _ = CollaborationGraph.load(data_dir, layout)
+    restored, message = CollaborationGraph.load(data_dir, layout)
+    assert "snapshot" in message
+    assert list(restored.paper_authors.items()) == list(loaded.paper_authors.items())
+    assert edges(restored) == edges(loaded)
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_update_from_snapshot_matches_full_reload(tmp_path, layout):
+    data_dir = str(tmp_path)
+    write_dataset(data_dir)
+    
+    # The first load writes the snapshot, the second one is restored from it
+    assert CollaborationGraph.load(data_dir, layout)[0] is not None
+    success, message = data_access.load_data(data_dir, layout)
+    assert success and "snapshot" in message
+    
+    # New authors on existing papers, most of which link pairs that already
+    # collaborate, plus rows repeating existing authorships
+    graph = data_access.get_graph()
+    rng = random.Random(2)
+    rows = [(f"s{rng.randrange(300)}", f"p{rng.randrange(200)}") for _ in range(400)]
+    rows += [(graph.authors_of(paper_id)[0], paper_id) for paper_id in ("p0", "p1", "p2")]
+    append_authors(data_dir, rows)
+    success, message = data_access.update_data(use_snapshot=False)
+    assert success
+    
+    updated = data_access.get_graph()
+    reloaded, _ = CollaborationGraph.load(data_dir, layout, use_snapshot=False)
+    assert list(updated.paper_authors.items()) == list(reloaded.paper_authors.items())
+    assert edges(updated) == edges(reloaded)
+
+
+@pytest.mark.parametrize("loader", LOADERS)
+def test_rows_appended_during_load_are_updated(tmp_path, loader):
+    data_dir = str(tmp_path)
+    write_dataset(data_dir, num_authorships=12000)
+    
+    appended = []
+    
+    def append_once(stage, count):
+        # Halfway through parsing, as if a writer appended to the files meanwhile
+        if not appended:
+            appended.append(stage)
+            with open(os.path.join(data_dir, "scientists.csv"), "a", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerow(["s300", "Scientist 300"])
+            append_authors(data_dir, [("s300", "p0"), ("s300", "p1"), ("s1", "p0")])
+    
+    graph, _ = CollaborationGraph.load(data_dir, "sets", loader=loader, chunk_bytes=4096, workers=2,
+                                       progress=append_once)
+    assert appended
+    updated, _ = graph.update()
+    reloaded, _ = CollaborationGraph.load(data_dir, "sets", use_snapshot=False)
+    assert list(updated.paper_authors.items()) == list(reloaded.paper_authors.items())
+    assert edges(updated) == edges(reloaded)
+
+
+def test_update_rebuilds_landmarks(tmp_path):
+    data_dir = str(tmp_path)
+    write_dataset(data_dir)
+    assert data_access.load_data(data_dir, "csr", use_snapshot=False)[0]
+    assert data_access.load_landmarks(4, workers=1, use_cache=False)[0]
+    
+    append_authors(data_dir, [("s0", "p0"), ("s1", "p0"), ("s2", "p1")])
+    assert data_access.update_data(use_snapshot=False)[0]
+    
+    graph = data_access.get_graph()
+    assert graph.landmark_index is not None
+    assert graph.landmark_index.graph is graph.dense_graph()
+    reloaded, _ = CollaborationGraph.load(data_dir, "csr", use_snapshot=False)
+    for source_id, target_id in (("s0", "s2"), ("s1", "s150"), ("s3", "s299")):
+        assert (len(shortest_path(source_id, target_id, "landmark", graph=graph) or ())
+                == len(shortest_path(source_id, target_id, graph=reloaded) or ()))
@@ -0,0 +1,99 @@
+import csv
+import os
+import random
+
+import pytest
+
+from collaboration_graph import CollaborationGraph
+from search_index import NameIndex
+from test_incremental import write_dataset
+
+NAMES = ["Ada Lovelace", "Alan Turing", "ALAN KAY", "Al", "a", "Bo", "Grace Hopper", "Édouard Lucas",
+         "Lala Lalala", "Anna Ann", "Barbara Liskov", "Donald Knuth", "Edsger Dijkstra", "J", "Jo Jo"]
+
+
+def linear_search(scientist_ids, scientists, partial_name, limit=None):
+    """The scan search_scientists did before names were indexed"""
+    partial_name = partial_name.lower()
+    matches = []
+    for name, scientist_id in scientist_ids.items():
+        if partial_name in name:
+            matches.append((scientist_id, scientists[scientist_id]))
+            if limit is not None and len(matches) >= limit:
+                break
+    return matches
+
+
+def name_graph(names):
+    scientists = {f"s{i}": name for i, name in enumerate(names)}
+    return CollaborationGraph.from_collaborations(scientists, {})
+
+
+def queries(names):
+    """Every substring of one to four characters of the names, in both cases, and some misses"""
+    found = set()
+    for name in names:
+        for length in (1, 2, 3, 4):
+            for i in range(len(name) - length + 1):
+                found.add(name[i:i + length])
+    found = sorted(found)
+    return found + [query.upper() for query in found] + ["", "zz", "xyz", "lovelace turing", "ada lovelace"]
+
+
+@pytest.mark.parametrize("limit", [None, 1, 3])
+def test_search_matches_linear_scan(limit):
+    rng = random.Random(3)
+    names = NAMES + ["".join(rng.choice("abcde ") for _ in range(rng.randrange(1, 12))).strip() or "e"
+                     for _ in range(300)]
+    graph = name_graph(names)
+    for query in queries(names):
+        assert graph.search_scientists(query, limit) == linear_search(graph.scientist_ids, graph.scientists,
+                                                                       query, limit), query
+
+
+def test_short_queries_use_the_trie():
+    index = NameIndex((name.lower(), i) for i, name in enumerate(NAMES))
+    # One- and two-character queries never touch the trigram postings
+    index.trigrams = {}
+    assert index.search("j") == [12, 13, 14]
+    assert index.search("al") == [1, 2, 3, 8, 11]
+    assert index.search("la", limit=2) == [0, 1]
+    assert index.search("q") == []
+
+
+def test_limit_and_order():
+    index = NameIndex((name.lower(), i) for i, name in enumerate(NAMES))
+    assert index.search("an") == [1, 2, 9]
+    assert index.search("an", limit=2) == [1, 2]
+    assert index.search("an", limit=0) == []
+    assert index.search("") == list(range(len(NAMES)))
+
+
+def test_extended_matches_a_rebuilt_index():
+    entries = [(name.lower(), i) for i, name in enumerate(NAMES)]
+    index = NameIndex(entries[:8])
+    before = {query: index.search(query.lower()) for query in queries(NAMES)}
+    
+    extended = index.extended(entries[8:])
+    rebuilt = NameIndex(entries)
+    for query in queries(NAMES):
+        assert extended.search(query.lower()) == rebuilt.search(query.lower()), query
+        # The original index is left unchanged
+        assert index.search(query.lower()) == before[query], query
+
+
+def test_search_after_incremental_update(tmp_path):
+    data_dir = str(tmp_path)
+    write_dataset(data_dir)
+    graph, _ = CollaborationGraph.load(data_dir, use_snapshot=False)
+    
+    with open(os.path.join(data_dir, "scientists.csv"), "a", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows([("s300", "Zoe Newcomer"), ("s301", "Ada Latecomer")])
+    updated, _ = graph.update()
+    reloaded, _ = CollaborationGraph.load(data_dir, use_snapshot=False)
+    
+    for query in ("comer", "Zoe", "ADA", "z", "sc", "scientist 30", "ientist 1"):
+        assert updated.search_scientists(query) == reloaded.search_scientists(query), query
+        assert updated.search_scientists(query) == linear_search(reloaded.scientist_ids, reloaded.scientists,
+                                                                 query)
+    assert graph.search_scientists("comer") == []
@@ -0,0 +1,53 @@
+import asyncio
+import json
+
+import data_access
+from service import QueryService
+from test_incremental import write_dataset, append_authors
+
+
+def request(service, method, target, body=b""):
+    endpoint, status, answer = asyncio.run(service.dispatch(method, target, body))
+    return status, answer
+
+
+def test_landmark_mode_after_reload(tmp_path):
+    data_dir = str(tmp_path)
+    write_dataset(data_dir)
+    assert data_access.load_data(data_dir, "csr", use_snapshot=False)[0]
+    assert data_access.load_landmarks(4, workers=1, use_cache=False)[0]
+    service = QueryService(workers=1)
+    try:
+        assert request(service, "GET", "/path?source=s0&target=s299&mode=landmark")[0] == 200
+        
+        append_authors(data_dir, [("s0", "p0"), ("s299", "p0")])
+        assert request(service, "POST", "/reload")[0] == 200
+        
+        status, after = request(service, "GET", "/path?source=s0&target=s299&mode=landmark")
+        assert status == 200
+        assert after["degrees"] == 1
+    finally:
+        service.close()
+
+
+def test_invalid_content_length():
+    service = QueryService(workers=1)
+    
+    async def exchange():
+        server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()[:2]
+        async with server:
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(b"POST /batch-path HTTP/1.1\r\nContent-Length: ten\r\n\r\n")
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+    
+    try:
+        response = asyncio.run(exchange())
+    finally:
+        service.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 400 ")
+    assert json.loads(body) == {"error": "Invalid Content-Length"}
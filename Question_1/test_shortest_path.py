@@ -1,24 +1,83 @@
 from collections import deque
 
+import pytest
+
+import degree
+from degree import neighbors_for_person
+from search_core import labelled_bfs_parents, labelled_path_from_parents
+from synthetic import write_csv_dataset
+
 def shortest_path(source, target):
     if source == target:
         return []
     
+    # Get neighbors sorted by paper ID for deterministic behavior in tests
+    def sorted_neighbors(scientist_id):
+        return sorted(neighbors_for_person(scientist_id), key=lambda x: x[0])
+    
+    parents, found = labelled_bfs_parents(source, target, sorted_neighbors)
+    if not found:
+        return None
+    
+    return labelled_path_from_parents(parents, target)
+
+
+def copying_shortest_path(source, target):
+    """The search before the shared core, copying the path for every queued scientist"""
+    if source == target:
+        return []
+    
     queue = deque([(source, [])])
     explored = {source}
-
+    
     while queue:
         current_scientist, path = queue.popleft()
-        
-        # Get neighbors sorted by paper ID for deterministic behavior in tests
         neighbors = sorted(neighbors_for_person(current_scientist), key=lambda x: x[0])
-        
         for paper_id, neighbor_id in neighbors:
             if neighbor_id == target:
                 return path + [(paper_id, neighbor_id)]
-            
             if neighbor_id not in explored:
                 explored.add(neighbor_id)
                 queue.append((neighbor_id, path + [(paper_id, neighbor_id)]))
     
     return None
+
+
+@pytest.fixture
+def loaded(tmp_path):
+    write_csv_dataset(str(tmp_path), 300, 200, 500, seed=4)
+    degree.load_data(str(tmp_path))
+    # A scientist without papers, unreachable from everyone
+    degree.scientist_data["loner"] = {"name": "Loner", "papers": set()}
+    yield
+    degree.name_to_ids.clear()
+    degree.scientist_data.clear()
+    degree.paper_data.clear()
+
+
+def pairs():
+    return [(f"s{i}", f"s{(i * 37 + 11) % 300}") for i in range(0, 300, 7)] + [("s5", "loner"), ("loner", "s5")]
+
+
+def test_matches_path_copying_search(loaded):
+    for source, target in pairs():
+        assert shortest_path(source, target) == copying_shortest_path(source, target), (source, target)
+
+
+def test_degree_paths_are_shortest_and_valid(loaded):
+    for source, target in pairs():
+        path = degree.shortest_path(source, target)
+        expected = copying_shortest_path(source, target)
+        if expected is None:
+            assert path is None
+            continue
+        assert len(path) == len(expected)
+        previous = source
+        for paper_id, scientist_id in path:
+            assert {previous, scientist_id} <= degree.paper_data[paper_id]["authors"]
+            previous = scientist_id
+        assert previous == target
+
+
+def test_same_source_and_target(loaded):
+    assert shortest_path("s1", "s1") == degree.shortest_path("s1", "s1") == []
@@ -0,0 +1,64 @@
+import math
+
+import pytest
+
+from sketches import HyperLogLog, BloomFilter
+
+
+@pytest.mark.parametrize("precision, distinct", [(14, 200000), (10, 5000), (12, 100)])
+def test_hyperloglog_estimate_within_documented_error(precision, distinct):
+    sketch = HyperLogLog(precision)
+    for value in range(distinct):
+        sketch.add(value)
+        sketch.add(value)  # Repeats do not count
+    error = 1.04 / math.sqrt(1 << precision)
+    assert abs(sketch.estimate() - distinct) <= 3 * error * distinct
+
+
+def test_hyperloglog_merge_equals_union():
+    left, right, union = HyperLogLog(12), HyperLogLog(12), HyperLogLog(12)
+    for value in range(0, 30000):
+        left.add(value)
+        union.add(value)
+    for value in range(20000, 50000):
+        right.add(value)
+        union.add(value)
+    left.merge(right)
+    assert left.registers == union.registers
+    with pytest.raises(ValueError):
+        left.merge(HyperLogLog(10))
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(5000, error_rate=0.01)
+    values = [f"paper-{i}" for i in range(5000)]
+    for value in values:
+        bloom.add(value)
+    assert all(value in bloom for value in values)
+    assert all(bloom.contains_many(values))
+    assert bloom.add(values[0]) is True
+
+    unseen = [f"other-{i}" for i in range(20000)]
+    false_positives = sum(value in bloom for value in unseen) / len(unseen)
+    assert false_positives < 0.02
+    assert bloom.expected_false_positive_rate() < 0.02
+
+
+def test_numpy_batches_match_single_adds():
+    pytest.importorskip("numpy")
+    values = list(range(10000)) + [f"scientist {i}" for i in range(10000)]
+
+    batched, single = HyperLogLog(12), HyperLogLog(12)
+    batched.add_many(values)
+    for value in values:
+        single.add(value)
+    assert batched.registers == single.registers
+
+    batched, single = BloomFilter(20000), BloomFilter(20000)
+    seen = batched.add_many(values + values[:100])
+    single_seen = [single.add(value) for value in values + values[:100]]
+    assert batched.bits == single.bits
+    # Repeats within a batch are reported as seen, like single adds report them
+    assert seen[-100:] == single_seen[-100:] == [True] * 100
+    probes = values[::7] + [f"unseen {i}" for i in range(1000)]
+    assert batched.contains_many(probes) == [value in single for value in probes]